@@ -3,7 +3,11 @@ import { TableNames } from '../../../common/enums/entities.enums';
 import { IBaseEntity } from '../interfaces/base-entity.interface';
 
 @Entity(TableNames.OUTBOX_EVENTS)
-@Index(['published'])
+// Partial index for the publisher poll (WHERE published = false ORDER BY
+// created_at): it only holds the unpublished backlog, not the whole history
+@Index('outbox_unpublished_idx', ['created_at'], {
+  where: 'published = false',
+})
 @Index(['topic'])
 @Index(['service'])
 export class OutboxEvent implements IBaseEntity {
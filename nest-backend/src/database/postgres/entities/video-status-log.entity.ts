@@ -8,7 +8,8 @@ import { AbstractEntity } from '../abstract.entity';
  * Tracks all status changes for videos, capturing who/what made the change
  */
 @Entity(TableNames.VIDEO_STATUS_LOGS)
-@Index(['video_id'])
+// Serves "latest status for a video" (ORDER BY created_at DESC LIMIT 1)
+@Index('video_status_logs_video_created_idx', ['video_id', 'created_at'])
 @Index(['created_at'])
 export class VideoStatusLog extends AbstractEntity<VideoStatusLog> {
   @Column({ nullable: false, name: 'video_id' })
@@ -10,7 +10,7 @@ export const OUTBOX_PUBLISHER_QUEUE = 'outbox_publisher_queue';
 // Job names
 export const TRANSCODE_VIDEO_JOB = 'transcode_video';
 export const TRANSCRIBE_VIDEO_JOB = 'transcribe_video';
-export const PUBLISH_OUTBOX_JOB = 'publish_outbox';
+export const PUBLISH_OUTBOX_BATCH_JOB = 'publish_outbox_batch';
 
 // Job options with retries and exponential backoff
 export const TRANSCODE_JOB_OPTIONS: JobsOptions = {
@@ -33,20 +33,25 @@ export const TRANSCRIBE_JOB_OPTIONS: JobsOptions = {
   removeOnFail: false, // Keep failed jobs for DLQ
 };
 
+// One batch job at a time: the fixed jobId dedupes scheduler ticks while a
+// batch is pending. No BullMQ retries - rows that fail to publish stay
+// unpublished (attempts + 1) and are picked up by the next tick, until
+// OUTBOX_MAX_PUBLISH_ATTEMPTS dead-letters them.
 export const OUTBOX_PUBLISHER_JOB_OPTIONS: JobsOptions = {
-  attempts: 5,
-  backoff: {
-    type: 'exponential',
-    delay: 2 * 1000, // Start with 2 seconds
-  },
+  jobId: PUBLISH_OUTBOX_BATCH_JOB,
+  attempts: 1,
   removeOnComplete: true,
-  removeOnFail: false,
+  removeOnFail: true,
 };
 
 // Worker concurrency
 export const TRANSCODE_WORKER_CONCURRENCY = 2; // Process 2 videos concurrently
 export const TRANSCRIBE_WORKER_CONCURRENCY = 1; // Process 1 transcription at a time (CPU intensive)
-export const OUTBOX_PUBLISHER_CONCURRENCY = 5; // Publish 5 events concurrently
+export const OUTBOX_PUBLISHER_CONCURRENCY = 1; // One outbox batch at a time per replica
+export const OUTBOX_PUBLISH_BATCH_SIZE = 100; // Outbox events claimed per poll cycle
+export const OUTBOX_MAX_PUBLISH_ATTEMPTS = 5; // Failed publishes before an event is dead-lettered
+export const OUTBOX_NOTIFY_CHANNEL = 'outbox_new'; // pg_notify channel fired on outbox inserts
+export const OUTBOX_RELISTEN_DELAY_MS = 5000; // Wait before re-LISTENing after the listener fails
 
 // Temporary directory for video processing
 export const TEMP_DIR = '/tmp/video-processing';
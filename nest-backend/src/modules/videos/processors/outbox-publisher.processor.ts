@@ -1,21 +1,19 @@
 import { Processor } from '@nestjs/bullmq';
 import { Injectable } from '@nestjs/common';
-import { InjectRepository } from '@nestjs/typeorm';
 import { Job } from 'bullmq';
-import { Repository } from 'typeorm';
-import { OutboxEvent } from '../../../database/postgres/entities/outbox-event.entity';
+import { DataSource } from 'typeorm';
 import { GenericWorkerHost } from '../../../providers/bullmq/generic/genericWorkerHost';
 import { KafkaProducerService } from '../../../providers/kafka/kafka-producer.service';
 import {
+  OUTBOX_PUBLISH_BATCH_SIZE,
   OUTBOX_PUBLISHER_CONCURRENCY,
   OUTBOX_PUBLISHER_QUEUE,
 } from '../constants/video-processor.constants';
 import { OutboxService } from '../services/shared/outbox.service';
 
-export interface IOutboxPublisherData {
-  outboxEventId: string;
-  topic: string;
-  payload: Record<string, any>;
+export interface IOutboxPublisherResult {
+  published: number;
+  failed: number;
 }
 
 @Processor(OUTBOX_PUBLISHER_QUEUE, {
@@ -23,45 +21,70 @@ export interface IOutboxPublisherData {
 })
 @Injectable()
 export class OutboxPublisherProcessor extends GenericWorkerHost<
-  IOutboxPublisherData,
-  void
+  null,
+  IOutboxPublisherResult
 > {
   constructor(
     private readonly kafkaProducerService: KafkaProducerService,
-    @InjectRepository(OutboxEvent)
-    private readonly outboxRepo: Repository<OutboxEvent>,
     private readonly outboxService: OutboxService,
+    private readonly dataSource: DataSource,
   ) {
     super(OUTBOX_PUBLISHER_QUEUE, OutboxPublisherProcessor.name);
   }
 
-  protected getJobContext(job: Job<IOutboxPublisherData>): string {
-    return `, topic=${job.data.topic}, eventId=${job.data.outboxEventId}`;
-  }
+  /**
+   * Publish one batch of outbox events in one transaction: claim a batch
+   * (SKIP LOCKED, so replicas never double-publish), produce it to Kafka,
+   * then mark every delivered event with a single UPDATE and bump attempts
+   * on the rest (left for the next batch).
+   */
+  protected async processJob(
+    job: Job<null>,
+  ): Promise<IOutboxPublisherResult> {
+    return await this.dataSource.transaction(async (transactionManager) => {
+      const events = await this.outboxService.claimUnpublishedEvents(
+        OUTBOX_PUBLISH_BATCH_SIZE,
+        transactionManager,
+      );
 
-  protected async processJob(job: Job<IOutboxPublisherData>): Promise<void> {
-    const { outboxEventId, topic, payload } = job.data;
+      if (events.length === 0) {
+        return { published: 0, failed: 0 };
+      }
 
-    try {
-      // Publish to Kafka with event ID for idempotency
-      await this.kafkaProducerService.emit(topic, payload, outboxEventId);
+      // Only events the broker acknowledged are marked as published
+      const delivered = await this.kafkaProducerService.emitMany(
+        events.map((event) => ({
+          topic: event.topic,
+          payload: event.payload,
+          eventId: event.id,
+        })),
+      );
 
-      // Mark as published
-      await this.outboxService.markAsPublished(outboxEventId);
+      const publishedIds: string[] = [];
+      const failedIds: string[] = [];
+      delivered.forEach((ok, i) => {
+        (ok ? publishedIds : failedIds).push(events[i].id);
+      });
 
-      this.logger.log(
-        `✅ Published outbox event to Kafka: topic=${topic}, eventId=${outboxEventId}`,
+      await this.outboxService.markManyAsPublished(
+        publishedIds,
+        transactionManager,
+      );
+      await this.outboxService.incrementManyAttempts(
+        failedIds,
+        transactionManager,
       );
-    } catch (error: any) {
-      // Increment attempts
-      await this.outboxService.incrementAttempts(outboxEventId);
 
-      this.logger.error(
-        `❌ Failed to publish outbox event: topic=${topic}, eventId=${outboxEventId}, attempts=${job.attemptsMade + 1}`,
-        error.stack,
+      this.logger.log(
+        `✅ Published ${publishedIds.length}/${events.length} outbox events`,
       );
+      if (failedIds.length > 0) {
+        this.logger.warn(
+          `⚠️ ${failedIds.length} outbox events failed to publish and will be retried`,
+        );
+      }
 
-      throw error;
-    }
+      return { published: publishedIds.length, failed: failedIds.length };
+    });
   }
 }
@@ -1,63 +1,139 @@
-import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
-import { Cron, SchedulerRegistry } from '@nestjs/schedule';
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+} from '@nestjs/common';
+import { Cron } from '@nestjs/schedule';
+import { Pool, PoolClient } from 'pg';
+import { DataSource } from 'typeorm';
+import { PostgresDriver } from 'typeorm/driver/postgres/PostgresDriver';
 import { BullQueueService } from '../../../providers/bullmq/bullmq.service';
-import { OutboxService } from '../services/shared/outbox.service';
 import {
+  OUTBOX_NOTIFY_CHANNEL,
+  OUTBOX_PUBLISHER_JOB_OPTIONS,
   OUTBOX_PUBLISHER_QUEUE,
-  PUBLISH_OUTBOX_JOB,
+  OUTBOX_RELISTEN_DELAY_MS,
+  PUBLISH_OUTBOX_BATCH_JOB,
 } from '../constants/video-processor.constants';
+import { OutboxService } from '../services/shared/outbox.service';
 
 @Injectable()
-export class OutboxPublisherScheduler implements OnModuleInit {
+export class OutboxPublisherScheduler implements OnModuleInit, OnModuleDestroy {
   private readonly logger = new Logger(OutboxPublisherScheduler.name);
+  // Dedicated connection held for LISTEN (notifications arrive on it)
+  private listener: PoolClient | null = null;
+  // Pending re-LISTEN after the listener failed (cleared on shutdown)
+  private relistenTimer: NodeJS.Timeout | null = null;
+  // Coalesce notification bursts into one poll at a time
+  private polling = false;
+  private pollAgain = false;
 
   constructor(
     private readonly outboxService: OutboxService,
     private readonly bullQueueService: BullQueueService,
-    private readonly schedulerRegistry: SchedulerRegistry,
+    private readonly dataSource: DataSource,
   ) {}
 
   async onModuleInit() {
+    await this.listenForInserts();
     // Start polling immediately, then continue with cron
     await this.pollAndPublish();
   }
 
+  async onModuleDestroy() {
+    if (this.relistenTimer) {
+      clearTimeout(this.relistenTimer);
+      this.relistenTimer = null;
+    }
+    if (this.listener) {
+      this.listener.release();
+      this.listener = null;
+    }
+  }
+
+  /**
+   * Wake the publisher as soon as an outbox row is inserted (LISTEN on the
+   * insert trigger's channel). The cron poll stays as a safety net for
+   * missed notifications; failures here only cost latency until the
+   * listener is re-established.
+   */
+  private async listenForInserts(): Promise<void> {
+    try {
+      await this.outboxService.ensureInsertNotifyTrigger(OUTBOX_NOTIFY_CHANNEL);
+      const pool = (this.dataSource.driver as PostgresDriver).master as Pool;
+      this.listener = await pool.connect();
+      this.listener.on('notification', () => void this.pollAndPublish());
+      this.listener.on('error', (error) => {
+        this.logger.warn(
+          `⚠️ Outbox LISTEN connection lost, polling until it reconnects: ${error.message}`,
+        );
+        this.listener?.release(error);
+        this.listener = null;
+        this.scheduleRelisten();
+      });
+      await this.listener.query(`LISTEN ${OUTBOX_NOTIFY_CHANNEL}`);
+      this.logger.log(`👂 Listening for outbox inserts on ${OUTBOX_NOTIFY_CHANNEL}`);
+    } catch (error: any) {
+      this.logger.warn(
+        `⚠️ Could not LISTEN for outbox inserts, polling until retry: ${error.message}`,
+      );
+      this.listener?.release(error);
+      this.listener = null;
+      this.scheduleRelisten();
+    }
+  }
+
+  private scheduleRelisten(): void {
+    if (this.relistenTimer) {
+      return;
+    }
+    this.relistenTimer = setTimeout(() => {
+      this.relistenTimer = null;
+      void this.listenForInserts();
+    }, OUTBOX_RELISTEN_DELAY_MS);
+  }
+
   /**
-   * Poll outbox for unpublished events every 5 seconds
+   * Poll outbox for unpublished events (on insert notifications, and every
+   * 5 seconds as a fallback) and queue a single batch job for them (not one
+   * job per event); the processor publishes the whole batch under one
+   * transaction.
    */
   @Cron('*/5 * * * * *') // Every 5 seconds
   async pollAndPublish(): Promise<void> {
+    if (this.polling) {
+      this.pollAgain = true;
+      return;
+    }
+    this.polling = true;
     try {
-      const unpublishedEvents =
-        await this.outboxService.getUnpublishedEvents(100);
+      do {
+        this.pollAgain = false;
+        await this.enqueueBatchIfPending();
+      } while (this.pollAgain);
+    } finally {
+      this.polling = false;
+    }
+  }
 
-      if (unpublishedEvents.length === 0) {
+  private async enqueueBatchIfPending(): Promise<void> {
+    try {
+      if (!(await this.outboxService.hasUnpublishedEvents())) {
         return;
       }
 
-      this.logger.debug(
-        `📬 Found ${unpublishedEvents.length} unpublished outbox events`,
+      // Fixed jobId: a no-op while the previous batch job is still pending
+      await this.bullQueueService.addJob(
+        OUTBOX_PUBLISHER_QUEUE,
+        PUBLISH_OUTBOX_BATCH_JOB,
+        null,
+        OUTBOX_PUBLISHER_JOB_OPTIONS,
       );
 
-      // Queue jobs for each unpublished event
-      for (const event of unpublishedEvents) {
-        await this.bullQueueService.addJob(
-          OUTBOX_PUBLISHER_QUEUE,
-          PUBLISH_OUTBOX_JOB,
-          {
-            outboxEventId: event.id,
-            topic: event.topic,
-            payload: event.payload,
-          },
-        );
-      }
-
-      this.logger.log(
-        `✅ Queued ${unpublishedEvents.length} outbox events for publishing`,
-      );
+      this.logger.debug('📬 Queued outbox publish batch job');
     } catch (error: any) {
       this.logger.error('❌ Error polling outbox events:', error.stack);
     }
   }
 }
-
@@ -1,8 +1,9 @@
 import { Injectable, Logger } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { DataSource, Repository } from 'typeorm';
+import { DataSource, EntityManager, In, LessThan, Repository } from 'typeorm';
 import { OutboxEvent } from '../../../../database/postgres/entities/outbox-event.entity';
 import { GenericCrudRepository } from '../../../../database/postgres/repository/generic-crud.repository';
+import { OUTBOX_MAX_PUBLISH_ATTEMPTS } from '../../constants/video-processor.constants';
 
 export interface OutboxEventPayload {
   topic: string;
@@ -57,6 +58,142 @@ export class OutboxService {
     });
   }
 
+  /**
+   * Install a statement-level AFTER INSERT trigger that pg_notify()s
+   * `channel`, so the publisher wakes on new events from any writer
+   * (nest or python) instead of waiting for the next poll.
+   *
+   * A no-op once the trigger exists, so replica boots don't take a lock on
+   * the hot outbox table; the first install is serialized with an advisory
+   * lock so replicas booting together don't race on the catalog.
+   */
+  async ensureInsertNotifyTrigger(channel: string): Promise<void> {
+    const table = this.outboxRepo.metadata.tablePath;
+    if (await this.hasInsertNotifyTrigger(table)) {
+      return;
+    }
+    await this.dataSource.transaction(async (manager) => {
+      await manager.query(
+        `SELECT pg_advisory_xact_lock(hashtext('outbox_insert_notify'))`,
+      );
+      // Another replica may have installed it while we waited for the lock
+      if (await this.hasInsertNotifyTrigger(table, manager)) {
+        return;
+      }
+      await manager.query(`
+        CREATE OR REPLACE FUNCTION notify_outbox_insert() RETURNS trigger AS $$
+        BEGIN
+          PERFORM pg_notify('${channel}', '');
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql`);
+      await manager.query(
+        `CREATE TRIGGER outbox_insert_notify AFTER INSERT ON ${table}
+         FOR EACH STATEMENT EXECUTE FUNCTION notify_outbox_insert()`,
+      );
+    });
+  }
+
+  private async hasInsertNotifyTrigger(
+    table: string,
+    manager: EntityManager = this.outboxRepo.manager,
+  ): Promise<boolean> {
+    const rows = await manager.query(
+      `SELECT 1 FROM pg_trigger
+       WHERE tgrelid = $1::regclass AND tgname = 'outbox_insert_notify'`,
+      [table],
+    );
+    return rows.length > 0;
+  }
+
+  /**
+   * Whether any publishable event is waiting (cheap EXISTS probe;
+   * dead-lettered events don't count)
+   */
+  async hasUnpublishedEvents(): Promise<boolean> {
+    return await this.outboxRepo.exists({
+      where: {
+        published: false,
+        attempts: LessThan(OUTBOX_MAX_PUBLISH_ATTEMPTS),
+      },
+    });
+  }
+
+  /**
+   * Lock up to `limit` unpublished events for this transaction
+   * (FOR UPDATE SKIP LOCKED), so concurrent schedulers never claim the
+   * same rows. Must run inside `transactionManager`'s transaction.
+   *
+   * Events that already failed OUTBOX_MAX_PUBLISH_ATTEMPTS times are
+   * dead-lettered: they stay unpublished in the table for inspection but
+   * are never claimed again, so they can't hold the head of the queue.
+   */
+  async claimUnpublishedEvents(
+    limit: number,
+    transactionManager: EntityManager,
+  ): Promise<OutboxEvent[]> {
+    return await transactionManager
+      .getRepository(OutboxEvent)
+      .createQueryBuilder('event')
+      .where('event.published = false')
+      .andWhere('event.attempts < :maxAttempts', {
+        maxAttempts: OUTBOX_MAX_PUBLISH_ATTEMPTS,
+      })
+      .orderBy('event.created_at', 'ASC')
+      .limit(limit)
+      .setLock('pessimistic_write')
+      .setOnLocked('skip_locked')
+      .getMany();
+  }
+
+  /**
+   * Mark many events as published with a single UPDATE ... WHERE id IN (...)
+   */
+  async markManyAsPublished(
+    ids: string[],
+    transactionManager?: EntityManager,
+  ): Promise<void> {
+    if (ids.length === 0) {
+      return;
+    }
+    await (transactionManager ?? this.outboxRepo.manager)
+      .createQueryBuilder()
+      .update(OutboxEvent)
+      .set({ published: true, published_at: () => 'now()' })
+      .where({ id: In(ids) })
+      .execute();
+    this.logger.debug(`✅ Marked ${ids.length} outbox events as published`);
+  }
+
+  /**
+   * Increment attempts for many events in one atomic UPDATE ... RETURNING,
+   * logging the events this pushes to OUTBOX_MAX_PUBLISH_ATTEMPTS
+   * (dead-lettered)
+   */
+  async incrementManyAttempts(
+    ids: string[],
+    transactionManager?: EntityManager,
+  ): Promise<void> {
+    if (ids.length === 0) {
+      return;
+    }
+    const result = await (transactionManager ?? this.outboxRepo.manager)
+      .createQueryBuilder()
+      .update(OutboxEvent)
+      .set({ attempts: () => 'attempts + 1' })
+      .where({ id: In(ids) })
+      .returning(['id', 'topic', 'attempts'])
+      .execute();
+
+    for (const row of result.raw) {
+      if (row.attempts >= OUTBOX_MAX_PUBLISH_ATTEMPTS) {
+        this.logger.error(
+          `☠️ Outbox event dead-lettered after ${row.attempts} failed publishes: id=${row.id}, topic=${row.topic}`,
+        );
+      }
+    }
+  }
+
   /**
    * Mark event as published
    * Optimized: Update directly without fetch if event exists
@@ -81,28 +218,23 @@ export class OutboxService {
 
   /**
    * Increment attempts counter
-   * Optimized: Use atomic increment to avoid race conditions
+   * Single atomic UPDATE ... RETURNING: no fetch, no lost increments
    */
   async incrementAttempts(id: string): Promise<void> {
-    // Fetch current attempts first (required for atomic update)
-    const event = await this.outboxRepository.findOneOrNone({
-      where: { id } as any,
-    });
+    const result = await this.outboxRepo
+      .createQueryBuilder()
+      .update(OutboxEvent)
+      .set({ attempts: () => 'COALESCE(attempts, 0) + 1' })
+      .where({ id })
+      .returning('attempts')
+      .execute();
 
-    if (event) {
-      // Use atomic increment to avoid race conditions
-      await this.outboxRepository.updateBy(
-        { where: { id } as any },
-        {
-          attempts: event.attempts + 1,
-        },
-      );
+    if (result.raw.length > 0) {
       this.logger.debug(
-        `📊 Incremented attempts for outbox event: id=${id}, attempts=${event.attempts + 1}`,
+        `📊 Incremented attempts for outbox event: id=${id}, attempts=${result.raw[0].attempts}`,
       );
     } else {
       this.logger.warn(`⚠️ Outbox event not found for increment attempts: id=${id}`);
     }
   }
 }
-
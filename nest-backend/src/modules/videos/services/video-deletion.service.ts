@@ -214,8 +214,9 @@ export class VideoDeletionService {
     const hlsObjects = await this.listS3Objects(hlsPrefix);
     objectsToDelete.push(...hlsObjects);
 
-    // 3. Transcript files
-    objectsToDelete.push(`transcripts/${videoId}/transcript.json`);
+    // 3. Transcript files (one key per transcription run)
+    const transcriptObjects = await this.listS3Objects(`transcripts/${videoId}/`);
+    objectsToDelete.push(...transcriptObjects);
 
     // 4. Summary files
     objectsToDelete.push(`summaries/${videoId}/summary.json`);
@@ -1,5 +1,12 @@
 import { Inject, Injectable, Logger, OnModuleInit } from '@nestjs/common';
 import { ClientKafka } from '@nestjs/microservices';
+import { lastValueFrom } from 'rxjs';
+
+export interface IKafkaRecord {
+  topic: string;
+  payload: Record<string, any>;
+  eventId?: string;
+}
 
 /**
  * Service for publishing events to Kafka topics.
@@ -24,7 +31,7 @@ export class KafkaProducerService implements OnModuleInit {
    * @param topic - Kafka topic name
    * @param payload - Event payload
    * @param eventId - Optional event ID for idempotency tracking
-   * @returns Promise that resolves when event is published
+   * @returns Promise that resolves when the broker has acknowledged the event
    */
   async emit(
     topic: string,
@@ -34,7 +41,10 @@ export class KafkaProducerService implements OnModuleInit {
     try {
       const message = eventId ? { ...payload, eventId } : payload;
 
-      await this.kafkaClient.emit(topic, message);
+      // emit() returns an Observable; wait for the broker ack, not just the dispatch
+      await lastValueFrom(this.kafkaClient.emit(topic, message), {
+        defaultValue: undefined,
+      });
 
       this.logger.debug(
         `📤 Published event to Kafka: topic=${topic}, eventId=${eventId || 'N/A'}`,
@@ -48,6 +58,21 @@ export class KafkaProducerService implements OnModuleInit {
     }
   }
 
+  /**
+   * Publish a batch of events concurrently and wait for every broker ack.
+   *
+   * @param records - Events to publish
+   * @returns Per-record delivery flags, in input order
+   */
+  async emitMany(records: IKafkaRecord[]): Promise<boolean[]> {
+    const results = await Promise.allSettled(
+      records.map((record) =>
+        this.emit(record.topic, record.payload, record.eventId),
+      ),
+    );
+    return results.map((result) => result.status === 'fulfilled');
+  }
+
   /**
    * Publish an event and wait for response (request-response pattern).
    * Not used in current implementation, but available if needed.
@@ -2,7 +2,7 @@
 import { Module } from '@nestjs/common';
 import { ConfigModule, ConfigService } from '@nestjs/config';
 import { ClientsModule, Transport } from '@nestjs/microservices';
-import { Partitioners } from 'kafkajs';
+import { CompressionTypes, Partitioners } from 'kafkajs';
 import { CONFIG } from '../../common/enums/config.enums';
 import { IKafkaConfig } from '../../configs/kafka.config';
 import { KafkaProducerService } from './kafka-producer.service';
@@ -28,8 +28,16 @@ import { KafkaProducerService } from './kafka-producer.service';
               },
               producer: {
                 allowAutoTopicCreation: true,
+                // acks=all (kafkajs default) without duplicates on retried batches
+                idempotent: true,
+                maxInFlightRequests: 1,
                 createPartitioner: Partitioners.LegacyPartitioner,
               },
+              // Compress outbox relay batches; consumers (kafkajs and
+              // librdkafka) decompress gzip without extra codecs
+              send: {
+                compression: CompressionTypes.GZIP,
+              },
             },
           };
         },
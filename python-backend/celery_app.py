@@ -1,53 +1,122 @@
 """Celery application configuration."""
 import logging
 
+import orjson
 from celery import Celery
+from celery.signals import worker_process_init, worker_ready
+from kombu.serialization import register
 
 from config import get_settings
+from modules.videos.constants import (
+    CELERY_QUEUE_SUMMARIZATION,
+    CELERY_QUEUE_TRANSCRIPTION,
+    CELERY_TASK_SUMMARIZE_VIDEO,
+    CELERY_TASK_TRANSCRIBE_VIDEO,
+)
 
+# Resolved before the prefork pool forks; children inherit the cached instance
 settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
+# Task modules are imported by the worker at boot (before the pool forks),
+# not on `import celery_app`, so producers that only enqueue by task name
+# (Kafka consumers) don't pay for openai/whisper imports
+TASK_MODULES = [
+    "modules.summary.tasks.video_summary",
+    "modules.transcription.tasks.video_transcription",
+]
+
+# orjson-backed JSON codec (bytes in/out, no intermediate str)
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary",
+)
+
 # Create Celery app
 celery_app = Celery(
     "youtube_ai",
     broker=settings.celery_broker_url_resolved,
     backend=settings.celery_result_backend_resolved,
+    include=TASK_MODULES,
 )
 
-# Import tasks to ensure they're registered
-# This is required for Celery to discover and register the tasks
-try:
-    import modules.summary.tasks.video_summary  # noqa: F401
-    import modules.transcription.tasks.video_transcription  # noqa: F401
-    logger.info("✅ Successfully imported all task modules")
-except ImportError as e:
-    logger.error(f"❌ Failed to import task modules: {str(e)}")
-    raise
-
 # Celery configuration
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # msgpack (default) or orjson: C codecs with smaller broker payloads;
+    # json still accepted during rollout
+    task_serializer=settings.celery_serializer,
+    accept_content=["msgpack", "orjson", "json"],
+    result_serializer=settings.celery_serializer,
     timezone="UTC",
     enable_utc=True,
-    task_track_started=True,
+    # Completion is signalled through the outbox events, and nothing reads an
+    # AsyncResult: skip storing return values (no result-backend write per
+    # task). Tasks that need a result opt in with ignore_result=False
+    task_ignore_result=True,
+    # No STARTED state write per task; results that are stored expire after an hour
+    task_track_started=False,
+    result_expires=3600,
     task_time_limit=300,  # 5 minutes
     task_soft_time_limit=240,  # 4 minutes
+    # Long video tasks: reserve one message per child so queued work is never
+    # stuck behind a multi-minute job (workers are launched with -Ofair)
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,
     task_acks_late=True,
+    task_acks_on_failure_or_timeout=False,
     task_reject_on_worker_lost=True,
+    # Each task runs on a dedicated queue: the transcription worker's
+    # --concurrency is capped to the GPUs (or CPU slots) that fit a Whisper
+    # model, the summary worker's to the OpenAI runs wanted at once
+    task_routes={
+        CELERY_TASK_TRANSCRIBE_VIDEO: {"queue": CELERY_QUEUE_TRANSCRIPTION},
+        CELERY_TASK_SUMMARIZE_VIDEO: {"queue": CELERY_QUEUE_SUMMARIZATION},
+    },
 )
 
-# Log registered tasks for debugging
-# Filter out built-in Celery tasks
-user_tasks = [t for t in celery_app.tasks.keys() if not t.startswith("celery.")]
-logger.info(f"✅ Celery app initialized with {len(user_tasks)} user-defined tasks")
-logger.info(f"📋 Registered user tasks: {user_tasks}")
 
-if not user_tasks:
-    logger.warning("⚠️ No user tasks registered! Check task imports.")
+@worker_process_init.connect
+def _reset_db_pool(**kwargs):
+    """Drop pooled connections inherited from the parent after fork."""
+    from database.base import engine
+
+    # close=False: leave the parent's sockets alone, just start a fresh pool
+    engine.dispose(close=False)
+
+
+@worker_process_init.connect
+def _warm_clients(**kwargs):
+    """Build the per-process OpenAI/S3 clients before the first task needs them."""
+    from modules.summary.services.video_summary_service import (
+        get_async_openai_client,
+        get_s3_client,
+    )
+
+    try:
+        get_async_openai_client()
+        get_s3_client()
+    except Exception as e:
+        # Tasks retry client creation lazily; a warm-up failure must not kill the child
+        logger.warning("⚠️ Client warm-up failed: %s", e)
+
+
+@worker_ready.connect
+def _log_registered_tasks(**kwargs):
+    """Log registered tasks once the worker has imported TASK_MODULES."""
+    # Filter out built-in Celery tasks
+    user_tasks = [t for t in celery_app.tasks.keys() if not t.startswith("celery.")]
+    logger.info("✅ Celery app initialized with %d user-defined tasks", len(user_tasks))
+    logger.info("📋 Registered user tasks: %s", user_tasks)
+    logger.info(
+        "⚙️ Worker scheduling: prefetch_multiplier=%s, acks_late=%s (launch workers with -Ofair)",
+        celery_app.conf.worker_prefetch_multiplier,
+        celery_app.conf.task_acks_late,
+    )
+
+    if not user_tasks:
+        logger.warning("⚠️ No user tasks registered! Check task imports.")
 
@@ -1,4 +1,7 @@
 """Task retry configuration constants matching BullMQ patterns."""
+import random
+
+from common.exceptions.base import NotFoundException, ValidationException
 
 # Retry configuration matching BullMQ job options
 TRANSCRIPTION_TASK_CONFIG = {
@@ -13,24 +16,44 @@ SUMMARY_TASK_CONFIG = {
     "backoff_type": "exponential",  # exponential backoff like BullMQ
 }
 
+# Failures a retry cannot fix (missing rows, malformed payloads): the video is
+# marked failed on the first attempt instead of after max_retries
+NON_RETRYABLE_TASK_EXCEPTIONS = (NotFoundException, ValidationException)
+
+# Redis locks guarding one summarization/transcription per video; they expire
+# with the Celery hard time limit (task_time_limit) so a killed worker cannot
+# leave one behind
+SUMMARY_LOCK_KEY = "summary:lock:{video_id}"
+TRANSCRIPTION_LOCK_KEY = "transcription:lock:{video_id}"
+TASK_LOCK_TIMEOUT_SECONDS = 300
+# Times a task re-queues behind a held lock before giving up as in_progress;
+# counted in its own message header, separately from max_retries
+TASK_LOCK_MAX_WAITS = 3
+TASK_LOCK_WAITS_HEADER = "lock_waits"
+
 
 def calculate_exponential_backoff_delay(
-    initial_delay: int, retry_count: int, max_delay: int = 300
+    initial_delay: int, retry_count: int, max_delay: int = 300, jitter: bool = False
 ) -> int:
     """
     Calculate exponential backoff delay.
 
-    Formula: delay = initial_delay * (2 ^ retry_count)
+    Formula: delay = initial_delay * (2 ^ retry_count), computed as a left
+    shift. Negative retry counts are treated as 0.
     Matches BullMQ exponential backoff behavior.
 
     Args:
         initial_delay: Initial delay in seconds (e.g., 5, 10)
         retry_count: Current retry attempt number (0-indexed)
         max_delay: Maximum delay in seconds (default: 300s = 5 minutes)
+        jitter: Pick a random delay in [initial_delay, delay] ("full jitter",
+            floored at initial_delay) so tasks that failed together do not
+            retry together
 
     Returns:
         Delay in seconds
     """
-    delay = initial_delay * (2 ** retry_count)
-    return min(delay, max_delay)
-
+    delay = min(initial_delay << max(retry_count, 0), max_delay)
+    if jitter:
+        delay = random.randint(min(initial_delay, delay), delay)
+    return delay
@@ -1,10 +1,9 @@
 """Common Kafka event handler utilities."""
 import logging
 from contextlib import contextmanager
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
 from database.base import SessionLocal
-from modules.videos.services.processed_message_service import ProcessedMessageService
 
 logger = logging.getLogger(__name__)
 
@@ -23,31 +22,67 @@ def db_session_context():
         db_session.close()
 
 
-def validate_kafka_payload(payload: Dict, required_fields: List[str]) -> Tuple[Optional[str], Optional[int]]:
+# Required fields for video pipeline events
+VIDEO_EVENT_REQUIRED_FIELDS = ("videoId",)
+
+# Validators specialized per required-fields tuple (see make_validator)
+_validators: Dict[Tuple[str, ...], Callable[[Dict], bool]] = {}
+
+
+def make_validator(required_fields: Tuple[str, ...]) -> Callable[[Dict], bool]:
+    """
+    Get a checker specialized for a fixed set of required fields.
+
+    The field names are captured in a closure once per tuple, so the common
+    single-field case is one dict lookup with no per-call iteration.
+
+    Args:
+        required_fields: Tuple of required field names (e.g., ('videoId',))
+
+    Returns:
+        Callable returning True if every required field is present and truthy
+    """
+    validator = _validators.get(required_fields)
+    if validator is None:
+        if len(required_fields) == 1:
+            (field,) = required_fields
+
+            def validator(payload: Dict) -> bool:
+                return bool(payload.get(field))
+        else:
+
+            def validator(payload: Dict) -> bool:
+                return all(payload.get(f) for f in required_fields)
+
+        _validators[required_fields] = validator
+    return validator
+
+
+def validate_kafka_payload(
+    payload: Dict, required_fields: Sequence[str] = VIDEO_EVENT_REQUIRED_FIELDS
+) -> Tuple[Optional[str], Optional[int]]:
     """
     Validate Kafka event payload and extract common fields.
 
     Args:
         payload: Event payload dictionary
-        required_fields: List of required field names (e.g., ['videoId'])
+        required_fields: Required field names (default: VIDEO_EVENT_REQUIRED_FIELDS)
 
     Returns:
         Tuple of (event_id, video_id) or (None, None) if validation fails
-
-    Raises:
-        ValueError: If validation fails
     """
-    # Extract event ID (from outbox or payload)
-    event_id = payload.get("eventId") or payload.get("id")
+    required_fields = tuple(required_fields)
 
-    # Validate required fields
-    missing_fields = [field for field in required_fields if not payload.get(field)]
-    if missing_fields:
-        logger.error(f"❌ Invalid payload: missing fields {missing_fields}. Payload: {payload}")
+    # Validate required fields (missing list is only built on failure, for logging)
+    if not make_validator(required_fields)(payload):
+        missing_fields = [field for field in required_fields if not payload.get(field)]
+        logger.error("❌ Invalid payload: missing fields %s. Payload: %s", missing_fields, payload)
         return None, None
 
+    # Extract event ID (from outbox or payload)
+    event_id = payload.get("eventId") or payload.get("id")
     if not event_id:
-        logger.error(f"❌ Invalid payload: missing eventId/id. Payload: {payload}")
+        logger.error("❌ Invalid payload: missing eventId/id. Payload: %s", payload)
         return None, None
 
     video_id = payload.get("videoId") if "videoId" in required_fields else None
@@ -55,59 +90,21 @@ def validate_kafka_payload(payload: Dict, required_fields: List[str]) -> Tuple[O
     return event_id, video_id
 
 
-def handle_kafka_event_with_idempotency(
-    payload: Dict,
-    topic_name: str,
-    task_func: Callable,
-    task_name: str,
-) -> None:
+def extract_video_event(payload: Dict) -> Tuple[Optional[str], Optional[int]]:
     """
-    Common handler logic for Kafka events with idempotency checking.
+    Extract (event_id, video_id) from a video pipeline event in one pass.
+
+    The valid case costs one lookup per field; only invalid payloads fall
+    through to validate_kafka_payload, which logs what is missing.
 
     Args:
-        payload: Event payload
-        topic_name: Kafka topic name for idempotency tracking
-        task_func: Celery task function to call
-        task_name: Name of the task (for logging)
-    """
-    # Validate payload and extract common fields
-    event_id, video_id = validate_kafka_payload(payload, ["videoId"])
-    if not event_id or video_id is None:
-        return
-
-    logger.info(
-        f"📥 Received {topic_name} event: eventId={event_id}, videoId={video_id}"
-    )
-
-    # Use context manager for database session
-    with db_session_context() as db_session:
-        processed_service = ProcessedMessageService(db_session)
-
-        # Fast check: skip if already processed
-        if processed_service.is_processed(event_id, topic_name):
-            logger.warning(
-                f"⏭️ Skipping duplicate message: eventId={event_id}, videoId={video_id}"
-            )
-            return
-
-        # Queue Celery task immediately (non-blocking)
-        logger.info(f"🔄 Queuing {task_name} task for video {video_id}...")
-        task_result = task_func.delay(payload)
-
-        # Mark as processed (best-effort, skip duplicate check since we already verified)
-        try:
-            processed_service.mark_as_processed(event_id, topic_name, skip_check=True)
-            logger.debug(
-                f"✅ Marked event as processed: eventId={event_id}, videoId={video_id}"
-            )
-        except Exception as mark_error:
-            # Non-critical: task will handle idempotency via DB constraints
-            logger.warning(
-                f"⚠️ Failed to mark event as processed (non-critical, task will handle idempotency): {str(mark_error)}"
-            )
-            # Session already rolled back by context manager
-
-        logger.info(
-            f"✅ Queued {task_name} task: videoId={video_id}, taskId={task_result.id}"
-        )
+        payload: Event payload dictionary
 
+    Returns:
+        Tuple of (event_id, video_id) or (None, None) if validation fails
+    """
+    video_id = payload.get("videoId")
+    event_id = payload.get("eventId") or payload.get("id")
+    if video_id and event_id:
+        return event_id, video_id
+    return validate_kafka_payload(payload)
@@ -0,0 +1,4 @@
+"""Common Celery task utilities."""
+from common.tasks.base import DatabaseTask
+
+__all__ = ["DatabaseTask"]
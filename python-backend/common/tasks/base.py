@@ -0,0 +1,125 @@
+"""Base Celery task class shared by the video pipeline tasks."""
+import logging
+from typing import Any, Optional
+
+from celery import Task
+from celery.exceptions import Ignore
+from redis.exceptions import LockError, RedisError
+from redis.lock import Lock
+from sqlalchemy.orm import Session
+
+from common.constants.task_constants import (
+    TASK_LOCK_MAX_WAITS,
+    TASK_LOCK_TIMEOUT_SECONDS,
+    TASK_LOCK_WAITS_HEADER,
+)
+from database.base import WorkerSession
+from database.models import VideoStatusLog
+from database.repository import GenericRepository
+from modules.videos.services.video_status_log_service import VideoStatusLogService
+from providers.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseTask(Task):
+    """Custom task base class that handles database session and final failure."""
+
+    def __init__(self):
+        """Initialize task."""
+        super().__init__()
+        self._db = None
+
+    @property
+    def db(self) -> Session:
+        """Session for the current task, created on first use and closed in after_return.
+
+        WorkerSession is thread-local, so consecutive tasks on a worker reuse
+        the same Session object (and the services bound to it).
+        """
+        if self._db is None:
+            self._db = WorkerSession()
+        return self._db
+
+    def acquire_video_lock(self, key: str) -> Optional[Lock]:
+        """
+        Take a per-video Redis lock so only one run does the expensive work.
+
+        Redis rather than a Postgres advisory lock: a session-level lock would
+        pin a pooled connection through the whole Whisper/OpenAI run. If
+        another run holds the lock, this task is re-queued for when the lock
+        would expire: by then the holder has finished (the task's opening probe
+        then skips) or died and its lock has lapsed. Waits are counted in their
+        own message header, capped at TASK_LOCK_MAX_WAITS, and leave
+        request.retries (the failure retry budget) untouched.
+
+        Returns:
+            The held lock, or None if it is still held after TASK_LOCK_MAX_WAITS waits
+
+        Raises:
+            celery.exceptions.Ignore: When deferring behind the current holder
+        """
+        client = get_redis_client()
+        lock = client.lock(key, timeout=TASK_LOCK_TIMEOUT_SECONDS)
+        try:
+            if lock.acquire(blocking=False):
+                return lock
+            # Custom message headers surface as request attributes
+            lock_waits = self.request.get(TASK_LOCK_WAITS_HEADER) or 0
+            if lock_waits >= TASK_LOCK_MAX_WAITS:
+                return None
+            countdown = max(client.ttl(key), 1)
+        except RedisError as e:
+            # Redis hiccup: retry like any other transient failure
+            raise self.retry(exc=e)
+        logger.warning(
+            "⏳ %s is held by another run, waiting %ss (wait %s/%s)",
+            key,
+            countdown,
+            lock_waits + 1,
+            TASK_LOCK_MAX_WAITS,
+        )
+        # Same message as self.retry would send, minus the retries increment
+        self.signature_from_request(
+            countdown=countdown,
+            headers={TASK_LOCK_WAITS_HEADER: lock_waits + 1},
+        ).apply_async()
+        raise Ignore()
+
+    @staticmethod
+    def release_video_lock(lock: Optional[Lock]) -> None:
+        """Release a lock from acquire_video_lock (no-op if None or already expired)."""
+        if lock is None:
+            return
+        try:
+            lock.release()
+        except LockError:
+            # Expired (task outlived the lock timeout); nothing left to release
+            pass
+
+    def mark_failed(self, video_id: Optional[int], exc: BaseException) -> None:
+        """Set the video to failed and log the change (best-effort, never raises)."""
+        if not video_id:
+            return
+        try:
+            # Same session as the failed attempt: clear its aborted transaction first
+            db = self.db
+            db.rollback()
+            # One statement: status -> failed plus the status log row
+            status_log_service = VideoStatusLogService(db, GenericRepository(VideoStatusLog, db))
+            if status_log_service.mark_video_failed(video_id, str(exc)):
+                logger.error("💀 Updated video %s status to FAILED: %s", video_id, exc)
+        except Exception as status_error:
+            logger.warning("Failed to update video status: %s", status_error)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Called once the task has failed for good (retries exhausted or not retryable)."""
+        payload: Any = args[0] if args else kwargs.get("payload")
+        video_id = payload.get("videoId") if isinstance(payload, dict) else None
+        self.mark_failed(video_id, exc)
+
+    def after_return(self, *args, **kwargs):
+        """Called after task returns."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
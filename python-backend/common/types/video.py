@@ -1,34 +1,62 @@
-"""Video-related type definitions."""
-from typing import Dict, List, Optional, TypedDict
+"""Video-related type definitions.
 
+Payloads are msgspec Structs so Kafka message bytes can be decoded and
+type-checked in one pass (see KafkaConsumer payload_type).
+"""
+from typing import Any, Dict, List, Optional, Type, TypeVar
 
-class VideoTranscodedPayload(TypedDict, total=False):
+import msgspec
+
+from common.exceptions.base import ValidationException
+
+PayloadT = TypeVar("PayloadT", bound=msgspec.Struct)
+
+
+class VideoTranscodedPayload(msgspec.Struct, kw_only=True):
     """Payload for video.transcoded event."""
 
-    id: str  # Event ID (UUID)
-    eventId: str  # Alternative event ID (from outbox)
+    id: Optional[str] = None  # Event ID (UUID)
+    eventId: Optional[str] = None  # Alternative event ID (from outbox)
     videoId: int
-    variants: List[Dict[str, any]]
-    ts: str  # ISO timestamp
+    variants: List[Dict[str, Any]] = []
+    ts: Optional[str] = None  # ISO timestamp
 
 
-class VideoTranscribedPayload(TypedDict, total=False):
+class VideoTranscribedPayload(msgspec.Struct, kw_only=True):
     """Payload for video.transcribed event."""
 
-    id: str  # Event ID (UUID)
-    eventId: str  # Alternative event ID (from outbox)
+    id: Optional[str] = None  # Event ID (UUID)
+    eventId: Optional[str] = None  # Alternative event ID (from outbox)
     videoId: int
-    transcriptFileKey: str
-    snippetCount: int
-    ts: str  # ISO timestamp
+    transcriptFileKey: Optional[str] = None
+    snippetCount: Optional[int] = None
+    ts: Optional[str] = None  # ISO timestamp
 
 
-class VideoSummaryPayload(TypedDict, total=False):
+class VideoSummaryPayload(msgspec.Struct, kw_only=True):
     """Payload for video.summarized event."""
 
-    id: str  # Event ID (UUID)
-    eventId: str  # Alternative event ID (from outbox)
+    id: Optional[str] = None  # Event ID (UUID)
+    eventId: Optional[str] = None  # Alternative event ID (from outbox)
     videoId: int
-    summaryText: str
-    ts: str  # ISO timestamp
-
+    summaryFileKey: Optional[str] = None
+    summaryText: Optional[str] = None
+    qualityScore: Optional[float] = None
+    ts: Optional[str] = None  # ISO timestamp
+
+
+def convert_payload(payload: Dict[str, Any], payload_type: Type[PayloadT]) -> PayloadT:
+    """
+    Validate an already-decoded payload dict (e.g. a Celery task argument) into a Struct.
+
+    Unknown keys are ignored, so extra task hints can travel with the event.
+
+    Raises:
+        ValidationException: If a required field is missing or has the wrong type
+    """
+    try:
+        return msgspec.convert(payload, payload_type)
+    except msgspec.ValidationError as e:
+        raise ValidationException(
+            f"Invalid {payload_type.__name__}: {e}", {"payload": payload}
+        ) from e
@@ -1,13 +1,17 @@
 """Configuration management using pydantic settings."""
-from functools import lru_cache
-from typing import List
+from functools import cached_property, lru_cache
+from typing import Tuple
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables.
+
+    Derived values are cached_property: get_settings() memoizes the instance,
+    so each one is computed once per process.
+    """
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -30,6 +34,10 @@ class Settings(BaseSettings):
     pg_password: str = Field(..., alias="PG_PASSWORD")
     db_name: str = Field(default="postgres", alias="DB_NAME")
     db_schema: str = Field(default="youtube", alias="DB_SCHEMA")
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")  # seconds
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")  # liveness check per checkout
 
     # Redis
     redis_host: str = Field(..., alias="REDIS_HOST")
@@ -43,6 +51,15 @@ class Settings(BaseSettings):
     kafka_group_id: str = Field(
         default="youtube-consumer-group-python", alias="KAFKA_GROUP_ID"
     )
+    kafka_batch_size: int = Field(default=500, alias="KAFKA_BATCH_SIZE")  # max messages per consume()
+    # consume() wait (seconds): min right after a non-empty batch, max when idle
+    kafka_consume_min_timeout: float = Field(default=0.05, alias="KAFKA_CONSUME_MIN_TIMEOUT")
+    kafka_consume_max_timeout: float = Field(default=1.0, alias="KAFKA_CONSUME_MAX_TIMEOUT")
+    kafka_linger_ms: int = Field(default=10, alias="KAFKA_LINGER_MS")  # producer batching window
+    kafka_compression_type: str = Field(default="zstd", alias="KAFKA_COMPRESSION_TYPE")  # zstd, snappy, lz4, gzip
+    kafka_compression_level: int = Field(default=3, alias="KAFKA_COMPRESSION_LEVEL")
+    # Re-check topic existence on every ensure_topic_exists call instead of caching per process
+    kafka_skip_topic_check_cache: bool = Field(default=False, alias="KAFKA_SKIP_TOPIC_CHECK_CACHE")
 
     # AWS S3
     aws_region: str = Field(default="ap-south-1", alias="AWS_REGION")
@@ -54,18 +71,37 @@ class Settings(BaseSettings):
 
     # OpenAI
     openai_api_key: str = Field(..., alias="OPENAI_API_KEY")
+    openai_summary_model: str = Field(default="gpt-4o-mini", alias="OPENAI_SUMMARY_MODEL")  # auto prompt caching
+    openai_concurrency: int = Field(default=10, alias="OPENAI_CONCURRENCY")  # in-flight chunk requests
+    openai_chunks_per_request: int = Field(default=5, alias="OPENAI_CHUNKS_PER_REQUEST")  # map packing
+    openai_rpm: int = Field(default=3500, alias="OPENAI_RPM")  # account requests/minute, shared via Redis
+    openai_tpm: int = Field(default=90000, alias="OPENAI_TPM")  # account tokens/minute, shared via Redis
+    openai_rate_limit_retries: int = Field(default=3, alias="OPENAI_RATE_LIMIT_RETRIES")
+
+    # Chunk summary cache (Redis); the semantic tier needs Redis Stack (RediSearch)
+    summary_cache: bool = Field(default=True, alias="SUMMARY_CACHE")
+    summary_semantic_cache: bool = Field(default=False, alias="SUMMARY_SEMANTIC_CACHE")
+    summary_cache_similarity: float = Field(default=0.95, alias="SUMMARY_CACHE_SIMILARITY")
+    summary_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, alias="SUMMARY_CACHE_TTL_SECONDS")
+
+    # Whisper (transcription)
+    whisper_batch_size: int = Field(default=8, alias="WHISPER_BATCH_SIZE")  # <=1 disables batching
+    whisper_vad_min_silence_ms: int = Field(default=500, alias="WHISPER_VAD_MIN_SILENCE_MS")
 
     # Celery (can be auto-constructed from Redis settings)
     celery_broker_url: str = Field(default="", alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field(default="", alias="CELERY_RESULT_BACKEND")
+    celery_serializer: str = Field(default="msgpack", alias="CELERY_SERIALIZER")  # msgpack or orjson
 
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
     # Database synchronization (similar to TypeORM synchronize)
     db_sync: bool = Field(default=True, alias="DB_SYNC")
+    # Only one replica (the migrator) should run startup DDL; set false on the rest
+    run_migrations: bool = Field(default=True, alias="RUN_MIGRATIONS")
 
-    @property
+    @cached_property
     def database_url(self) -> str:
         """Construct PostgreSQL connection URL."""
         return (
@@ -73,32 +109,30 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
-    @property
-    def kafka_broker_list(self) -> List[str]:
-        """Parse Kafka brokers from comma-separated string."""
-        return [broker.strip() for broker in self.kafka_brokers.split(",")]
+    @cached_property
+    def kafka_broker_list(self) -> Tuple[str, ...]:
+        """Parse Kafka brokers from comma-separated string (immutable, parsed once)."""
+        return tuple(broker.strip() for broker in self.kafka_brokers.split(","))
+
+    def _redis_url(self, db: int = 0) -> str:
+        """Build a Redis URL (redis://[:password@]host:port/db) from Redis settings."""
+        auth = f":{self.redis_password}@" if self.redis_password else ""
+        return f"redis://{auth}{self.redis_host}:{self.redis_port}/{db}"
 
-    @property
+    @cached_property
     def celery_broker_url_resolved(self) -> str:
-        """Resolve Celery broker URL from Redis settings if not provided."""
-        if self.celery_broker_url:
-            return self.celery_broker_url
-        # Redis URL format: redis://[:password@]host:port/db
-        if self.redis_password:
-            return f"redis://:{self.redis_password}@{self.redis_host}:{self.redis_port}/0"
-        return f"redis://{self.redis_host}:{self.redis_port}/0"
-
-    @property
+        """Resolve Celery broker URL from Redis settings (db 0) if not provided."""
+        return self.celery_broker_url or self._redis_url(0)
+
+    @cached_property
     def celery_result_backend_resolved(self) -> str:
-        """Resolve Celery result backend from Redis settings if not provided."""
-        if self.celery_result_backend:
-            return self.celery_result_backend
-        # Redis URL format: redis://[:password@]host:port/db
-        if self.redis_password:
-            return f"redis://:{self.redis_password}@{self.redis_host}:{self.redis_port}/0"
-        return f"redis://{self.redis_host}:{self.redis_port}/0"
-
-    @property
+        """Resolve Celery result backend from Redis settings (db 1) if not provided.
+
+        A separate db keeps result keys out of the broker's keyspace.
+        """
+        return self.celery_result_backend or self._redis_url(1)
+
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production."""
         return self.node_env.lower() == "production"
@@ -106,6 +140,12 @@ class Settings(BaseSettings):
 
 @lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance."""
+    """Get cached settings instance.
+
+    Resolved once per process. Celery imports celery_app (and so builds this)
+    in the main worker process, so prefork children - including those
+    recycled by worker_max_tasks_per_child - inherit the parsed instance
+    instead of re-reading the environment and .env file.
+    """
     return Settings()
 
@@ -1,10 +1,11 @@
 """Base database models and session management."""
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
+import orjson
 from sqlalchemy import Column, DateTime, Integer, create_engine
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.sql import func
 
 from config import get_settings
@@ -18,18 +19,61 @@ if settings.db_schema:
     # Set the search_path to use the specified schema
     connect_args["options"] = f"-csearch_path={settings.db_schema}"
 
+
+def _json_serializer(value: Any) -> str:
+    """JSON/JSONB column serializer (orjson; the drivers take str)."""
+    return orjson.dumps(value).decode()
+
+
+# pool_pre_ping (DB_POOL_PRE_PING, on by default) tests a connection on checkout
+# so one dropped while a task sat in S3/Whisper/OpenAI work (server or NAT idle
+# timeout) is replaced silently instead of failing the task and burning a
+# retry; pool_recycle retires connections by age. Celery children get a fresh
+# pool after fork (see celery_app worker_process_init).
+# LIFO checkout keeps reusing the most recently returned (warm) connection, so
+# surplus idle connections age out via pool_recycle instead of being cycled.
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_use_lifo=True,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     echo=settings.log_level == "DEBUG",
     connect_args=connect_args,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Thread-local session for Celery workers: the same Session object (and the
+# services bound to it) is reused across tasks; close() after each task
+# returns its connection to the pool
+WorkerSession = scoped_session(SessionLocal)
+
+
+def prewarm_pool(count: Optional[int] = None) -> int:
+    """
+    Open pooled connections up front so the first requests skip connect/auth.
+
+    Args:
+        count: Connections to open (default: DB_POOL_SIZE)
+
+    Returns:
+        Number of connections opened and returned to the pool
+    """
+    conns = []
+    try:
+        for _ in range(count or settings.db_pool_size):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
+
+
 # Base class for all models
 Base = declarative_base()
 
@@ -1,7 +1,8 @@
 """Generic CRUD repository pattern similar to nest-be."""
+from functools import lru_cache
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, inspect, lambda_stmt, select, text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -9,6 +10,25 @@ from database.base import BaseEntity
 
 ModelType = TypeVar("ModelType", bound=BaseEntity)
 
+# Rows per multi-row INSERT (keeps bound parameters well under driver limits)
+CREATE_MANY_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def _column_map(model: Type[BaseEntity]) -> Dict[str, Any]:
+    """Map upper-cased column attribute names to model attributes (built once per model)."""
+    return {
+        attr.key.upper(): getattr(model, attr.key)
+        for attr in inspect(model).mapper.column_attrs
+    }
+
+
+def _column_equals(column: Any, value: Any):
+    """Build a cacheable equality criterion step for a lambda statement."""
+    if value is None:
+        return lambda s: s.where(column.is_(None))
+    return lambda s: s.where(column == value)
+
 
 class GenericRepository(Generic[ModelType]):
     """Generic CRUD repository following nest-be pattern."""
@@ -30,13 +50,28 @@ class GenericRepository(Generic[ModelType]):
             self.session.rollback()
             raise ValueError(f"Failed to create {self.model.__name__}: {str(e)}") from e
 
+    def create_many(self, rows: List[Dict[str, Any]]) -> List[ModelType]:
+        """Create many records with batched INSERT ... RETURNING (no per-row refresh)."""
+        if not rows:
+            return []
+        try:
+            stmt = insert(self.model).returning(self.model)
+            instances: List[ModelType] = []
+            for i in range(0, len(rows), CREATE_MANY_BATCH_SIZE):
+                batch = rows[i : i + CREATE_MANY_BATCH_SIZE]
+                instances.extend(self.session.scalars(stmt, batch).all())
+            self.session.commit()
+            return instances
+        except IntegrityError as e:
+            self.session.rollback()
+            raise ValueError(f"Failed to create {self.model.__name__} records: {str(e)}") from e
+
     def find_one(
         self, where: Optional[Dict[str, Any]] = None
     ) -> Optional[ModelType]:
         """Find a single record matching criteria."""
-        query = select(self.model)
-        if where:
-            query = query.filter_by(**where)
+        model = self.model
+        query = self._apply_where(lambda_stmt(lambda: select(model)), where)
         result = self.session.execute(query).scalar_one_or_none()
         return result
 
@@ -46,6 +81,7 @@ class GenericRepository(Generic[ModelType]):
         skip: int = 0,
         limit: Optional[int] = None,
         order_by: Optional[str] = None,
+        lock: Optional[str] = None,
     ) -> List[ModelType]:
         """Find all records matching criteria.
 
@@ -55,50 +91,43 @@ class GenericRepository(Generic[ModelType]):
             limit: Maximum number of records to return
             order_by: Order by clause (e.g., "created_at DESC", "id ASC")
                      Can be column name or "column DESC"/"column ASC"
+            lock: "skip_locked" to SELECT ... FOR UPDATE SKIP LOCKED (rows stay
+                  locked until the caller's transaction ends)
         """
         query = select(self.model)
         if where:
             query = query.filter_by(**where)
         if order_by:
             # Handle string order_by (e.g., "created_at DESC" or "id ASC")
-            from sqlalchemy import text
-            order_upper = order_by.upper().strip()
-            if " DESC" in order_upper or " ASC" in order_upper:
-                # Parse "column DESC" or "column ASC"
-                parts = order_upper.split()
-                column_name = parts[0]
-                direction = parts[1] if len(parts) > 1 else "ASC"
-                # Try to get column attribute (case-insensitive)
-                column = None
-                for attr_name in dir(self.model):
-                    if attr_name.upper() == column_name and not attr_name.startswith("_"):
-                        column = getattr(self.model, attr_name)
-                        break
-
-                if column:
-                    query = query.order_by(column.desc() if direction == "DESC" else column.asc())
-                else:
-                    # Fallback to text() if column not found (e.g., SQL expression)
-                    query = query.order_by(text(order_by))
+            parts = order_by.upper().split()
+            column_name = parts[0] if parts else ""
+            direction = parts[1] if len(parts) > 1 else "ASC"
+            column = _column_map(self.model).get(column_name)
+
+            if column is not None and len(parts) <= 2 and direction in ("ASC", "DESC"):
+                query = query.order_by(column.desc() if direction == "DESC" else column.asc())
             else:
-                # Simple column name - try to find matching attribute
-                column = None
-                for attr_name in dir(self.model):
-                    if attr_name.upper() == order_upper and not attr_name.startswith("_"):
-                        column = getattr(self.model, attr_name)
-                        break
-                if column:
-                    query = query.order_by(column)
-                else:
-                    # Fallback to text() for complex expressions
-                    query = query.order_by(text(order_by))
+                # Fallback to text() if column not found (e.g., SQL expression)
+                query = query.order_by(text(order_by))
         if skip:
             query = query.offset(skip)
         if limit:
             query = query.limit(limit)
+        if lock == "skip_locked":
+            query = query.with_for_update(skip_locked=True)
+        elif lock is not None:
+            raise ValueError(f"Unsupported lock mode: {lock}")
         results = self.session.execute(query).scalars().all()
         return list(results)
 
+    def find_in(self, field: str, values: List[Any]) -> List[ModelType]:
+        """Find all records whose field is one of values (single IN query)."""
+        if not values:
+            return []
+        column = getattr(self.model, field)
+        query = select(self.model).where(column.in_(values))
+        return list(self.session.execute(query).scalars().all())
+
     def update(
         self, where: Dict[str, Any], data: Dict[str, Any]
     ) -> Optional[ModelType]:
@@ -123,9 +152,29 @@ class GenericRepository(Generic[ModelType]):
 
     def count(self, where: Optional[Dict[str, Any]] = None) -> int:
         """Count records matching criteria."""
-        query = select(func.count(self.model.id))
-        if where:
-            query = query.filter_by(**where)
+        model = self.model
+        query = self._apply_where(lambda_stmt(lambda: select(func.count(model.id))), where)
         result = self.session.execute(query).scalar()
         return result or 0
 
+    def exists(self, where: Optional[Dict[str, Any]] = None) -> bool:
+        """Check whether any record matches criteria (SELECT id ... LIMIT 1, no row load).
+
+        Built as a lambda statement like find_one, so the compiled SQL is cached.
+        """
+        model = self.model
+        query = self._apply_where(lambda_stmt(lambda: select(model.id)), where)
+        query += lambda s: s.limit(1)
+        return self.session.execute(query).first() is not None
+
+    def _apply_where(self, stmt, where: Optional[Dict[str, Any]]):
+        """Append equality criteria to a lambda statement.
+
+        Each criterion is a lambda step, so SQLAlchemy caches the built and
+        compiled statement per model and where-key shape and only binds the
+        new values on later calls.
+        """
+        for key, value in (where or {}).items():
+            stmt += _column_equals(getattr(self.model, key), value)
+        return stmt
+
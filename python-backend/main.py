@@ -7,7 +7,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from config import get_settings
-from database.base import Base, engine
+from database.base import Base, engine, prewarm_pool
 from database.models import (
     OutboxEvent,
     ProcessedMessage,
@@ -36,31 +36,43 @@ async def lifespan(app: FastAPI):
     logger.info(f"📊 Database: {settings.database_url.split('@')[1] if '@' in settings.database_url else 'N/A'}")
     logger.info(f"📨 Kafka: {settings.kafka_brokers}")
 
-    # Enable uuid-ossp extension (needed for UUID generation)
-    try:
-        with engine.begin() as conn:
-            # Try to enable extension in the specified schema first
-            try:
-                conn.execute(text(f'CREATE EXTENSION IF NOT EXISTS "uuid-ossp" SCHEMA {settings.db_schema}'))
-                logger.info(f"✅ UUID extension enabled in schema: {settings.db_schema}")
-            except Exception:
-                # If schema-specific fails, try in public schema
-                conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
-                logger.info("✅ UUID extension enabled in public schema")
-    except Exception as e:
-        # If extension already exists or permission denied, that's okay
-        if "already exists" in str(e).lower():
-            logger.info("ℹ️ UUID extension already exists")
+    # Schema DDL runs only on the migrator replica (RUN_MIGRATIONS); other
+    # replicas skip the extension/table introspection entirely
+    if settings.run_migrations:
+        # Enable uuid-ossp extension (needed for UUID generation)
+        try:
+            with engine.begin() as conn:
+                # Try to enable extension in the specified schema first
+                try:
+                    conn.execute(text(f'CREATE EXTENSION IF NOT EXISTS "uuid-ossp" SCHEMA {settings.db_schema}'))
+                    logger.info(f"✅ UUID extension enabled in schema: {settings.db_schema}")
+                except Exception:
+                    # If schema-specific fails, try in public schema
+                    conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+                    logger.info("✅ UUID extension enabled in public schema")
+        except Exception as e:
+            # If extension already exists or permission denied, that's okay
+            if "already exists" in str(e).lower():
+                logger.info("ℹ️ UUID extension already exists")
+            else:
+                logger.warning(f"⚠️ Could not enable UUID extension: {str(e)}. Ensure it's enabled manually.")
+
+        # Synchronize database schema (create/update tables)
+        if settings.db_sync:
+            logger.info("🔄 Database synchronization enabled - creating/updating tables...")
+            Base.metadata.create_all(bind=engine, checkfirst=True)
+            logger.info("✅ Database tables synchronized")
         else:
-            logger.warning(f"⚠️ Could not enable UUID extension: {str(e)}. Ensure it's enabled manually.")
-
-    # Synchronize database schema (create/update tables)
-    if settings.db_sync:
-        logger.info("🔄 Database synchronization enabled - creating/updating tables...")
-        Base.metadata.create_all(bind=engine, checkfirst=True)
-        logger.info("✅ Database tables synchronized")
+            logger.info("⏭️  Database synchronization disabled")
     else:
-        logger.info("⏭️  Database synchronization disabled")
+        logger.info("⏭️  Skipping schema sync (RUN_MIGRATIONS disabled on this replica)")
+
+    # Prime the connection pool so the first requests only pay a checkout
+    try:
+        warmed = prewarm_pool()
+        logger.info(f"✅ Database pool pre-warmed with {warmed} connections")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not pre-warm database pool: {str(e)}")
 
     yield
 
@@ -5,6 +5,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from database.base import SessionLocal, engine
+from providers.redis import get_redis_client
 
 router = APIRouter(prefix="/api/v1/health", tags=["Health"])
 
@@ -29,18 +30,17 @@ async def health_check(db: Session = Depends(get_db)):
     # Database check
     try:
         db.execute(text("SELECT 1"))
-        status["checks"]["database"] = {"status": "up"}
+        status["checks"]["database"] = {"status": "up", "pool": engine.pool.status()}
     except Exception as e:
         status["checks"]["database"] = {"status": "down", "error": str(e)}
         status["status"] = "degraded"
 
-    # Redis check (via engine pool)
+    # Redis check (Celery broker / dedup cache); the DB is only probed once above
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        status["checks"]["connection_pool"] = {"status": "up"}
+        get_redis_client().ping()
+        status["checks"]["redis"] = {"status": "up"}
     except Exception as e:
-        status["checks"]["connection_pool"] = {"status": "down", "error": str(e)}
+        status["checks"]["redis"] = {"status": "down", "error": str(e)}
         status["status"] = "degraded"
 
     return JSONResponse(status)
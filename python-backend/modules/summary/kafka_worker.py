@@ -1,12 +1,14 @@
 """Kafka consumer worker that processes video.transcribed events."""
 import logging
 import sys
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 
-from common.handlers.kafka import validate_kafka_payload, db_session_context
+from celery_app import celery_app
+from common.handlers.kafka import db_session_context, extract_video_event
+from common.types.video import VideoTranscribedPayload
 from database.models import VideoSummary
 from database.repository import GenericRepository
-from modules.summary.tasks.video_summary import summarize_video_task
+from modules.videos.constants import CELERY_TASK_SUMMARIZE_VIDEO
 from modules.videos.services.processed_message_service import ProcessedMessageService
 from providers.kafka import create_consumer
 
@@ -22,14 +24,32 @@ TOPIC_NAME = "video.transcribed"
 
 def handle_video_transcribed(payload: Dict):
     """
-    Handler for video.transcribed Kafka events.
+    Handler for a single video.transcribed Kafka event.
+
+    Thin shim over handle_video_transcribed_batch.
+
+    Args:
+        payload: Event payload (see handle_video_transcribed_batch)
+    """
+    handle_video_transcribed_batch([payload])
+
+
+def handle_video_transcribed_batch(payloads: List[Dict]):
+    """
+    Handler for a batch of video.transcribed Kafka events.
 
     This handler checks real idempotency (summary exists) before skipping.
     If summary doesn't exist, it processes even if event was marked as processed
     (handles stuck states where task failed but event was marked).
 
+    One DB session serves the whole batch: existing summaries are read with a
+    single IN query and all events are claimed with a single multi-row
+    INSERT ... ON CONFLICT DO NOTHING. The claims commit before any task is
+    queued; if a dispatch fails, the claims of the events not yet queued are
+    released and the error propagates so the consumer redelivers them.
+
     Args:
-        payload: Event payload containing:
+        payloads: Event payloads, each containing:
             - id: Event ID (from outbox)
             - eventId: Alternative event ID (same as id)
             - videoId: Video ID
@@ -37,63 +57,135 @@ def handle_video_transcribed(payload: Dict):
             - snippetCount: Number of segments
             - ts: Timestamp
     """
-    # Validate payload and extract common fields
-    event_id, video_id = validate_kafka_payload(payload, ["videoId"])
-    if not event_id or video_id is None:
-        return
+    # Validate payloads and extract common fields (duplicates within the batch are dropped)
+    events = []
+    batch_event_ids = set()
+    for payload in payloads:
+        event_id, video_id = extract_video_event(payload)
+        if not event_id or event_id in batch_event_ids:
+            continue
+        batch_event_ids.add(event_id)
+        logger.info(
+            "📥 Received %s event: eventId=%s, videoId=%s", TOPIC_NAME, event_id, video_id
+        )
+        events.append((payload, event_id, video_id))
 
-    logger.info(
-        f"📥 Received {TOPIC_NAME} event: eventId={event_id}, videoId={video_id}"
-    )
+    if not events:
+        return
 
     # Use context manager for database session
     with db_session_context() as db_session:
         summary_repo = GenericRepository(VideoSummary, db_session)
         processed_service = ProcessedMessageService(db_session)
 
-        # Real idempotency check: does summary exist and is it complete?
-        # VideoSummary doesn't have a status field, so we check if summary_text exists
-        existing_summary = summary_repo.find_one({"video_id": video_id})
-        if existing_summary and existing_summary.summary_text:
-            logger.info(
-                f"✅ Summary already exists for video {video_id} (complete), skipping"
+        # Redis SETNX (one pipelined round-trip) drops recent duplicates before
+        # any DB work; the session only checks out a connection on first execute
+        seen_event_ids = processed_service.seen_recently_many(batch_event_ids, TOPIC_NAME)
+        if seen_event_ids:
+            logger.info("⏭️ Skipping %d duplicate messages", len(seen_event_ids))
+            events = [event for event in events if str(event[1]) not in seen_event_ids]
+            batch_event_ids -= seen_event_ids
+            if not events:
+                return
+
+        try:
+            complete_video_ids, claimed_event_ids = _claim_batch(
+                events, batch_event_ids, summary_repo, processed_service
             )
-            # Still mark event as processed if not already marked (for tracking)
-            if not processed_service.is_processed(event_id, TOPIC_NAME):
-                try:
-                    processed_service.mark_as_processed(event_id, TOPIC_NAME, skip_check=True)
-                except Exception:
-                    pass  # Non-critical
-            return
-
-        # Check if event was marked as processed
-        was_processed = processed_service.is_processed(event_id, TOPIC_NAME)
+        except Exception:
+            # The claims roll back with the session; let redeliveries through the Redis gate too
+            processed_service.forget_seen(batch_event_ids, TOPIC_NAME)
+            raise
+
+    # Queue Celery tasks outside the DB session: the claims are committed and
+    # the connection is back in the pool before the broker round-trips
+    _dispatch_events(events, complete_video_ids, claimed_event_ids, processed_service)
+
+
+def _claim_batch(
+    events: List[Tuple[Dict, str, int]],
+    batch_event_ids: Set[str],
+    summary_repo: GenericRepository,
+    processed_service: ProcessedMessageService,
+) -> Tuple[Set[int], Set[str]]:
+    """
+    Check existing summaries and claim the batch.
+
+    Returns:
+        Tuple of (video IDs with a complete summary, event IDs claimed by this call)
+    """
+    # Real idempotency check: does summary exist and is it complete?
+    # VideoSummary doesn't have a status field, so we check if summary_text exists
+    summaries = summary_repo.find_in("video_id", list({video_id for _, _, video_id in events}))
+    complete_video_ids = {s.video_id for s in summaries if s.summary_text}
+    # Duplicate check and mark as processed in one round-trip for the whole batch;
+    # committed when the session exits
+    claimed_event_ids = processed_service.try_claim_many(
+        [(event_id, TOPIC_NAME) for event_id in batch_event_ids]
+    )
+    return complete_video_ids, claimed_event_ids
+
+
+def _dispatch_events(
+    events: List[Tuple[Dict, str, int]],
+    complete_video_ids: Set[int],
+    claimed_event_ids: Set[str],
+    processed_service: ProcessedMessageService,
+):
+    """Queue summarization for each event that still needs it."""
+    for index, (payload, event_id, video_id) in enumerate(events):
+        was_processed = str(event_id) not in claimed_event_ids
+
+        if video_id in complete_video_ids:
+            logger.info("✅ Summary already exists for video %s (complete), skipping", video_id)
+            continue
+
         if was_processed:
             # Event was processed but summary doesn't exist - likely task failed
             logger.warning(
-                f"⚠️ Event {event_id} was marked as processed but summary doesn't exist for video {video_id}. "
-                f"Allowing reprocessing to fix stuck state..."
+                "⚠️ Event %s was marked as processed but summary doesn't exist for video %s. "
+                "Allowing reprocessing to fix stuck state...",
+                event_id,
+                video_id,
             )
 
         # Queue Celery task immediately (non-blocking)
-        logger.info(f"🔄 Queuing summarization task for video {video_id}...")
-        task_result = summarize_video_task.delay(payload)
+        logger.info("🔄 Queuing summarization task for video %s...", video_id)
+        try:
+            task_result = celery_app.send_task(CELERY_TASK_SUMMARIZE_VIDEO, args=[payload])
+        except Exception:
+            # This event and the rest of the batch were never queued: release
+            # them so the redelivery is processed
+            _release_events(events[index:], claimed_event_ids, processed_service)
+            raise
 
-        # Mark as processed (best-effort, skip duplicate check since we already verified summary)
+        logger.info(
+            "✅ Queued summarization task: videoId=%s, taskId=%s", video_id, task_result.id
+        )
+
+
+def _release_events(
+    events: List[Tuple[Dict, str, int]],
+    claimed_event_ids: Set[str],
+    processed_service: ProcessedMessageService,
+):
+    """Compensate for events that were claimed (or seen) but not queued."""
+    unclaimed_event_ids = set()
+    for _, event_id, _ in events:
+        if str(event_id) not in claimed_event_ids:
+            unclaimed_event_ids.add(event_id)
+            continue
+        # Release our claim (and the Redis key) so a redelivery can be processed
         try:
-            processed_service.mark_as_processed(event_id, TOPIC_NAME, skip_check=True)
-            logger.debug(
-                f"✅ Marked event as processed: eventId={event_id}, videoId={video_id}"
-            )
-        except Exception as mark_error:
-            # Non-critical: task will handle idempotency via DB constraints
+            with db_session_context() as db_session:
+                ProcessedMessageService(db_session).release_claim(event_id, TOPIC_NAME)
+        except Exception as release_error:
             logger.warning(
-                f"⚠️ Failed to mark event as processed (non-critical, task will handle idempotency): {str(mark_error)}"
+                "⚠️ Failed to release claim for eventId=%s: %s", event_id, release_error
             )
 
-        logger.info(
-            f"✅ Queued summarization task: videoId={video_id}, taskId={task_result.id}"
-        )
+    # Let redeliveries of the unclaimed ones through the Redis gate again
+    processed_service.forget_seen(unclaimed_event_ids, TOPIC_NAME)
 
 
 def main():
@@ -101,7 +193,12 @@ def main():
     logger.info("🚀 Starting Kafka consumer worker for video.transcribed events")
 
     # Create consumer for video.transcribed topic
-    consumer = create_consumer("video.transcribed", handle_video_transcribed)
+    consumer = create_consumer(
+        "video.transcribed",
+        handle_video_transcribed_batch,
+        payload_type=VideoTranscribedPayload,
+        batch=True,
+    )
 
     try:
         # Start consuming
@@ -0,0 +1,136 @@
+"""Client-side request/token throttling for OpenAI calls."""
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from config import get_settings
+from providers.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Seconds every caller waits after any request hits a 429
+RATE_LIMIT_COOLDOWN_SECONDS = 15
+
+# Shared by every worker process, so OPENAI_RPM/OPENAI_TPM bound the account as a whole
+BUCKET_KEY = "openai:ratelimit:bucket"
+PAUSE_KEY = "openai:ratelimit:paused"
+# An idle bucket is full again after a minute; let Redis drop it after two
+BUCKET_TTL_SECONDS = 120
+
+# Refill and take from both buckets atomically. Returns 0 once the request
+# fits, else the milliseconds to wait (the 429 pause, if one is set, first).
+# Redis TIME keeps the refill independent of worker clocks
+ACQUIRE_SCRIPT = """
+local paused = redis.call('PTTL', KEYS[2])
+if paused > 0 then
+    return paused
+end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(now - (tonumber(state[3]) or now), 0)
+requests = math.min(requests + elapsed * rpm / 60, rpm)
+tokens = math.min(tokens + elapsed * tpm / 60, tpm)
+local wait = 0
+if requests >= 1 and tokens >= cost then
+    requests = requests - 1
+    tokens = tokens - cost
+else
+    wait = math.max((1 - requests) * 60 / rpm, (cost - tokens) * 60 / tpm, 0.01)
+end
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return math.ceil(wait * 1000)
+"""
+
+
+def estimate_tokens(text: str, max_tokens: int) -> int:
+    """Rough token cost of a request: ~4 chars per prompt token plus the completion budget."""
+    return len(text) // 4 + max_tokens
+
+
+class RateLimiter:
+    """
+    Token bucket over requests-per-minute and tokens-per-minute.
+
+    Both buckets live in Redis and are shared by every worker process, so
+    the limits apply to the account rather than to each prefork child. They
+    refill continuously (capacity / 60 per second, capped at one minute's
+    worth); acquire() waits until both can cover a request, so bursts use
+    the full quota without tripping 429s. A 429 pauses every process for
+    RATE_LIMIT_COOLDOWN_SECONDS. If Redis is unreachable, requests go out
+    unthrottled and a 429 still re-queues them.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        redis_client: Optional[Redis] = None,
+    ):
+        """Initialize limiter over the shared buckets."""
+        self.max_requests_per_minute = requests_per_minute
+        self.max_tokens_per_minute = tokens_per_minute
+        self.redis_client = redis_client or get_redis_client()
+        self._acquire_script = self.redis_client.register_script(ACQUIRE_SCRIPT)
+        # Local copy of the pause so this process doesn't poll Redis through it
+        self._paused_until = 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request of the given token cost fits in both buckets.
+
+        Args:
+            tokens: Estimated tokens for the request (see estimate_tokens)
+        """
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            try:
+                wait_ms = await asyncio.to_thread(
+                    self._acquire_script,
+                    keys=[BUCKET_KEY, PAUSE_KEY],
+                    args=[
+                        self.max_requests_per_minute,
+                        self.max_tokens_per_minute,
+                        tokens,
+                        BUCKET_TTL_SECONDS,
+                    ],
+                )
+            except RedisError as e:
+                logger.warning("⚠️ OpenAI rate limiter unavailable, not throttling: %s", e)
+                return
+            if not wait_ms:
+                return
+            await asyncio.sleep(wait_ms / 1000.0)
+
+    def note_rate_limited(self) -> None:
+        """Pause all callers, in every process, for RATE_LIMIT_COOLDOWN_SECONDS after a 429."""
+        self._paused_until = time.monotonic() + RATE_LIMIT_COOLDOWN_SECONDS
+        try:
+            self.redis_client.set(PAUSE_KEY, 1, ex=RATE_LIMIT_COOLDOWN_SECONDS)
+        except RedisError as e:
+            logger.warning("⚠️ Failed to share the OpenAI rate-limit pause: %s", e)
+        logger.warning("⏸️ OpenAI rate limit hit, pausing requests for %ss", RATE_LIMIT_COOLDOWN_SECONDS)
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the OpenAI rate limiter singleton (its buckets are shared through Redis)."""
+    return RateLimiter(settings.openai_rpm, settings.openai_tpm)
@@ -0,0 +1,209 @@
+"""Redis cache for chunk summaries (exact hash tier + optional semantic tier)."""
+import asyncio
+import hashlib
+import logging
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from redis import Redis
+from redis.commands.search.field import TextField, VectorField
+from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+from redis.commands.search.query import Query
+from redis.exceptions import ResponseError
+
+from config import get_settings
+from providers.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when the chunk prompt changes so stale summaries are not served
+CACHE_VERSION = "v2"
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+# ~2k tokens of transcript; keeps every input well under the 8191-token limit
+EMBEDDING_MAX_CHARS = 8000
+
+# Keys and index are partitioned by embedding dimension
+EXACT_KEY_PREFIX = f"chunk_summary:{CACHE_VERSION}:exact:"
+VECTOR_KEY_PREFIX = f"chunk_summary:{CACHE_VERSION}:vec:{EMBEDDING_DIM}:"
+VECTOR_INDEX_NAME = f"idx:chunk_summary:{CACHE_VERSION}:{EMBEDDING_DIM}"
+
+
+class SummaryCache:
+    """
+    Two-tier cache in front of chunk summarization.
+
+    Tier 1 is an exact match on sha256 of the chunk text (MGET/SETEX).
+    Tier 2, enabled with SUMMARY_SEMANTIC_CACHE, is a KNN lookup over chunk
+    embeddings in a RediSearch HNSW index (needs Redis Stack); a neighbour
+    with cosine similarity >= SUMMARY_CACHE_SIMILARITY counts as a hit.
+    Every Redis/embedding failure is logged and treated as a miss.
+    """
+
+    def __init__(self, redis_client: Optional[Redis] = None, embeddings_client=None):
+        """Initialize summary cache."""
+        self.redis_client = redis_client or get_redis_client()
+        self.embeddings_client = embeddings_client
+        self.ttl = settings.summary_cache_ttl_seconds
+        self.semantic = settings.summary_semantic_cache and embeddings_client is not None
+        self._index_ready = False
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        """Stable key suffix for a chunk's text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def lookup_many(
+        self, texts: List[str]
+    ) -> Tuple[List[Optional[str]], List[Optional[List[float]]]]:
+        """
+        Look up cached summaries for all chunks of a video.
+
+        One MGET covers the exact tier; the exact misses are then embedded
+        in a single embeddings request and searched in the vector index.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            Tuple of (summary or None per chunk, embedding per chunk if one was computed)
+        """
+        summaries: List[Optional[str]] = [None] * len(texts)
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if not texts:
+            return summaries, embeddings
+
+        digests = [self._digest(text) for text in texts]
+        try:
+            cached = await asyncio.to_thread(
+                self.redis_client.mget, [EXACT_KEY_PREFIX + digest for digest in digests]
+            )
+        except Exception as e:
+            logger.warning("⚠️ Chunk summary cache lookup failed: %s", e)
+            return summaries, embeddings
+        for i, value in enumerate(cached):
+            if value is not None:
+                summaries[i] = value.decode("utf-8")
+
+        misses = [i for i, summary in enumerate(summaries) if summary is None]
+        if not self.semantic or not misses:
+            return summaries, embeddings
+
+        try:
+            vectors = await self._embed_many([texts[i] for i in misses])
+            nearest = await asyncio.to_thread(
+                lambda: [self._nearest_summary(vector) for vector in vectors]
+            )
+        except Exception as e:
+            logger.warning("⚠️ Semantic cache lookup failed: %s", e)
+            return summaries, embeddings
+        for i, vector, summary in zip(misses, vectors, nearest):
+            embeddings[i] = vector
+            summaries[i] = summary
+        return summaries, embeddings
+
+    async def store_many(
+        self,
+        texts: List[str],
+        summaries: List[str],
+        embeddings: List[Optional[List[float]]],
+    ) -> None:
+        """
+        Cache chunk summaries in one pipelined round-trip (best-effort).
+
+        Args:
+            texts: Chunk texts
+            summaries: Summaries to cache, aligned with texts
+            embeddings: Chunk embeddings from lookup_many(), for the semantic tier
+        """
+        if not texts:
+            return
+        try:
+            await asyncio.to_thread(self._store_many, texts, summaries, embeddings)
+        except Exception as e:
+            logger.warning("⚠️ Failed to cache chunk summaries: %s", e)
+
+    async def _embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed all chunks in a single request (inputs truncated to stay under the model limit)."""
+        response = await self.embeddings_client.embeddings.create(
+            model=EMBEDDING_MODEL, input=[text[:EMBEDDING_MAX_CHARS] for text in texts]
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _ensure_index(self) -> None:
+        """Create the HNSW vector index once per process (no-op if it exists)."""
+        if self._index_ready:
+            return
+        try:
+            self.redis_client.ft(VECTOR_INDEX_NAME).info()
+        except ResponseError:
+            self.redis_client.ft(VECTOR_INDEX_NAME).create_index(
+                [
+                    TextField("summary", no_stem=True),
+                    VectorField(
+                        "embedding",
+                        "HNSW",
+                        {"TYPE": "FLOAT32", "DIM": EMBEDDING_DIM, "DISTANCE_METRIC": "COSINE"},
+                    ),
+                ],
+                definition=IndexDefinition(prefix=[VECTOR_KEY_PREFIX], index_type=IndexType.HASH),
+            )
+            logger.info("✅ Created vector index %s", VECTOR_INDEX_NAME)
+        self._index_ready = True
+
+    def _nearest_summary(self, embedding: List[float]) -> Optional[str]:
+        """Return the nearest cached summary if it is similar enough."""
+        self._ensure_index()
+        query = (
+            Query("*=>[KNN 1 @embedding $vec AS distance]")
+            .sort_by("distance")
+            .return_fields("summary", "distance")
+            .dialect(2)
+        )
+        result = self.redis_client.ft(VECTOR_INDEX_NAME).search(
+            query, query_params={"vec": array("f", embedding).tobytes()}
+        )
+        if not result.docs:
+            return None
+        doc = result.docs[0]
+        # COSINE distance = 1 - cosine similarity
+        if 1.0 - float(doc.distance) >= settings.summary_cache_similarity:
+            summary = doc.summary
+            return summary.decode("utf-8") if isinstance(summary, bytes) else summary
+        return None
+
+    def _store_many(
+        self,
+        texts: List[str],
+        summaries: List[str],
+        embeddings: List[Optional[List[float]]],
+    ) -> None:
+        """SETEX the exact keys and HSET any embeddings in one pipeline."""
+        semantic = self.semantic and any(embedding is not None for embedding in embeddings)
+        if semantic:
+            self._ensure_index()
+        pipe = self.redis_client.pipeline(transaction=False)
+        for text, summary, embedding in zip(texts, summaries, embeddings):
+            digest = self._digest(text)
+            pipe.setex(EXACT_KEY_PREFIX + digest, self.ttl, summary)
+            if semantic and embedding is not None:
+                key = VECTOR_KEY_PREFIX + digest
+                pipe.hset(
+                    key, mapping={"summary": summary, "embedding": array("f", embedding).tobytes()}
+                )
+                pipe.expire(key, self.ttl)
+        pipe.execute()
+
+
+@lru_cache(maxsize=1)
+def get_summary_cache(embeddings_client=None) -> SummaryCache:
+    """Get or create the summary cache singleton.
+
+    Args:
+        embeddings_client: AsyncOpenAI client used by the semantic tier (the
+            process-wide client, so the cache is built once per process)
+    """
+    return SummaryCache(embeddings_client=embeddings_client)
@@ -1,32 +1,119 @@
 """Video summary service with OpenAI integration."""
-import json
+import asyncio
+import io
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import boto3
+import httpx
+import ijson
+import orjson
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
-from openai import OpenAI
+from ijson.common import ObjectBuilder
+from openai import AsyncOpenAI, RateLimitError
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import get_settings
 from database.models import VideoSummary, VideoStatusLog
 from database.repository import GenericRepository
-from modules.videos.services.outbox_service import OutboxService
+from modules.summary.services.openai_throttle import estimate_tokens, get_rate_limiter
+from modules.summary.services.summary_cache import get_summary_cache
 from modules.videos.services.video_status_log_service import VideoStatusLogService
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Packed map requests: combined prompt budget (keeps K chunks + K summaries
+# well inside the model's context); full-size chunks always go alone
+PACK_PROMPT_TOKEN_BUDGET = 6000
+
+# System prompts are constants and always sent first so every request of a
+# phase shares a byte-identical prefix (OpenAI prompt caching keys on it)
+MAP_SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarizes video transcripts. "
+    "Provide a concise summary of the key points of each transcript segment in 2-3 sentences."
+)
+FINAL_SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates final video summaries. "
+    "Turn the provided material into a coherent, comprehensive summary "
+    "of the entire video in 4-6 sentences. Focus on main themes and key insights."
+)
+
+# Reduce tree: summaries are merged in groups of this size per level...
+REDUCE_GROUP_SIZE = 5
+# ...until at most this many remain for the final reduction call
+REDUCE_FINAL_MAX_SUMMARIES = 10
+
+
+# Summary uploads overlap the DB transaction in process_summary
+_upload_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary-upload")
+
+
+def summary_s3_key(video_id: int) -> str:
+    """S3 key of a video's summary JSON."""
+    return f"summaries/{video_id}/summary.json"
+
+
+@dataclass(slots=True)
+class TranscriptChunk:
+    """A run of consecutive transcript segments summarized as one map unit."""
+
+    text: str
+    segments: List[Dict[str, Any]]
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
+# OpenAI HTTP pool: HTTP/2 multiplexes concurrent chunk requests over a few
+# connections; keepalive covers OPENAI_CONCURRENCY with headroom
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+
 # Initialize OpenAI client (lazy initialization to avoid import errors)
-_openai_client = None
+_async_openai_client = None
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get or create AsyncOpenAI client singleton (bound to the loop in run_async)."""
+    global _async_openai_client
+    if _async_openai_client is None:
+        _async_openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.AsyncClient(
+                http2=True, limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT
+            ),
+        )
+    return _async_openai_client
+
+
+# One event loop per process: the async client's connection pool stays valid
+# across tasks, unlike a fresh loop per asyncio.run()
+_event_loop = None
 
 
-def get_openai_client():
-    """Get or create OpenAI client singleton."""
-    global _openai_client
-    if _openai_client is None:
-        _openai_client = OpenAI(api_key=settings.openai_api_key)
-    return _openai_client
+def run_async(coro):
+    """Run a coroutine to completion on the process-wide event loop."""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop.run_until_complete(coro)
+
+
+# Transcripts larger than this are downloaded with concurrent ranged GETs
+TRANSCRIPT_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+TRANSCRIPT_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=TRANSCRIPT_MULTIPART_THRESHOLD,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
 
 # Initialize S3 client (lazy initialization)
 _s3_client = None
@@ -53,15 +140,12 @@ class VideoSummaryService:
         self,
         db_session,
         summary_repo: GenericRepository[VideoSummary],
-        outbox_service: Optional[OutboxService] = None,
     ):
         """Initialize video summary service."""
         self.db_session = db_session
         self.summary_repo = summary_repo
-        self.outbox_service = outbox_service or OutboxService(db_session)
         self.bucket = settings.aws_youtube_bucket
         self.chunk_size = 8000  # Tokens per chunk
-        self.max_chunks_per_batch = 5  # Process 5 chunks at a time
         # Initialize status log service
         status_log_repo = GenericRepository(VideoStatusLog, db_session)
         self.status_log_service = VideoStatusLogService(db_session, status_log_repo)
@@ -79,41 +163,46 @@ class VideoSummaryService:
         Returns:
             Dict with summary_id, summary_file_key, quality_score
         """
-        logger.info(
-            f"🎬 Starting summary processing for video {video_id}: {transcript_file_key}"
-        )
+        logger.debug("🎬 Starting summary processing for video %s: %s", video_id, transcript_file_key)
 
-        # 1. Download transcript from S3
+        # 1. Open transcript stream from S3 (segments are parsed lazily)
         transcript_data = self._download_transcript(transcript_file_key)
-        logger.info(f"📥 Downloaded transcript: {len(transcript_data.get('segments', []))} segments")
 
-        # 2. Chunk transcript into manageable pieces
-        chunks = self._chunk_transcript(transcript_data)
-        logger.info(f"📝 Chunked transcript into {len(chunks)} chunks")
+        # 2. Chunk transcript into manageable pieces while it streams in
+        chunks, transcript_chars = self._chunk_transcript(transcript_data)
+        logger.debug("📝 Chunked transcript into %d chunks", len(chunks))
 
-        # 3. Map: Generate summaries for each chunk
-        chunk_summaries = self._map_summarize_chunks(chunks)
-        logger.info(f"🗺️ Generated {len(chunk_summaries)} chunk summaries")
+        if len(chunks) == 1:
+            # 3-4. Short video: one final-summary call, no separate map/reduce
+            final_summary = self._summarize_short_transcript(chunks[0].text)
+            chunk_summaries = [final_summary]
+            logger.debug("⚡ Single-chunk transcript summarized directly (%d chars)", len(final_summary))
+        else:
+            # 3. Map: Generate summaries for each chunk
+            chunk_summaries = self._map_summarize_chunks(chunks)
+            logger.debug("🗺️ Generated %d chunk summaries", len(chunk_summaries))
 
-        # 4. Reduce: Combine chunk summaries into final summary
-        final_summary = self._reduce_summaries(chunk_summaries)
-        logger.info(f"🔗 Reduced to final summary ({len(final_summary)} chars)")
+            # 4. Reduce: Combine chunk summaries into final summary
+            final_summary = self._reduce_summaries(chunk_summaries)
+            logger.debug("🔗 Reduced to final summary (%d chars)", len(final_summary))
 
-        # 5. Calculate quality score
+        # 5. Start the S3 upload; it runs while the DB writes below are sent
+        upload = _upload_executor.submit(self._upload_summary_to_s3, video_id, final_summary)
+        summary_file_key = summary_s3_key(video_id)
+
+        # 6. Calculate quality score
         quality_score = self._calculate_quality_score(
-            transcript_data, final_summary, chunk_summaries
+            transcript_chars, final_summary, chunk_summaries
         )
 
-        # 6. Upload summary to S3
-        summary_file_key = self._upload_summary_to_s3(video_id, final_summary)
-
-        # 7. Save to database and add to outbox in transaction
+        # 7. Save to database and add to outbox in transaction (commits only
+        # once the upload has succeeded)
         summary_record = self._save_summary_with_outbox(
-            video_id, final_summary, summary_file_key, quality_score
+            video_id, final_summary, summary_file_key, quality_score, upload=upload
         )
 
-        logger.info(
-            f"✅ Summary processing completed: videoId={video_id}, summaryId={summary_record.id}"
+        logger.debug(
+            "✅ Summary processing completed: videoId=%s, summaryId=%s", video_id, summary_record.id
         )
 
         return {
@@ -123,162 +212,373 @@ class VideoSummaryService:
         }
 
     def _download_transcript(self, file_key: str) -> Dict[str, Any]:
-        """Download transcript JSON from S3."""
+        """
+        Open transcript JSON from S3 for streaming.
+
+        "segments" is an iterator parsed incrementally with ijson, and the
+        top-level scalars (full_text, video_id, ...) are filled into the
+        returned dict as the parser reaches them, so they are complete once
+        the segments are consumed.
+
+        A HEAD request picks the path. Small transcripts are parsed straight
+        off the GET stream. Above TRANSCRIPT_MULTIPART_THRESHOLD the object is
+        instead fetched with concurrent ranged GETs into memory, trading a
+        buffered copy for download throughput.
+        """
         try:
             s3 = get_s3_client()
-            response = s3.get_object(Bucket=self.bucket, Key=file_key)
-            content = response["Body"].read().decode("utf-8")
-            return json.loads(content)
+            size = s3.head_object(Bucket=self.bucket, Key=file_key)["ContentLength"]
+            if size > TRANSCRIPT_MULTIPART_THRESHOLD:
+                body = io.BytesIO()
+                s3.download_fileobj(self.bucket, file_key, body, Config=TRANSCRIPT_TRANSFER_CONFIG)
+                body.seek(0)
+            else:
+                body = s3.get_object(Bucket=self.bucket, Key=file_key)["Body"]
         except ClientError as e:
-            logger.error(f"Failed to download transcript from S3: {str(e)}")
+            logger.error("Failed to download transcript from S3: %s", e)
             raise
+        transcript_data: Dict[str, Any] = {}
+        transcript_data["segments"] = self._iter_transcript(body, transcript_data)
+        return transcript_data
+
+    @staticmethod
+    def _iter_transcript(body: Any, transcript_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield segments from a transcript JSON stream, recording top-level scalars as a side effect.
 
-    def _chunk_transcript(self, transcript_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        Handles both layouts: v1 "segments" is a list of objects; v2 is
+        columnar, and since its "text" column is written last, segments are
+        yielded as the texts stream in (the start/end columns before it are
+        small lists of floats).
+        """
+        builder = None
+        starts: List[float] = []
+        ends: List[float] = []
+        index = 0
+        for prefix, event, value in ijson.parse(body, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "segments.item" and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix == "segments.item" and event == "start_map":
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == "segments.text.item":
+                yield {
+                    "id": index,
+                    "start": starts[index] if index < len(starts) else None,
+                    "end": ends[index] if index < len(ends) else None,
+                    "text": value,
+                }
+                index += 1
+            elif prefix == "segments.start.item":
+                starts.append(value)
+            elif prefix == "segments.end.item":
+                ends.append(value)
+            elif prefix and "." not in prefix and event in ("string", "number", "boolean", "null"):
+                transcript_data[prefix] = value
+
+    def _chunk_transcript(
+        self, transcript_data: Dict[str, Any]
+    ) -> Tuple[List[TranscriptChunk], int]:
         """
         Chunk transcript into manageable pieces for LLM processing.
 
         Args:
-            transcript_data: Full transcript with segments
+            transcript_data: Full transcript; segments may be a lazy iterator
 
         Returns:
-            List of chunk dictionaries
+            Tuple of (list of chunks, total transcript chars)
         """
-        segments = transcript_data.get("segments", [])
-        if not segments:
-            # Fallback: use full_text if segments not available
-            full_text = transcript_data.get("full_text", "")
-            if full_text:
-                return self._chunk_text(full_text)
-
-        chunks = []
-        current_chunk = {"text": "", "segments": [], "start_time": None, "end_time": None}
+        chunks: List[TranscriptChunk] = []
+        current_texts: List[str] = []
+        current_segments: List[Dict[str, Any]] = []
+        current_start = None
+        current_end = None
         current_length = 0
 
-        for segment in segments:
+        for segment in transcript_data.get("segments", []):
             segment_text = segment.get("text", "").strip()
             if not segment_text:
                 continue
 
-            segment_length = len(segment_text.split())
+            # ~4 chars per token; avoids a split() list per segment
+            segment_length = (len(segment_text) + 3) // 4
 
             # If adding this segment would exceed chunk size, save current chunk
-            if (
-                current_length + segment_length > self.chunk_size
-                and current_chunk["text"]
-            ):
-                chunks.append(current_chunk)
-                current_chunk = {
-                    "text": "",
-                    "segments": [],
-                    "start_time": segment.get("start"),
-                    "end_time": None,
-                }
+            if current_length + segment_length > self.chunk_size and current_texts:
+                chunks.append(
+                    TranscriptChunk(" ".join(current_texts), current_segments, current_start, current_end)
+                )
+                current_texts, current_segments = [], []
+                current_start, current_end = segment.get("start"), None
                 current_length = 0
 
             # Add segment to current chunk
-            if not current_chunk["start_time"]:
-                current_chunk["start_time"] = segment.get("start")
+            if not current_start:
+                current_start = segment.get("start")
 
-            current_chunk["text"] += " " + segment_text
-            current_chunk["segments"].append(segment)
-            current_chunk["end_time"] = segment.get("end")
+            current_texts.append(segment_text)
+            current_segments.append(segment)
+            current_end = segment.get("end")
             current_length += segment_length
 
         # Add final chunk
-        if current_chunk["text"]:
-            chunks.append(current_chunk)
+        if current_texts:
+            chunks.append(
+                TranscriptChunk(" ".join(current_texts), current_segments, current_start, current_end)
+            )
+
+        if not chunks:
+            # Fallback: use full_text if segments not available
+            full_text = transcript_data.get("full_text", "")
+            if full_text:
+                return self._chunk_text(full_text), len(full_text)
 
-        return chunks
+        return chunks, sum(len(chunk.text) for chunk in chunks)
 
-    def _chunk_text(self, text: str) -> List[Dict[str, Any]]:
+    def _chunk_text(self, text: str) -> List[TranscriptChunk]:
         """Fallback: chunk plain text into word-based chunks."""
         words = text.split()
-        chunks = []
-        for i in range(0, len(words), self.chunk_size):
-            chunk_text = " ".join(words[i : i + self.chunk_size])
-            chunks.append(
-                {
-                    "text": chunk_text,
-                    "segments": [],
-                    "start_time": None,
-                    "end_time": None,
-                }
-            )
-        return chunks
+        return [
+            TranscriptChunk(" ".join(words[i : i + self.chunk_size]), [])
+            for i in range(0, len(words), self.chunk_size)
+        ]
 
-    def _map_summarize_chunks(self, chunks: List[Dict[str, Any]]) -> List[str]:
+    def _map_summarize_chunks(self, chunks: List[TranscriptChunk]) -> List[str]:
         """
         Map phase: Generate summaries for each chunk using OpenAI.
 
+        Chunks are summarized concurrently (see _amap_summarize_chunks) on the
+        process-wide event loop.
+
         Args:
             chunks: List of transcript chunks
 
         Returns:
             List of chunk summaries
         """
-        logger.info(f"🗺️ Starting map phase: Processing {len(chunks)} chunks in batches of {self.max_chunks_per_batch}")
-        summaries = []
+        return run_async(self._amap_summarize_chunks(chunks))
+
+    async def _amap_summarize_chunks(self, chunks: List[TranscriptChunk]) -> List[str]:
+        """
+        Summarize all chunks concurrently, at most OPENAI_CONCURRENCY in flight.
+
+        Small consecutive chunks are packed up to OPENAI_CHUNKS_PER_REQUEST per
+        request (one JSON array of summaries back); a pack whose response
+        can't be parsed falls back to one request per chunk.
 
-        # Process chunks in batches to avoid rate limits
-        for i in range(0, len(chunks), self.max_chunks_per_batch):
-            batch = chunks[i : i + self.max_chunks_per_batch]
-            batch_num = (i // self.max_chunks_per_batch) + 1
-            total_batches = (len(chunks) + self.max_chunks_per_batch - 1) // self.max_chunks_per_batch
-            logger.info(f"📦 Processing batch {batch_num}/{total_batches} ({len(batch)} chunks)")
-            batch_summaries = []
+        Each request first takes its estimated cost from the RPM/TPM buckets
+        (see openai_throttle); a 429 pauses every caller and re-queues the request.
+
+        With SUMMARY_CACHE enabled, chunks are looked up in the Redis summary
+        cache first (see summary_cache) and only misses are sent to OpenAI.
+
+        Args:
+            chunks: List of transcript chunks
 
-            for idx, chunk in enumerate(batch):
-                chunk_num = i + idx + 1
+        Returns:
+            List of chunk summaries, in chunk order
+        """
+        logger.debug(
+            "🗺️ Starting map phase: Processing %d chunks (%d concurrent)",
+            len(chunks),
+            settings.openai_concurrency,
+        )
+        client = get_async_openai_client()
+        semaphore = asyncio.Semaphore(settings.openai_concurrency)
+
+        async def _complete(request: Dict[str, Any], tokens: int) -> str:
+            return await self._acomplete(request, tokens, semaphore)
+
+        async def _one(chunk: TranscriptChunk) -> str:
+            request = self._chunk_request(chunk.text)
+            return await _complete(request, estimate_tokens(chunk.text, request["max_tokens"]))
+
+        async def _pack(pack: List[TranscriptChunk]) -> List[Any]:
+            if len(pack) > 1:
+                texts = [chunk.text for chunk in pack]
+                request = self._pack_request(texts)
                 try:
-                    logger.info(f"🔄 Processing chunk {chunk_num}/{len(chunks)}...")
-                    summary = self._summarize_chunk(chunk["text"])
-                    batch_summaries.append(summary)
-                    logger.info(f"✅ Completed chunk {chunk_num}/{len(chunks)}")
+                    content = await _complete(
+                        request, estimate_tokens("".join(texts), request["max_tokens"])
+                    )
+                    packed = orjson.loads(content).get("summaries")
+                    if (
+                        isinstance(packed, list)
+                        and len(packed) == len(pack)
+                        and all(isinstance(s, str) for s in packed)
+                    ):
+                        return [s.strip() for s in packed]
+                    logger.warning(
+                        "⚠️ Packed request returned an unexpected shape for %d chunks, retrying per chunk",
+                        len(pack),
+                    )
                 except Exception as e:
-                    logger.error(f"❌ Failed to summarize chunk {chunk_num}: {str(e)}", exc_info=True)
-                    # Fallback: use first 200 chars of chunk
-                    batch_summaries.append(chunk["text"][:200] + "...")
-                    logger.warning(f"⚠️ Using fallback summary for chunk {chunk_num}")
+                    logger.warning(
+                        "⚠️ Packed request for %d chunks failed (%s), retrying per chunk", len(pack), e
+                    )
+            return await asyncio.gather(*(_one(chunk) for chunk in pack), return_exceptions=True)
+
+        # Serve what we can from the cache; only misses go to OpenAI
+        results: List[Any] = [None] * len(chunks)
+        embeddings: List[Any] = [None] * len(chunks)
+        cache = get_summary_cache(client) if settings.summary_cache else None
+        if cache is not None:
+            results, embeddings = await cache.lookup_many([chunk.text for chunk in chunks])
+        pending = [i for i, result in enumerate(results) if result is None]
+        if cache is not None:
+            logger.debug(
+                "🎯 Summary cache: %d/%d chunks served from cache", len(chunks) - len(pending), len(chunks)
+            )
+
+        packs = self._pack_chunks([chunks[i] for i in pending])
+        pack_results = await asyncio.gather(*(_pack(pack) for pack in packs))
+        fresh = [result for pack_result in pack_results for result in pack_result]
+        for i, result in zip(pending, fresh):
+            results[i] = result
+
+        if cache is not None:
+            stored = [(i, result) for i, result in zip(pending, fresh) if isinstance(result, str)]
+            await cache.store_many(
+                [chunks[i].text for i, _ in stored],
+                [result for _, result in stored],
+                [embeddings[i] for i, _ in stored],
+            )
 
-            summaries.extend(batch_summaries)
-            logger.info(f"✅ Batch {batch_num}/{total_batches} completed")
+        summaries = []
+        for chunk_num, (chunk, result) in enumerate(zip(chunks, results), start=1):
+            if isinstance(result, BaseException):
+                logger.error("❌ Failed to summarize chunk %d: %s", chunk_num, result, exc_info=result)
+                # Fallback: use first 200 chars of chunk
+                summaries.append(chunk.text[:200] + "...")
+                logger.warning("⚠️ Using fallback summary for chunk %d", chunk_num)
+            else:
+                summaries.append(result)
 
-        logger.info(f"✅ Map phase completed: {len(summaries)} summaries generated")
+        logger.debug("✅ Map phase completed: %d summaries generated", len(summaries))
         return summaries
 
-    def _summarize_chunk(self, chunk_text: str) -> str:
-        """Summarize a single chunk using OpenAI."""
+    @staticmethod
+    async def _acomplete(request: Dict[str, Any], tokens: int, semaphore: asyncio.Semaphore) -> str:
+        """
+        Run one throttled chat completion, re-queueing it after a 429.
+
+        Args:
+            request: Chat-completion arguments
+            tokens: Estimated token cost (see estimate_tokens)
+            semaphore: Bounds the requests in flight
+
+        Returns:
+            Stripped completion text
+        """
+        client = get_async_openai_client()
+        limiter = get_rate_limiter()
+        attempt = 0
+        while True:
+            await limiter.acquire(tokens)
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(**request)
+                return response.choices[0].message.content.strip()
+            except RateLimitError:
+                attempt += 1
+                if attempt > settings.openai_rate_limit_retries:
+                    raise
+                limiter.note_rate_limited()
+
+    @staticmethod
+    def _pack_chunks(chunks: List[TranscriptChunk]) -> List[List[TranscriptChunk]]:
+        """Group consecutive chunks into packs within the count and prompt-token budgets."""
+        packs: List[List[TranscriptChunk]] = []
+        current: List[TranscriptChunk] = []
+        current_tokens = 0
+        for chunk in chunks:
+            tokens = len(chunk.text) // 4
+            if current and (
+                len(current) >= settings.openai_chunks_per_request
+                or current_tokens + tokens > PACK_PROMPT_TOKEN_BUDGET
+            ):
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(chunk)
+            current_tokens += tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    @staticmethod
+    def _pack_request(chunk_texts: List[str]) -> Dict[str, Any]:
+        """Build the chat-completion arguments for summarizing several chunks in one call."""
+        segments = "\n\n".join(f"[{i}]: {text}" for i, text in enumerate(chunk_texts, start=1))
+        return {
+            "model": settings.openai_summary_model,
+            "messages": [
+                {"role": "system", "content": MAP_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Summarize each of the following {len(chunk_texts)} transcript segments. "
+                    f'Return ONLY a JSON object {{"summaries": [...]}} with exactly '
+                    f"{len(chunk_texts)} strings, in segment order.\n\n{segments}",
+                },
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 200 * len(chunk_texts),
+            "temperature": 0.3,
+        }
+
+    @staticmethod
+    def _chunk_request(chunk_text: str) -> Dict[str, Any]:
+        """Build the chat-completion arguments for summarizing one chunk."""
+        return {
+            "model": settings.openai_summary_model,
+            "messages": [
+                {"role": "system", "content": MAP_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Summarize this video transcript segment:\n\n{chunk_text}",
+                },
+            ],
+            "max_tokens": 200,
+            "temperature": 0.3,
+        }
+
+    def _summarize_short_transcript(self, transcript_text: str) -> str:
+        """
+        Summarize a transcript that fits in one chunk with a single final-summary call.
+
+        Args:
+            transcript_text: Full transcript text (at most chunk_size tokens)
+
+        Returns:
+            Final summary
+        """
+        request = {
+            "model": settings.openai_summary_model,
+            "messages": [
+                {"role": "system", "content": FINAL_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Summarize this video transcript:\n\n{transcript_text}",
+                },
+            ],
+            "max_tokens": 500,
+            "temperature": 0.3,
+        }
         try:
-            client = get_openai_client()
-            chunk_length = len(chunk_text)
-            logger.info(f"🤖 Calling OpenAI API for chunk summarization (chunk length: {chunk_length} chars)")
-            logger.debug(f"📝 Chunk preview: {chunk_text[:200]}...")
-
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes video transcripts. "
-                        "Provide a concise summary of the key points in 2-3 sentences.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Summarize this video transcript segment:\n\n{chunk_text}",
-                    },
-                ],
-                max_tokens=200,
-                temperature=0.3,
+            return run_async(
+                self._acomplete(
+                    request,
+                    estimate_tokens(transcript_text, request["max_tokens"]),
+                    asyncio.Semaphore(1),
+                )
             )
-
-            summary_text = response.choices[0].message.content.strip()
-            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') and response.usage else None
-            logger.info(f"✅ OpenAI API call successful - Summary length: {len(summary_text)} chars" +
-                       (f", Tokens used: {tokens_used}" if tokens_used else ""))
-            return summary_text
         except Exception as e:
-            logger.error(f"❌ OpenAI API error during chunk summarization: {str(e)}", exc_info=True)
-            raise
+            logger.error("❌ OpenAI API error during single-chunk summary: %s", e, exc_info=True)
+            # Fallback: same as a failed reduction
+            logger.warning("⚠️ Using fallback summary (first 1000 chars)")
+            return transcript_text[:1000]
 
     def _reduce_summaries(self, chunk_summaries: List[str]) -> str:
         """
@@ -292,56 +592,81 @@ class VideoSummaryService:
         """
         if not chunk_summaries:
             return "No summary available."
+        if len(chunk_summaries) == 1:
+            # Nothing to combine
+            return chunk_summaries[0]
 
-        # If we have many chunks, combine in batches
-        if len(chunk_summaries) > 10:
-            # Recursively reduce
-            batch_size = 5
-            reduced = []
-            for i in range(0, len(chunk_summaries), batch_size):
-                batch = chunk_summaries[i : i + batch_size]
-                combined = "\n\n".join(batch)
-                reduced_summary = self._summarize_chunk(combined)
-                reduced.append(reduced_summary)
-            return self._reduce_summaries(reduced)
+        # Collapse level by level (groups of REDUCE_GROUP_SIZE) until the
+        # final prompt is small enough; each level runs concurrently
+        while len(chunk_summaries) > REDUCE_FINAL_MAX_SUMMARIES:
+            chunk_summaries = run_async(self._areduce_level(chunk_summaries))
 
         # Final reduction
         combined_summaries = "\n\n".join(chunk_summaries)
-        logger.info(f"🔗 Calling OpenAI API for final summary reduction ({len(chunk_summaries)} chunks, {len(combined_summaries)} chars)")
+        logger.debug(
+            "🔗 Calling OpenAI API for final summary reduction (%d chunks, %d chars)",
+            len(chunk_summaries),
+            len(combined_summaries),
+        )
+        request = {
+            "model": settings.openai_summary_model,
+            "messages": [
+                {"role": "system", "content": FINAL_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Combine these summaries into a final video summary:\n\n{combined_summaries}",
+                },
+            ],
+            "max_tokens": 500,
+            "temperature": 0.3,
+        }
         try:
-            client = get_openai_client()
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates final video summaries. "
-                        "Combine the provided chunk summaries into a coherent, comprehensive summary "
-                        "of the entire video in 4-6 sentences. Focus on main themes and key insights.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Combine these summaries into a final video summary:\n\n{combined_summaries}",
-                    },
-                ],
-                max_tokens=500,
-                temperature=0.3,
+            final_summary = run_async(
+                self._acomplete(
+                    request,
+                    estimate_tokens(combined_summaries, request["max_tokens"]),
+                    asyncio.Semaphore(1),
+                )
             )
-
-            final_summary = response.choices[0].message.content.strip()
-            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') and response.usage else None
-            logger.info(f"✅ OpenAI API reduction call successful - Final summary length: {len(final_summary)} chars" +
-                       (f", Tokens used: {tokens_used}" if tokens_used else ""))
+            logger.debug("✅ OpenAI reduction successful - Final summary length: %d chars", len(final_summary))
             return final_summary
         except Exception as e:
-            logger.error(f"❌ OpenAI API error during reduction: {str(e)}", exc_info=True)
+            logger.error("❌ OpenAI API error during reduction: %s", e, exc_info=True)
             # Fallback: return first summary
-            logger.warning(f"⚠️ Using fallback summary (first 1000 chars)")
+            logger.warning("⚠️ Using fallback summary (first 1000 chars)")
             return combined_summaries[:1000]
 
+    async def _areduce_level(self, summaries: List[str]) -> List[str]:
+        """
+        Summarize one level of the reduce tree, all groups concurrently.
+
+        Args:
+            summaries: Summaries of the level below
+
+        Returns:
+            One summary per group of REDUCE_GROUP_SIZE, in order
+        """
+        groups = [
+            "\n\n".join(summaries[i : i + REDUCE_GROUP_SIZE])
+            for i in range(0, len(summaries), REDUCE_GROUP_SIZE)
+        ]
+        logger.debug(
+            "🔗 Reducing %d summaries into %d (%d concurrent)",
+            len(summaries),
+            len(groups),
+            settings.openai_concurrency,
+        )
+        semaphore = asyncio.Semaphore(settings.openai_concurrency)
+
+        async def _group(text: str) -> str:
+            request = self._chunk_request(text)
+            return await self._acomplete(request, estimate_tokens(text, request["max_tokens"]), semaphore)
+
+        return list(await asyncio.gather(*(_group(text) for text in groups)))
+
     def _calculate_quality_score(
         self,
-        transcript_data: Dict[str, Any],
+        transcript_chars: int,
         final_summary: str,
         chunk_summaries: List[str],
     ) -> float:
@@ -349,7 +674,7 @@ class VideoSummaryService:
         Calculate quality score for the summary (0.0 to 1.0).
 
         Args:
-            transcript_data: Original transcript data
+            transcript_chars: Transcript length in chars (from _chunk_transcript)
             final_summary: Final summary text
             chunk_summaries: List of chunk summaries
 
@@ -357,7 +682,7 @@ class VideoSummaryService:
             Quality score between 0.0 and 1.0
         """
         # Simple heuristic: based on summary length and chunk count
-        transcript_length = len(transcript_data.get("full_text", ""))
+        transcript_length = transcript_chars
         summary_length = len(final_summary)
 
         if transcript_length == 0:
@@ -380,8 +705,8 @@ class VideoSummaryService:
         return round(quality_score, 2)
 
     def _upload_summary_to_s3(self, video_id: int, summary_text: str) -> str:
-        """Upload summary text to S3."""
-        summary_key = f"summaries/{video_id}/summary.txt"
+        """Upload summary JSON to S3 (the summary text is its "summary" field)."""
+        summary_key = summary_s3_key(video_id)
         summary_json = {
             "video_id": video_id,
             "summary": summary_text,
@@ -390,26 +715,17 @@ class VideoSummaryService:
 
         try:
             s3 = get_s3_client()
-            # Upload as JSON
-            s3.put_object(
-                Bucket=self.bucket,
-                Key=summary_key.replace(".txt", ".json"),
-                Body=json.dumps(summary_json, indent=2),
-                ContentType="application/json",
-            )
-
-            # Also upload as text
             s3.put_object(
                 Bucket=self.bucket,
                 Key=summary_key,
-                Body=summary_text,
-                ContentType="text/plain",
+                Body=orjson.dumps(summary_json, option=orjson.OPT_INDENT_2),
+                ContentType="application/json",
             )
 
-            logger.info(f"✅ Uploaded summary to S3: {summary_key}")
-            return summary_key.replace(".txt", ".json")
+            logger.debug("✅ Uploaded summary to S3: %s", summary_key)
+            return summary_key
         except ClientError as e:
-            logger.error(f"Failed to upload summary to S3: {str(e)}")
+            logger.error("Failed to upload summary to S3: %s", e)
             raise
 
     def _save_summary_with_outbox(
@@ -418,135 +734,112 @@ class VideoSummaryService:
         summary_text: str,
         summary_file_key: str,
         quality_score: float,
+        upload: Optional[Future] = None,
     ) -> VideoSummary:
         """
         Save summary to database and add event to outbox in transaction.
         This ensures the event is persisted even if Kafka is down.
+
+        The summary UPSERT, the video status update, its status log row and
+        the outbox insert are sent without intermediate commits and committed
+        once. If an in-flight
+        S3 upload is passed, the commit waits for it and a failed upload
+        rolls everything back, so the event never points at a missing object.
         """
-        import uuid
-        from datetime import datetime
+        from database.models import OutboxEvent, Videos
+
+        summary_values = {
+            "summary_text": summary_text,
+            "summary_path": summary_file_key,
+            "quality_score": quality_score,
+            "model_info": {
+                "model": settings.openai_summary_model,
+                "method": "map-reduce",
+                "chunk_size": self.chunk_size,
+            },
+        }
 
-        # Use transaction to ensure summary and outbox event are written atomically
         try:
-            # 1. Save/update summary
-            existing = self.summary_repo.find_one({"video_id": video_id})
-            if existing:
-                summary_record = self.summary_repo.update(
-                    {"video_id": video_id},
-                    {
-                        "summary_text": summary_text,
-                        "summary_path": summary_file_key,
-                        "quality_score": quality_score,
-                        "model_info": {
-                            "model": "gpt-3.5-turbo",
-                            "method": "map-reduce",
-                            "chunk_size": self.chunk_size,
-                        },
-                    },
+            # 1. Save/update summary (INSERT ... ON CONFLICT (video_id) DO UPDATE).
+            # A row that already has summary_text is left alone and returns
+            # nothing: a duplicate run then writes no second outbox event
+            upsert = (
+                pg_insert(VideoSummary)
+                .values(video_id=video_id, **summary_values)
+                .on_conflict_do_update(
+                    index_elements=[VideoSummary.video_id],
+                    set_={**summary_values, "updated_at": func.now()},
+                    where=VideoSummary.summary_text.is_(None),
                 )
-            else:
-                summary_record = self.summary_repo.create(
-                    {
-                        "video_id": video_id,
-                        "summary_text": summary_text,
-                        "summary_path": summary_file_key,
-                        "quality_score": quality_score,
-                        "model_info": {
-                            "model": "gpt-3.5-turbo",
-                            "method": "map-reduce",
-                            "chunk_size": self.chunk_size,
-                        },
-                    }
+                .returning(VideoSummary)
+            )
+            summary_record = self.db_session.scalars(upsert).one_or_none()
+            if summary_record is None:
+                if upload is not None:
+                    upload.result()
+                self.db_session.rollback()
+                existing = self.summary_repo.find_one({"video_id": video_id})
+                self.db_session.expunge(existing)
+                self.db_session.commit()
+                if upload is not None:
+                    # Our upload overwrote the object: restore the kept text so S3 matches the row
+                    self._upload_summary_to_s3(video_id, existing.summary_text)
+                logger.warning(
+                    "⏭️ Summary for video %s was saved by another run, keeping it (id=%s)",
+                    video_id,
+                    existing.id,
                 )
+                return existing
 
-            # 2. Add event to outbox (in same transaction context)
+            # 2. Update video status to INDEXING (next stage, nest-be will handle)
+            # Note: Since nest-be consumes video.summarized and handles indexing,
+            # we update status here to indicate summarization is complete
+            video_updated = self.db_session.execute(
+                update(Videos).where(Videos.id == video_id).values(status="indexing")
+            ).rowcount > 0
+
+            # 3. Add event to outbox
             # Payload structure: { id, videoId, summaryFileKey?, summaryText?, ts }
             event_payload = {
-                "id": str(uuid.uuid4()),
+                "id": uuid.uuid4().hex,  # UUID parsers accept the undashed form
                 "videoId": video_id,
                 "summaryFileKey": summary_file_key,  # S3 key to summary JSON
                 "summaryText": summary_text,  # Summary text (optional, but included for convenience)
-                "ts": datetime.utcnow().isoformat(),
+                "ts": datetime.now(timezone.utc).isoformat(),
             }
-
-            # 3. Update video status to INDEXING (next stage, nest-be will handle)
-            # Note: Since nest-be consumes video.summarized and handles indexing,
-            # we update status here to indicate summarization is complete
-            # Optimize: Update directly without fetch if video exists (best-effort)
-            from database.models import Videos
-            videos_repo = GenericRepository(Videos, self.db_session)
-            # Try to update directly - if video doesn't exist, update will return None
-            updated_video = videos_repo.update(
-                {"id": video_id},
-                {"status": "indexing"},  # Next stage handled by nest-be
+            self.db_session.add(
+                OutboxEvent(
+                    topic="video.summarized",
+                    payload=event_payload,
+                    published=False,
+                    attempts=0,
+                    service="python-backend",  # Mark service for nest-be scheduler
+                )
             )
-            if updated_video:
-                # Log status change
-                self.status_log_service.log_status_change(
+
+            # 4. Log the status change in the same commit
+            if video_updated:
+                self.status_log_service.add_status_change(
                     video_id,
                     "indexing",
                     "python-backend",
                     "Summarization completed, ready for indexing",
                 )
-                logger.info(f"📊 Updated video {video_id} status to indexing")
-
-            # 4. Add event to outbox (in same transaction context)
-            self.outbox_service.add_to_outbox(
-                topic="video.summarized",
-                payload=event_payload,
-                db_session=self.db_session,
-                service="python-backend",  # Mark service for nest-be scheduler
-            )
 
-            logger.info(
-                f"📝 Saved summary and outbox event in transaction: videoId={video_id}"
-            )
-
-            return summary_record
+            if upload is not None:
+                upload.result()
 
+            # Keep the RETURNING values readable without a refresh after commit
+            self.db_session.expunge(summary_record)
+            self.db_session.commit()
         except Exception as e:
             self.db_session.rollback()
-            logger.error(f"❌ Failed to save summary with outbox: {str(e)}")
+            logger.error("❌ Failed to save summary with outbox: %s", e)
             raise
 
-    def _save_summary(
-        self,
-        video_id: int,
-        summary_text: str,
-        summary_file_key: str,
-        quality_score: float,
-    ) -> VideoSummary:
-        """Save summary to database (legacy method, use _save_summary_with_outbox)."""
-        # Check if summary already exists
-        existing = self.summary_repo.find_one({"video_id": video_id})
-        if existing:
-            # Update existing
-            return self.summary_repo.update(
-                {"video_id": video_id},
-                {
-                    "summary_text": summary_text,
-                    "summary_path": summary_file_key,
-                    "quality_score": quality_score,
-                    "model_info": {
-                        "model": "gpt-3.5-turbo",
-                        "method": "map-reduce",
-                        "chunk_size": self.chunk_size,
-                    },
-                },
-            )
+        logger.debug("📝 Saved summary and outbox event in transaction: videoId=%s", video_id)
 
-        # Create new
-        return self.summary_repo.create(
-            {
-                "video_id": video_id,
-                "summary_text": summary_text,
-                "summary_path": summary_file_key,
-                "quality_score": quality_score,
-                "model_info": {
-                    "model": "gpt-3.5-turbo",
-                    "method": "map-reduce",
-                    "chunk_size": self.chunk_size,
-                },
-            }
-        )
+        if video_updated:
+            logger.debug("📊 Updated video %s status to indexing", video_id)
 
+        return summary_record
@@ -1,48 +1,54 @@
 """Celery tasks for video summarization."""
 import json
-import logging
+import time
 from typing import Dict
 
-from celery import Task
-from sqlalchemy.orm import Session
+from celery.utils.log import get_task_logger
+from sqlalchemy import lambda_stmt, select
 
 from celery_app import celery_app
 from common.constants.task_constants import (
+    NON_RETRYABLE_TASK_EXCEPTIONS,
+    SUMMARY_LOCK_KEY,
     SUMMARY_TASK_CONFIG,
     calculate_exponential_backoff_delay,
 )
-from database.base import SessionLocal
-from database.models import VideoSummary, Videos, VideoStatusLog
+from common.exceptions.base import ValidationException
+from common.tasks import DatabaseTask
+from common.types.video import VideoTranscribedPayload, convert_payload
+from database.models import VideoSummary
 from database.repository import GenericRepository
 from modules.summary.services.video_summary_service import VideoSummaryService
-from modules.videos.services.video_status_log_service import VideoStatusLogService
+from modules.videos.constants import CELERY_TASK_SUMMARIZE_VIDEO
 
-logger = logging.getLogger(__name__)
+# Celery task logger: the worker's task log format stamps each record with
+# the running task's name and id, so the task body needs no per-call adapter
+logger = get_task_logger(__name__)
 
 
-class DatabaseTask(Task):
-    """Custom task base class that handles database session."""
+class SummaryTask(DatabaseTask):
+    """DatabaseTask that keeps one VideoSummaryService per worker session."""
 
     def __init__(self):
         """Initialize task."""
         super().__init__()
-        self._db = None
+        self._summary_service = None
 
-    def before_start(self, task_id, args, kwargs):
-        """Called before task starts."""
-        self._db = SessionLocal()
-
-    def after_return(self, *args, **kwargs):
-        """Called after task returns."""
-        if self._db:
-            self._db.close()
-            self._db = None
+    def get_summary_service(self) -> VideoSummaryService:
+        """Get the VideoSummaryService bound to this worker's session (built once)."""
+        db = self.db
+        if self._summary_service is None or self._summary_service.db_session is not db:
+            self._summary_service = VideoSummaryService(db, GenericRepository(VideoSummary, db))
+        return self._summary_service
 
 
 @celery_app.task(
     bind=True,
-    base=DatabaseTask,
-    name="tasks.summarize_video",
+    base=SummaryTask,
+    name=CELERY_TASK_SUMMARIZE_VIDEO,
+    # Re-queue (rather than lose) a summary whose worker dies mid-run
+    acks_late=True,
+    reject_on_worker_lost=True,
     max_retries=SUMMARY_TASK_CONFIG["max_retries"],
     # Note: retry delay is calculated dynamically with exponential backoff
     # Setting default_retry_delay for backward compatibility, but will be overridden
@@ -63,42 +69,75 @@ def summarize_video_task(self, payload: Dict) -> Dict:
     Returns:
         Dict with summary information
     """
-    task_logger = logger.getChild(f"task_{self.request.id}")
-    video_id = payload.get("videoId")
-    transcript_file_key = payload.get("transcriptFileKey")
-    event_id = payload.get("id")
-
-    task_logger.info(
-        f"🎬 Starting video summarization: videoId={video_id}, eventId={event_id}"
+    # Decoded and type-checked once; a malformed payload fails without retries
+    event = convert_payload(payload, VideoTranscribedPayload)
+    video_id = event.videoId
+    transcript_file_key = event.transcriptFileKey
+    event_id = event.id or event.eventId
+
+    # One info line per task start/end; the task logger already stamps the task id
+    started_at = time.monotonic()
+    logger.info(
+        "🎬 Starting video summarization: videoId=%s, eventId=%s, retries=%s",
+        video_id,
+        event_id,
+        self.request.retries,
     )
-    task_logger.info(f"📋 Full payload: {payload}")
-    task_logger.info(f"🆔 Task ID: {self.request.id}, Retries: {self.request.retries}")
-    task_logger.info(f"📄 Transcript file key: {transcript_file_key}")
+    # Lazy %s: the payload dict is only formatted when DEBUG is on
+    logger.debug("📋 Full payload: %s", payload)
+    logger.debug("📄 Transcript file key: %s", transcript_file_key)
+
+    # One summarization per video at a time: an overlapping delivery or retry
+    # waits for the run in progress instead of paying for a second OpenAI run
+    lock = self.acquire_video_lock(SUMMARY_LOCK_KEY.format(video_id=video_id))
+    if lock is None:
+        logger.warning("⏭️ Summary for video %s is already in progress, skipping", video_id)
+        return {"videoId": video_id, "status": "in_progress"}
 
     try:
-        db = self._db or SessionLocal()
-        summary_repo = GenericRepository(VideoSummary, db)
-        summary_service = VideoSummaryService(db, summary_repo)
-
-        # Check if summary already exists and is complete (idempotency)
-        # VideoSummary doesn't have a status field, so we check if summary_text exists
-        existing_summary = summary_repo.find_one({"video_id": video_id})
-        if existing_summary and existing_summary.summary_text:
-            task_logger.warning(
-                f"⏭️ Summary already exists for video {video_id} (complete), skipping"
+        if not transcript_file_key:
+            raise ValidationException(
+                f"Payload for video {video_id} has no transcriptFileKey", {"event_id": event_id}
+            )
+
+        summary_service = self.get_summary_service()
+
+        # Skip the OpenAI run if a complete summary exists. Only the id is read:
+        # the row itself is written by an ON CONFLICT (video_id) upsert, so this
+        # probe saves work rather than guarding the insert
+        # (lambda statement: compiled once per process, only video_id is re-bound)
+        existing_summary_id = summary_service.db_session.scalar(
+            lambda_stmt(
+                lambda: select(VideoSummary.id)
+                .where(VideoSummary.video_id == video_id, VideoSummary.summary_text.isnot(None))
+                .limit(1)
+            )
+        )
+        if existing_summary_id is not None:
+            logger.warning(
+                "⏭️ Summary already exists for video %s (complete), skipping", video_id
             )
             return {
                 "videoId": video_id,
                 "status": "exists",
-                "summaryId": existing_summary.id,
+                "summaryId": existing_summary_id,
             }
 
+        # End the read transaction: the connection goes back to the pool for
+        # the S3/OpenAI phase and the final write checks out a fresh one
+        summary_service.db_session.commit()
+
         # Process summary (this now saves to DB and adds to outbox in transaction)
         result = summary_service.process_summary(video_id, transcript_file_key)
 
         # Note: Event is published via outbox pattern (background job handles publishing)
-        task_logger.info(
-            f"✅ Video summarization completed: videoId={video_id}, summaryId={result['summary_id']}"
+        duration_ms = int((time.monotonic() - started_at) * 1000)
+        logger.info(
+            "✅ Video summarization completed: videoId=%s, summaryId=%s, durationMs=%d",
+            video_id,
+            result["summary_id"],
+            duration_ms,
+            extra={"video_id": video_id, "duration_ms": duration_ms},
         )
 
         return {
@@ -108,65 +147,36 @@ def summarize_video_task(self, payload: Dict) -> Dict:
         }
 
     except Exception as e:
-        task_logger.error(
-            f"❌ Failed to summarize video {video_id}: {str(e)}",
+        logger.error(
+            "❌ Failed to summarize video %s: %s",
+            video_id,
+            e,
             exc_info=True,
         )
 
-        max_retries = SUMMARY_TASK_CONFIG["max_retries"]
-        current_retries = self.request.retries
-
-        task_logger.error(
-            f"📊 Retry count: {current_retries}/{max_retries}"
-        )
-
-        # Update video status to FAILED if all retries exhausted
-        try:
-            if current_retries >= max_retries - 1:
-                db = self._db or SessionLocal()
-                videos_repo = GenericRepository(Videos, db)
-                video = videos_repo.find_one({"id": video_id})
-                if video:
-                    videos_repo.update(
-                        {"id": video_id},
-                        {
-                            "status": "failed",
-                            "status_message": str(e),
-                        },
-                    )
-                    # Log status change
-                    status_log_repo = GenericRepository(VideoStatusLog, db)
-                    status_log_service = VideoStatusLogService(db, status_log_repo)
-                    status_log_service.log_status_change(
-                        video_id,
-                        "failed",
-                        "python-backend",
-                        str(e),
-                    )
-                    task_logger.error(
-                        f"💀 Updated video {video_id} status to FAILED after exhausting retries"
-                    )
-                if not self._db:
-                    db.close()
-                # Don't retry if we've exhausted all attempts
-                raise
-        except Exception as status_error:
-            task_logger.warning(f"Failed to update video status: {str(status_error)}")
-            # Re-raise original error if status update fails
-            raise e
+        if isinstance(e, NON_RETRYABLE_TASK_EXCEPTIONS):
+            # Retrying cannot help: on_failure marks the video failed
+            raise
 
         # Calculate exponential backoff delay (matching BullMQ behavior)
+        current_retries = self.request.retries
         initial_delay = SUMMARY_TASK_CONFIG["initial_retry_delay"]
-        retry_delay = calculate_exponential_backoff_delay(initial_delay, current_retries)
-
-        task_logger.warning(
-            f"🔄 Retrying summarization in {retry_delay}s (exponential backoff: attempt {current_retries + 1}/{max_retries})"
+        # Jittered so videos that failed together (e.g. an OpenAI/S3 outage)
+        # do not hit the dependency again in lockstep
+        retry_delay = calculate_exponential_backoff_delay(
+            initial_delay, current_retries, jitter=True
         )
 
-        # Retry the task with exponential backoff
+        if current_retries < self.max_retries:
+            logger.warning(
+                "🔄 Retrying summarization in %ss (exponential backoff: attempt %s/%s)",
+                retry_delay,
+                current_retries + 1,
+                self.max_retries,
+            )
+
+        # Past max_retries, retry() re-raises e and on_failure marks the video failed
         raise self.retry(exc=e, countdown=retry_delay)
-    finally:
-        if self._db:
-            self._db.close()
-            self._db = None
 
+    finally:
+        self.release_video_lock(lock)
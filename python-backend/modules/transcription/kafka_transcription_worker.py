@@ -3,10 +3,12 @@ import logging
 import sys
 from typing import Dict
 
-from common.handlers.kafka import validate_kafka_payload, db_session_context
+from celery_app import celery_app
+from common.handlers.kafka import db_session_context, extract_video_event
+from common.types.video import VideoTranscodedPayload
 from database.models import VideoTranscript
 from database.repository import GenericRepository
-from modules.transcription.tasks.video_transcription import transcribe_video_task
+from modules.videos.constants import CELERY_TASK_TRANSCRIBE_VIDEO, TRANSCRIPT_EXISTS_READY_KEY
 from modules.videos.services.processed_message_service import ProcessedMessageService
 from providers.kafka import create_consumer
 
@@ -19,6 +21,16 @@ logger = logging.getLogger(__name__)
 # Topic name for idempotency tracking
 TOPIC_NAME = "video.transcoded"
 
+# Events are tiny and handling is cheap next to a broker round-trip: let the
+# broker accumulate a few per fetch, bounded by a short max wait at idle
+CONSUMER_CONFIG = {
+    "fetch.min.bytes": 65536,
+    "fetch.wait.max.ms": 500,
+    "max.partition.fetch.bytes": 1048576,
+}
+# Messages per consume() call (librdkafka has no max.poll.records)
+CONSUMER_BATCH_SIZE = 50
+
 
 def handle_video_transcoded(payload: Dict):
     """
@@ -37,66 +49,79 @@ def handle_video_transcoded(payload: Dict):
             - ts: Timestamp
     """
     # Validate payload and extract common fields
-    event_id, video_id = validate_kafka_payload(payload, ["videoId"])
-    if not event_id or video_id is None:
+    event_id, video_id = extract_video_event(payload)
+    if not event_id:
         return
 
     logger.info(
-        f"📥 Received {TOPIC_NAME} event: eventId={event_id}, videoId={video_id}"
+        "📥 Received %s event: eventId=%s, videoId=%s", TOPIC_NAME, event_id, video_id
     )
 
     # Log variants count for debugging
     variants = payload.get("variants", [])
     if variants:
-        logger.debug(f"Event has {len(variants)} variants")
+        logger.debug("Event has %d variants", len(variants))
 
     # Use context manager for database session
     with db_session_context() as db_session:
         transcript_repo = GenericRepository(VideoTranscript, db_session)
         processed_service = ProcessedMessageService(db_session)
 
-        # Real idempotency check: does transcript exist with status "ready"?
-        existing_transcript = transcript_repo.find_one({"video_id": video_id})
-        if existing_transcript and existing_transcript.status == "ready":
-            logger.info(
-                f"✅ Transcript already exists for video {video_id} (status: {existing_transcript.status}), skipping"
-            )
-            # Still mark event as processed if not already marked (for tracking)
-            if not processed_service.is_processed(event_id, TOPIC_NAME):
-                try:
-                    processed_service.mark_as_processed(event_id, TOPIC_NAME, skip_check=True)
-                except Exception:
-                    pass  # Non-critical
+        # Redis SETNX short-circuits recent duplicates before any DB work (the
+        # session only checks out a connection on its first execute)
+        if processed_service.seen_recently(event_id, TOPIC_NAME):
+            logger.info("⏭️ Skipping duplicate message: eventId=%s, videoId=%s", event_id, video_id)
             return
 
-        # Check if event was marked as processed
-        was_processed = processed_service.is_processed(event_id, TOPIC_NAME)
-        if was_processed:
+        try:
+            # Real idempotency check: does transcript exist with status "ready"?
+            # One SELECT EXISTS; the result travels with the task so it skips its own lookup.
+            transcript_ready = transcript_repo.exists({"video_id": video_id, "status": "ready"})
+
+            # Mark as processed in the same round-trip as the duplicate check
+            # (INSERT ... ON CONFLICT DO NOTHING); committed when the session exits.
+            claimed = processed_service.try_claim(event_id, TOPIC_NAME)
+        except Exception:
+            # Let a redelivery through the Redis gate again
+            processed_service.forget_seen([event_id], TOPIC_NAME)
+            raise
+
+        if transcript_ready:
+            logger.info("✅ Transcript already exists for video %s (status: ready), skipping", video_id)
+            return
+
+        if not claimed:
             # Event was processed but transcript doesn't exist - likely task failed
             logger.warning(
-                f"⚠️ Event {event_id} was marked as processed but transcript doesn't exist for video {video_id}. "
-                f"Allowing reprocessing to fix stuck state..."
+                "⚠️ Event %s was marked as processed but transcript doesn't exist for video %s. "
+                "Allowing reprocessing to fix stuck state...",
+                event_id,
+                video_id,
             )
 
-        # Queue Celery task immediately (non-blocking)
-        logger.info(f"🔄 Queuing transcription task for video {video_id}...")
-        task_result = transcribe_video_task.delay(payload)
-
-        # Mark as processed (best-effort, skip duplicate check since we already verified transcript)
-        try:
-            processed_service.mark_as_processed(event_id, TOPIC_NAME, skip_check=True)
-            logger.debug(
-                f"✅ Marked event as processed: eventId={event_id}, videoId={video_id}"
-            )
-        except Exception as mark_error:
-            # Non-critical: task will handle idempotency via DB constraints
-            logger.warning(
-                f"⚠️ Failed to mark event as processed (non-critical, task will handle idempotency): {str(mark_error)}"
-            )
+    # Queue Celery task outside the DB session: the claim is committed and the
+    # connection is back in the pool before the broker round-trip
+    logger.info("🔄 Queuing transcription task for video %s...", video_id)
+    task_payload = {**payload, TRANSCRIPT_EXISTS_READY_KEY: transcript_ready}
+    try:
+        task_result = celery_app.send_task(CELERY_TASK_TRANSCRIBE_VIDEO, args=[task_payload])
+    except Exception:
+        # Compensate: release our claim (and the Redis key) so a redelivery can be processed
+        if claimed:
+            try:
+                with db_session_context() as db_session:
+                    ProcessedMessageService(db_session).release_claim(event_id, TOPIC_NAME)
+            except Exception as release_error:
+                logger.warning(
+                    "⚠️ Failed to release claim for eventId=%s: %s", event_id, release_error
+                )
+        else:
+            processed_service.forget_seen([event_id], TOPIC_NAME)
+        raise
 
-        logger.info(
-            f"✅ Queued transcription task: videoId={video_id}, taskId={task_result.id}"
-        )
+    logger.info(
+        "✅ Queued transcription task: videoId=%s, taskId=%s", video_id, task_result.id
+    )
 
 
 def main():
@@ -104,7 +129,13 @@ def main():
     logger.info("🚀 Starting Kafka consumer worker for video.transcoded events")
 
     # Create consumer for video.transcoded topic
-    consumer = create_consumer("video.transcoded", handle_video_transcoded)
+    consumer = create_consumer(
+        "video.transcoded",
+        handle_video_transcoded,
+        payload_type=VideoTranscodedPayload,
+        batch_size=CONSUMER_BATCH_SIZE,
+        consumer_config=CONSUMER_CONFIG,
+    )
 
     try:
         # Start consuming
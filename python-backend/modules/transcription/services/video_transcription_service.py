@@ -1,23 +1,55 @@
 """Video transcription service using OpenAI Whisper."""
-import json
 import logging
 import os
-import tempfile
-from typing import Any, Dict, Optional
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 import boto3
-import whisper
+import numpy as np
+import orjson
+import ctranslate2
+from botocore.config import Config as BotocoreConfig
 from botocore.exceptions import ClientError
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from common.exceptions.base import NotFoundException
 from config import get_settings
-from database.models import VideoStatusLog, VideoTranscript, Videos
+from database.models import OutboxEvent, VideoStatusLog, VideoTranscript, Videos
 from database.repository import GenericRepository
-from modules.videos.services.outbox_service import OutboxService
 from modules.videos.services.video_status_log_service import VideoStatusLogService
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Whisper models expect 16 kHz mono input
+WHISPER_SAMPLE_RATE = 16000
+
+# Lifetime of the presigned URL ffmpeg streams the video from
+VIDEO_URL_EXPIRES_SECONDS = 3600
+
+# Audio decode (ffmpeg subprocess) overlaps the task's DB status update
+_audio_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="audio-decode")
+
+# transcript.json layout: v2 stores segments column-wise ({"start": [...],
+# "end": [...], "text": [...]}, text last so readers can stream it); v1
+# (no schema_version) was a list of {id, start, end, text} objects
+TRANSCRIPT_SCHEMA_VERSION = "v2"
+
+# Whisper results of the last few videos transcribed in this process, keyed by
+# (bucket, S3 key, model). Original video keys are immutable, so a retry or
+# duplicate delivery landing on the same worker skips the decode and model run.
+WHISPER_RESULT_CACHE_SIZE = 4
+_whisper_results: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+
+# Keep S3 connections alive and pooled across tasks in the worker process
+S3_CLIENT_CONFIG = BotocoreConfig(max_pool_connections=32, tcp_keepalive=True)
+
 # Initialize S3 client (lazy initialization)
 _s3_client = None
 
@@ -32,22 +64,53 @@ def get_s3_client():
             aws_access_key_id=settings.aws_access_key_id,
             aws_secret_access_key=settings.aws_secret_access_key,
             endpoint_url=settings.aws_s3_endpoint if settings.use_localstack else None,
+            config=S3_CLIENT_CONFIG,
         )
     return _s3_client
 
 
+def _remember_whisper_result(key: Tuple[str, str, str], result: Dict[str, Any]) -> None:
+    """Store a Whisper result, evicting the least recently used beyond the cache size."""
+    _whisper_results[key] = result
+    _whisper_results.move_to_end(key)
+    while len(_whisper_results) > WHISPER_RESULT_CACHE_SIZE:
+        _whisper_results.popitem(last=False)
+
+
+def _whisper_device() -> Tuple[str, str]:
+    """Pick (device, compute_type): float16 on CUDA, int8 on CPU."""
+    if ctranslate2.get_cuda_device_count() > 0:
+        return "cuda", "float16"
+    return "cpu", "int8"
+
+
+@lru_cache(maxsize=1)
+def _load_whisper(model_name: str) -> WhisperModel:
+    """Load a Whisper model once per worker process."""
+    device, compute_type = _whisper_device()
+    logger.info(f"📥 Loading Whisper model: {model_name} ({device}, {compute_type})")
+    model = WhisperModel(model_name, device=device, compute_type=compute_type)
+    logger.info(f"✅ Whisper model loaded: {model_name}")
+    return model
+
+
+@lru_cache(maxsize=1)
+def _load_whisper_pipeline(model_name: str) -> BatchedInferencePipeline:
+    """Batched inference pipeline over the process-wide Whisper model."""
+    return BatchedInferencePipeline(model=_load_whisper(model_name))
+
+
 class VideoTranscriptionService:
     """Service for transcribing videos using OpenAI Whisper."""
 
-    def __init__(self, db_session, transcript_repo: GenericRepository[VideoTranscript], outbox_service: Optional[OutboxService] = None):
+    def __init__(self, db_session, transcript_repo: GenericRepository[VideoTranscript]):
         """Initialize video transcription service."""
         self.db_session = db_session
         self.transcript_repo = transcript_repo
-        self.outbox_service = outbox_service or OutboxService(db_session)
         self.bucket = settings.aws_youtube_bucket
+        self.videos_repo = GenericRepository(Videos, db_session)
 
-        # Initialize Whisper model (lazy loading)
-        self._model = None
+        # Whisper model is loaded lazily and cached per process (see _load_whisper)
         self.model_name = os.getenv("WHISPER_MODEL", "base")  # tiny, base, small, medium, large
 
         # Initialize status log service
@@ -56,12 +119,8 @@ class VideoTranscriptionService:
 
     @property
     def model(self):
-        """Lazy load Whisper model."""
-        if self._model is None:
-            logger.info(f"📥 Loading Whisper model: {self.model_name}")
-            self._model = whisper.load_model(self.model_name)
-            logger.info(f"✅ Whisper model loaded: {self.model_name}")
-        return self._model
+        """Lazy load Whisper model (shared by every service in the process)."""
+        return _load_whisper(self.model_name)
 
     def transcribe_video(self, video_id: int, video_s3_key: str) -> Dict[str, Any]:
         """
@@ -74,115 +133,114 @@ class VideoTranscriptionService:
         Returns:
             Dict with transcript_id, transcript_file_key, segment_count
         """
-        logger.info(
-            f"🎤 Starting transcription for video {video_id}: {video_s3_key}"
-        )
-
-        temp_video_path = None
-        temp_audio_path = None
+        logger.debug("🎤 Starting transcription for video %s: %s", video_id, video_s3_key)
 
+        cache_key = (self.bucket, video_s3_key, self.model_name)
         try:
+            result = _whisper_results.get(cache_key)
+            if result is not None:
+                _whisper_results.move_to_end(cache_key)
+                logger.info("♻️ Reusing cached Whisper result for video %s", video_id)
+                audio_future = None
+            else:
+                # Start streaming/decoding the audio right away; the status update
+                # below runs on this thread (it owns the DB session) meanwhile
+                logger.debug("🎵 Step 1-2: Extracting audio from S3 video: %s", video_s3_key)
+                audio_future = _audio_executor.submit(self._stream_s3_to_audio, video_s3_key, video_id)
+
             # 1. Update video status to TRANSCRIBING if not already set
-            logger.info(f"🔍 Step 0: Checking video status for video {video_id}...")
-            videos_repo = GenericRepository(Videos, self.db_session)
-            video = videos_repo.find_one({"id": video_id})
+            logger.debug("🔍 Step 0: Checking video status for video %s...", video_id)
+            # The row is fetched once; later status changes go through this object
+            video = self.videos_repo.find_one({"id": video_id})
 
             if not video:
                 error_msg = f"Video {video_id} not found in database"
                 logger.error(f"❌ {error_msg}")
-                raise ValueError(error_msg)
+                raise NotFoundException(error_msg, {"video_id": video_id})
 
-            logger.info(f"📊 Video {video_id} found - Title: '{video.title}', Current status: {video.status}")
+            logger.debug(
+                "📊 Video %s found - Title: '%s', Current status: %s", video_id, video.title, video.status
+            )
 
             if video and video.status != "transcribing":
-                logger.info(f"🔄 Updating video {video_id} status to 'transcribing'...")
-                videos_repo.update(
-                    {"id": video_id},
-                    {"status": "transcribing"},
-                )
-                # Log status change
-                self.status_log_service.log_status_change(
+                logger.debug("🔄 Updating video %s status to 'transcribing'...", video_id)
+                # Status update and its log row in one statement; the commit
+                # also releases the connection before the decode and Whisper run
+                self.status_log_service.change_status(
                     video_id,
                     "transcribing",
                     "python-backend",
                     "Starting transcription with OpenAI Whisper",
                 )
-                logger.info(f"✅ Video {video_id} status updated to 'transcribing'")
+                logger.debug("✅ Video %s status updated to 'transcribing'", video_id)
             else:
-                logger.info(f"ℹ️ Video {video_id} already in 'transcribing' status, continuing...")
-
-            # 2. Download video from S3 to temp file
-            logger.info(f"📥 Step 1: Downloading video from S3: {video_s3_key}")
-            temp_video_path = self._download_video_from_s3(video_s3_key, video_id)
-            logger.info(f"✅ Video downloaded: {temp_video_path}")
-
-            # 3. Extract audio from video (Whisper needs audio)
-            logger.info(f"🎵 Step 2: Extracting audio from video...")
-            temp_audio_path = self._extract_audio(temp_video_path, video_id)
-            logger.info(f"✅ Audio extracted: {temp_audio_path}")
-
-            # 4. Transcribe using OpenAI Whisper
-            logger.info(f"🤖 Step 3: Running Whisper transcription on {temp_audio_path}")
-            logger.info(f"📋 Using Whisper model: {self.model_name}")
-            logger.info(f"⏱️ Starting transcription - this may take a while for large videos...")
-            try:
-                result = self.model.transcribe(temp_audio_path)
-                logger.info(f"✅ Whisper transcription completed successfully")
-                logger.info(f"📊 Transcription stats: duration={result.get('duration', 0):.2f}s, language={result.get('language', 'unknown')}")
-            except Exception as whisper_error:
-                logger.error(f"❌ Whisper transcription failed: {str(whisper_error)}", exc_info=True)
-                raise
+                logger.debug("ℹ️ Video %s already in 'transcribing' status, continuing...", video_id)
+                # End the read-only transaction so its pooled connection is not
+                # held idle through the decode and Whisper run (autobegins on next use)
+                self.db_session.commit()
+
+            if audio_future is not None:
+                # 2-3. Wait for the S3 -> ffmpeg decode (Whisper needs audio)
+                audio = audio_future.result()
+
+                # 4. Transcribe using Whisper (faster-whisper / CTranslate2)
+                logger.debug(
+                    "🤖 Step 3: Running Whisper transcription for video %s (model: %s)",
+                    video_id,
+                    self.model_name,
+                )
+                try:
+                    result = self._run_whisper(audio)
+                    del audio  # free the PCM buffer before the upload/DB steps
+                    logger.debug(
+                        "📊 Transcription stats: duration=%.2fs, language=%s",
+                        result.get("duration", 0),
+                        result.get("language", "unknown"),
+                    )
+                except Exception as whisper_error:
+                    logger.error("❌ Whisper transcription failed: %s", whisper_error, exc_info=True)
+                    raise
+                _remember_whisper_result(cache_key, result)
 
             # 5. Process transcript segments
             transcript_text = result.get("text", "").strip()
             segments = result.get("segments", [])
             segment_count = len(segments)
 
-            logger.info(
-                f"✅ Transcription completed: {segment_count} segments, {len(transcript_text)} chars"
+            logger.debug(
+                "✅ Transcription completed: %d segments, %d chars", segment_count, len(transcript_text)
             )
-            logger.info(f"📝 Transcript preview: {transcript_text[:200]}..." if transcript_text else "⚠️ Empty transcript")
+            if not transcript_text:
+                logger.warning("⚠️ Empty transcript for video %s", video_id)
+            elif logger.isEnabledFor(logging.DEBUG):
+                # The slice is only taken when DEBUG is on
+                logger.debug("📝 Transcript preview: %s...", transcript_text[:200])
 
             # 6. Upload transcript to S3
-            logger.info(f"☁️ Step 4: Uploading transcript to S3...")
+            logger.debug("☁️ Step 4: Uploading transcript to S3...")
             transcript_file_key = self._upload_transcript_to_s3(
                 video_id, transcript_text, segments
             )
-            logger.info(f"✅ Transcript uploaded to S3: {transcript_file_key}")
 
-            # 7. Save transcript to database and add to outbox in transaction
-            logger.info(f"💾 Step 5: Saving transcript to database and adding to outbox...")
-            transcript_record = self._save_transcript_with_outbox(
+            # 7. Save transcript, outbox event and the SUMMARIZING status
+            # (next stage, handled by Python backend) in one transaction
+            logger.debug("💾 Step 5: Saving transcript, outbox event and 'summarizing' status...")
+            video.status = "summarizing"  # flushed with the transcript upsert
+            transcript_id = self._save_transcript_with_outbox(
                 video_id, transcript_text, transcript_file_key, segment_count, result
             )
-            logger.info(f"✅ Transcript saved to database (ID: {transcript_record.id})")
-
-            # 8. Update video status to SUMMARIZING (next stage) - transcription done
-            logger.info(f"🔄 Step 6: Updating video status to 'summarizing'...")
-            videos_repo = GenericRepository(Videos, self.db_session)
-            video = videos_repo.find_one({"id": video_id})
-            if video:
-                videos_repo.update(
-                    {"id": video_id},
-                    {"status": "summarizing"},  # Next stage handled by Python backend
-                )
-                # Log status change
-                self.status_log_service.log_status_change(
-                    video_id,
-                    "summarizing",
-                    "python-backend",
-                    "Transcription completed, starting summarization",
-                )
-                logger.info(f"✅ Updated video {video_id} status to 'summarizing'")
-            else:
-                logger.warning(f"⚠️ Video {video_id} not found when updating status to 'summarizing'")
+            logger.debug(
+                "✅ Transcript saved (ID: %s), video %s status updated to 'summarizing'",
+                transcript_id,
+                video_id,
+            )
 
-            logger.info(
-                f"✅ Transcription completed: videoId={video_id}, transcriptId={transcript_record.id}"
+            logger.debug(
+                "✅ Transcription completed: videoId=%s, transcriptId=%s", video_id, transcript_id
             )
 
             return {
-                "transcript_id": transcript_record.id,
+                "transcript_id": transcript_id,
                 "transcript_file_key": transcript_file_key,
                 "segment_count": segment_count,
             }
@@ -194,32 +252,22 @@ class VideoTranscriptionService:
             )
             logger.error(f"📊 Error type: {type(e).__name__}")
 
-            # Update video status to FAILED
+            # Update video status to FAILED (one statement: update + status log)
             try:
-                # Videos is already imported at the top of the file
-                videos_repo = GenericRepository(Videos, self.db_session)
-                video = videos_repo.find_one({"id": video_id})
-                if video:
-                    logger.info(
-                        f"🔄 Updating video {video_id} status to FAILED due to error"
-                    )
-                    videos_repo.update(
-                        {"id": video_id},
-                        {
-                            "status": "failed",
-                            "status_message": str(e),
-                        },
-                    )
-                    # Log status change
-                    self.status_log_service.log_status_change(
-                        video_id,
-                        "failed",
-                        "python-backend",
-                        f"Transcription failed: {str(e)}",
-                    )
+                self.db_session.rollback()
+                logger.info(f"🔄 Updating video {video_id} status to FAILED due to error")
+                if self.status_log_service.change_status(
+                    video_id,
+                    "failed",
+                    "python-backend",
+                    f"Transcription failed: {str(e)}",
+                    video_status_message=str(e),
+                ):
                     logger.info(f"✅ Updated video {video_id} status to FAILED")
                 else:
-                    logger.warning(f"⚠️ Video {video_id} not found, cannot update status")
+                    logger.warning(
+                        f"⚠️ Video {video_id} not found or already failed, status not logged"
+                    )
             except Exception as status_error:
                 logger.error(
                     f"❌ Failed to update video status: {str(status_error)}",
@@ -228,87 +276,98 @@ class VideoTranscriptionService:
 
             raise
 
-        finally:
-            # Cleanup temp files
-            self._cleanup_temp_files(temp_video_path, temp_audio_path)
-
-    def _download_video_from_s3(self, s3_key: str, video_id: int) -> str:
-        """Download video from S3 to temporary file."""
-        logger.info(f"📥 Downloading video from S3: bucket={self.bucket}, key={s3_key}")
-
-        s3 = get_s3_client()
-        temp_dir = tempfile.gettempdir()
-        temp_file = os.path.join(temp_dir, f"video_{video_id}_transcribe.mp4")
+    def _run_whisper(self, audio: np.ndarray) -> Dict[str, Any]:
+        """
+        Transcribe 16 kHz mono float32 audio.
 
-        try:
-            # Check if file exists first
-            logger.debug(f"🔍 Checking if S3 object exists: {s3_key}")
-            s3.head_object(Bucket=self.bucket, Key=s3_key)
-            logger.debug(f"✅ S3 object exists, proceeding with download")
-
-            s3.download_file(self.bucket, s3_key, temp_file)
-            file_size = os.path.getsize(temp_file) if os.path.exists(temp_file) else 0
-            logger.info(
-                f"✅ Video downloaded to: {temp_file} (size: {file_size} bytes)"
+        Returns the openai-whisper result shape ({text, segments, language,
+        duration}) that the upload and DB steps expect.
+        """
+        # Silero VAD drops silence/music before decoding; batching lets several
+        # 30s windows share one forward pass
+        vad_parameters = {"min_silence_duration_ms": settings.whisper_vad_min_silence_ms}
+        if settings.whisper_batch_size > 1:
+            segments_iter, info = _load_whisper_pipeline(self.model_name).transcribe(
+                audio,
+                batch_size=settings.whisper_batch_size,
+                vad_filter=True,
+                vad_parameters=vad_parameters,
             )
-            return temp_file
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            logger.error(
-                f"❌ Failed to download video from S3: {error_code} - {str(e)}"
+        else:
+            segments_iter, info = self.model.transcribe(
+                audio, vad_filter=True, vad_parameters=vad_parameters
             )
-            logger.error(f"📋 S3 bucket: {self.bucket}, key: {s3_key}")
-            raise
+        segments = [
+            {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in segments_iter
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+            "duration": info.duration,
+        }
 
-    def _extract_audio(self, video_path: str, video_id: int) -> str:
-        """Extract audio from video file using ffmpeg."""
-        import subprocess
+    def _stream_s3_to_audio(self, s3_key: str, video_id: int) -> np.ndarray:
+        """
+        Extract audio from an S3 video without writing the video to disk.
 
-        logger.info(f"🎵 Extracting audio from video: {video_path}")
+        ffmpeg reads the object over a presigned HTTP URL (range requests, so
+        MP4s with the moov atom at the end still work, unlike a stdin pipe)
+        and decodes while it downloads; nothing is written to disk.
+        """
+        logger.debug("📥 Streaming video from S3: bucket=%s, key=%s", self.bucket, s3_key)
+
+        # Signing is local; there is no HEAD first, a missing object surfaces
+        # as an HTTP 404 in ffmpeg's stderr
+        video_url = get_s3_client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": s3_key},
+            ExpiresIn=VIDEO_URL_EXPIRES_SECONDS,
+        )
+        return self._extract_audio(video_url, video_id)
 
-        if not os.path.exists(video_path):
-            error_msg = f"Video file not found: {video_path}"
-            logger.error(f"❌ {error_msg}")
-            raise FileNotFoundError(error_msg)
+    def _extract_audio(self, video_source: str, video_id: int) -> np.ndarray:
+        """
+        Decode the audio track of a video file path or URL using ffmpeg.
 
-        temp_dir = tempfile.gettempdir()
-        audio_path = os.path.join(temp_dir, f"audio_{video_id}_transcribe.wav")
+        ffmpeg writes raw 16 kHz mono s16le PCM to stdout, which becomes the
+        float32 array Whisper takes directly; no WAV is written to disk.
+        """
+        import subprocess
 
         try:
             # Use ffmpeg to extract audio (mono, 16kHz - optimal for Whisper)
-            logger.debug(
-                f"🔧 Running ffmpeg command: ffmpeg -i {video_path} -ac 1 -ar 16000 -vn -f wav -y {audio_path}"
-            )
+            # (the source is not logged: presigned URLs carry credentials)
+            logger.debug("🔧 Running ffmpeg for video %s: -ac 1 -ar 16000 -f s16le pipe:1", video_id)
             result = subprocess.run(
                 [
                     "ffmpeg",
-                    "-i", video_path,
+                    # No banner/progress spam: stderr carries only errors, so
+                    # it stays tiny yet is still there to log on failure
+                    "-hide_banner", "-nostats", "-loglevel", "error",
+                    "-i", video_source,
                     "-ac", "1",  # Mono
                     "-ar", "16000",  # 16kHz sample rate
                     "-vn",  # No video
-                    "-f", "wav",
-                    "-y",  # Overwrite
-                    audio_path,
+                    "-f", "s16le",
+                    "-acodec", "pcm_s16le",
+                    "pipe:1",
                 ],
                 check=True,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
             )
-            audio_size = os.path.getsize(audio_path) if os.path.exists(audio_path) else 0
-            logger.info(
-                f"✅ Audio extracted to: {audio_path} (size: {audio_size} bytes)"
+            audio = np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+            logger.debug(
+                "✅ Audio decoded: %.1fs (%d bytes PCM)", audio.size / WHISPER_SAMPLE_RATE, len(result.stdout)
             )
-            if result.stderr:
-                logger.debug(f"FFmpeg stderr: {result.stderr}")
-            return audio_path
+            return audio
         except subprocess.CalledProcessError as e:
-            logger.error(
-                f"❌ Failed to extract audio: {str(e)}, returncode={e.returncode}"
-            )
+            # str(e) would include the command line, i.e. the presigned URL
+            logger.error(f"❌ Failed to extract audio: ffmpeg returncode={e.returncode}")
             if e.stderr:
-                logger.error(f"FFmpeg stderr: {e.stderr}")
-            if e.stdout:
-                logger.debug(f"FFmpeg stdout: {e.stdout}")
+                logger.error(f"FFmpeg stderr: {e.stderr.decode('utf-8', errors='replace')}")
             raise
         except FileNotFoundError:
             logger.error("❌ ffmpeg not found. Please install ffmpeg.")
@@ -317,14 +376,27 @@ class VideoTranscriptionService:
     def _upload_transcript_to_s3(
         self, video_id: int, transcript_text: str, segments: list
     ) -> str:
-        """Upload transcript JSON to S3."""
-        transcript_key = f"transcripts/{video_id}/transcript.json"
+        """
+        Upload transcript JSON (schema v2, columnar segments) to S3.
+
+        Each run writes its own key under transcripts/{video_id}/. The row
+        (and the video.transcribed event) only point at it if this run wins
+        the upsert, so a duplicate run never overwrites the kept transcript.
+        """
+        transcript_key = f"transcripts/{video_id}/{uuid.uuid4().hex}/transcript.json"
 
+        # Parallel arrays instead of one object per segment: no repeated keys
+        # to write or parse; a segment's id is its index
         transcript_data = {
+            "schema_version": TRANSCRIPT_SCHEMA_VERSION,
             "video_id": video_id,
             "full_text": transcript_text,
-            "segments": segments,
             "created_at": None,  # Will be set by timestamp
+            "segments": {
+                "start": [segment["start"] for segment in segments],
+                "end": [segment["end"] for segment in segments],
+                "text": [segment["text"] for segment in segments],
+            },
         }
 
         try:
@@ -332,15 +404,23 @@ class VideoTranscriptionService:
             s3.put_object(
                 Bucket=self.bucket,
                 Key=transcript_key,
-                Body=json.dumps(transcript_data, indent=2),
+                # Compact: about half the bytes of indent=2; numpy floats serialize natively
+                Body=orjson.dumps(transcript_data, option=orjson.OPT_SERIALIZE_NUMPY),
                 ContentType="application/json",
             )
-            logger.info(f"✅ Transcript uploaded to S3: {transcript_key}")
+            logger.debug("✅ Transcript uploaded to S3: %s", transcript_key)
             return transcript_key
         except ClientError as e:
             logger.error(f"Failed to upload transcript to S3: {str(e)}")
             raise
 
+    def _delete_transcript_from_s3(self, transcript_key: str) -> None:
+        """Best-effort removal of a transcript object no row points at."""
+        try:
+            get_s3_client().delete_object(Bucket=self.bucket, Key=transcript_key)
+        except ClientError as e:
+            logger.warning("⚠️ Failed to delete unused transcript %s: %s", transcript_key, e)
+
     def _save_transcript_with_outbox(
         self,
         video_id: int,
@@ -348,81 +428,109 @@ class VideoTranscriptionService:
         transcript_file_key: str,
         segment_count: int,
         whisper_result: Dict,
-    ):
-        """Save transcript to database and add event to outbox in transaction."""
-        import uuid
-        from datetime import datetime
+    ) -> int:
+        """
+        Save transcript to database and add event to outbox in transaction.
 
-        try:
-            # 1. Save/update transcript
-            existing = self.transcript_repo.find_one({"video_id": video_id})
-            if existing:
-                transcript_record = self.transcript_repo.update(
-                    {"video_id": video_id},
-                    {
-                        "transcript_text": transcript_text,
-                        "transcript_path": transcript_file_key,
-                        "status": "ready",
-                        "duration_seconds": int(whisper_result.get("duration", 0)),
-                        "model_info": {
-                            "model": "whisper",
-                            "model_name": self.model_name,
-                            "language": whisper_result.get("language"),
-                            "segment_count": segment_count,
-                        },
-                    },
-                )
-            else:
-                transcript_record = self.transcript_repo.create(
-                    {
-                        "video_id": video_id,
-                        "transcript_text": transcript_text,
-                        "transcript_path": transcript_file_key,
-                        "status": "ready",
-                        "duration_seconds": int(whisper_result.get("duration", 0)),
-                        "model_info": {
-                            "model": "whisper",
-                            "model_name": self.model_name,
-                            "language": whisper_result.get("language"),
-                            "segment_count": segment_count,
-                        },
-                    }
-                )
+        One statement: a CTE upserts the transcript (INSERT ... ON CONFLICT
+        (video_id) DO UPDATE RETURNING id) and the outbox row is inserted from
+        it. The caller's pending video status change is flushed before it and
+        its status log row is added after it, all under a single commit.
 
-            # 2. Add event to outbox (same pattern as video.summarized)
-            event_payload = {
-                "id": str(uuid.uuid4()),
-                "videoId": video_id,
-                "transcriptFileKey": transcript_file_key,
-                "snippetCount": segment_count,
-                "ts": datetime.utcnow().isoformat(),
-            }
+        Returns:
+            Transcript ID
+        """
+        # Audio duration from Whisper; if it is missing, the last segment's
+        # end (segments are already in memory, no extra probe)
+        segments = whisper_result.get("segments") or []
+        duration = whisper_result.get("duration") or (segments[-1]["end"] if segments else 0)
+
+        transcript_values = {
+            "transcript_text": transcript_text,
+            "transcript_path": transcript_file_key,
+            "status": "ready",
+            "duration_seconds": int(duration),
+            "model_info": {
+                "model": "whisper",
+                "model_name": self.model_name,
+                "language": whisper_result.get("language"),
+                "segment_count": segment_count,
+            },
+        }
 
-            self.outbox_service.add_to_outbox(
-                topic="video.transcribed",
-                payload=event_payload,
-                db_session=self.db_session,
-                service="python-backend",
-            )
+        # Outbox event (same pattern as video.summarized)
+        event_payload = {
+            "id": str(uuid.uuid4()),
+            "videoId": video_id,
+            "transcriptFileKey": transcript_file_key,
+            "snippetCount": segment_count,
+            "ts": datetime.now(timezone.utc).isoformat(),
+        }
+        outbox_values = {
+            "id": uuid.uuid4(),
+            "topic": "video.transcribed",
+            "payload": event_payload,
+            "published": False,
+            "attempts": 0,
+            "service": "python-backend",  # Mark service for nest-be scheduler
+        }
 
-            logger.info(
-                f"📝 Saved transcript and outbox event: videoId={video_id}"
+        upsert = (
+            pg_insert(VideoTranscript)
+            .values(video_id=video_id, **transcript_values)
+            .on_conflict_do_update(
+                index_elements=[VideoTranscript.video_id],
+                set_={**transcript_values, "updated_at": func.now()},
+                # A ready transcript is left alone and returns no row, so a
+                # duplicate run inserts no second outbox event
+                where=VideoTranscript.status != "ready",
             )
+            .returning(VideoTranscript.id)
+            .cte("upsert")
+        )
+        stmt = (
+            pg_insert(OutboxEvent)
+            .from_select(
+                list(outbox_values),
+                select(
+                    *(
+                        literal(value, getattr(OutboxEvent, column).type)
+                        for column, value in outbox_values.items()
+                    )
+                ).select_from(upsert),
+            )
+            .add_cte(upsert)
+            .returning(select(upsert.c.id).scalar_subquery())
+        )
 
-            return transcript_record
-
+        try:
+            transcript_id = self.db_session.execute(stmt).scalar_one_or_none()
+            if transcript_id is None:
+                # Already saved by another run (duplicate delivery): keep its row
+                self.db_session.rollback()
+                transcript_id = self.db_session.scalar(
+                    select(VideoTranscript.id).where(VideoTranscript.video_id == video_id)
+                )
+                self.db_session.commit()
+                # The kept row points at the other run's object; drop ours
+                self._delete_transcript_from_s3(transcript_file_key)
+                logger.warning(
+                    "⏭️ Transcript for video %s was saved by another run, keeping it (id=%s)",
+                    video_id,
+                    transcript_id,
+                )
+                return transcript_id
+            self.status_log_service.add_status_change(
+                video_id,
+                "summarizing",
+                "python-backend",
+                "Transcription completed, starting summarization",
+            )
+            self.db_session.commit()
         except Exception as e:
             self.db_session.rollback()
             logger.error(f"❌ Failed to save transcript with outbox: {str(e)}")
             raise
 
-    def _cleanup_temp_files(self, *file_paths):
-        """Cleanup temporary files."""
-        for file_path in file_paths:
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    logger.debug(f"🗑️ Cleaned up temp file: {file_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup temp file {file_path}: {str(e)}")
-
+        logger.debug("📝 Saved transcript and outbox event: videoId=%s", video_id)
+        return transcript_id
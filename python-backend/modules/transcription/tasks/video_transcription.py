@@ -1,47 +1,54 @@
 """Celery tasks for video transcription."""
-import logging
+import time
 from typing import Dict
 
-from celery import Task
-from sqlalchemy.orm import Session
+from celery.utils.log import get_task_logger
 
 from celery_app import celery_app
 from common.constants.task_constants import (
+    NON_RETRYABLE_TASK_EXCEPTIONS,
+    TRANSCRIPTION_LOCK_KEY,
     TRANSCRIPTION_TASK_CONFIG,
     calculate_exponential_backoff_delay,
 )
-from database.base import SessionLocal
-from database.models import VideoTranscript, Videos, VideoStatusLog
+from common.tasks import DatabaseTask
+from common.types.video import VideoTranscodedPayload, convert_payload
+from database.models import VideoTranscript
 from database.repository import GenericRepository
-from modules.videos.services.video_status_log_service import VideoStatusLogService
+from modules.videos.constants import CELERY_TASK_TRANSCRIBE_VIDEO, TRANSCRIPT_EXISTS_READY_KEY
 from modules.transcription.services.video_transcription_service import VideoTranscriptionService
 
-logger = logging.getLogger(__name__)
+# Celery task logger: the worker's task log format stamps each record with
+# the running task's name and id, so the task body needs no per-call adapter
+logger = get_task_logger(__name__)
 
 
-class DatabaseTask(Task):
-    """Custom task base class that handles database session."""
+class TranscriptionTask(DatabaseTask):
+    """DatabaseTask that keeps one VideoTranscriptionService per worker session."""
 
     def __init__(self):
         """Initialize task."""
         super().__init__()
-        self._db = None
-
-    def before_start(self, task_id, args, kwargs):
-        """Called before task starts."""
-        self._db = SessionLocal()
-
-    def after_return(self, *args, **kwargs):
-        """Called after task returns."""
-        if self._db:
-            self._db.close()
-            self._db = None
+        self._transcription_service = None
+
+    def get_transcription_service(self) -> VideoTranscriptionService:
+        """Get the VideoTranscriptionService bound to this worker's session (built once)."""
+        db = self.db
+        service = self._transcription_service
+        if service is None or service.db_session is not db:
+            service = self._transcription_service = VideoTranscriptionService(
+                db, GenericRepository(VideoTranscript, db)
+            )
+        return service
 
 
 @celery_app.task(
     bind=True,
-    base=DatabaseTask,
-    name="tasks.transcribe_video",
+    base=TranscriptionTask,
+    name=CELERY_TASK_TRANSCRIBE_VIDEO,
+    # Re-queue (rather than lose) a job whose worker dies mid-transcription
+    acks_late=True,
+    reject_on_worker_lost=True,
     max_retries=TRANSCRIPTION_TASK_CONFIG["max_retries"],
     # Note: retry delay is calculated dynamically with exponential backoff
     # Setting default_retry_delay for backward compatibility, but will be overridden
@@ -61,29 +68,49 @@ def transcribe_video_task(self, payload: Dict) -> Dict:
     Returns:
         Dict with transcription information
     """
-    task_logger = logger.getChild(f"task_{self.request.id}")
-    video_id = payload.get("videoId")
-    event_id = payload.get("id")
-
-    task_logger.info(
-        f"🎤 Starting video transcription: videoId={video_id}, eventId={event_id}"
+    # Decoded and type-checked once; a malformed payload fails without retries
+    event = convert_payload(payload, VideoTranscodedPayload)
+    video_id = event.videoId
+    event_id = event.id or event.eventId
+
+    # One info line per task start/end; the task logger already stamps the task id
+    started_at = time.monotonic()
+    logger.info(
+        "🎤 Starting video transcription: videoId=%s, eventId=%s, retries=%s",
+        video_id,
+        event_id,
+        self.request.retries,
     )
-    task_logger.info(f"📋 Full payload: {payload}")
-    task_logger.info(f"🆔 Task ID: {self.request.id}, Retries: {self.request.retries}")
 
-    try:
-        db = self._db or SessionLocal()
-        task_logger.info(f"🔌 Database session created for video {video_id}")
+    # One transcription per video at a time: a redelivery while a run is in
+    # flight waits for it instead of repeating minutes of Whisper work
+    lock = self.acquire_video_lock(TRANSCRIPTION_LOCK_KEY.format(video_id=video_id))
+    if lock is None:
+        logger.warning("⏭️ Transcription for video %s is already in progress, skipping", video_id)
+        return {"videoId": video_id, "status": "in_progress"}
 
-        transcript_repo = GenericRepository(VideoTranscript, db)
-        transcription_service = VideoTranscriptionService(db, transcript_repo)
-
-        # Check if transcript already exists (idempotency)
-        task_logger.info(f"🔍 Checking for existing transcript for video {video_id}...")
-        existing_transcript = transcript_repo.find_one({"video_id": video_id})
+    try:
+        # Service and repositories are reused across tasks on this worker
+        # (WorkerSession hands every task the same thread-local Session)
+        transcription_service = self.get_transcription_service()
+        transcript_repo = transcription_service.transcript_repo
+
+        # Check if transcript already exists (idempotency). The Kafka worker ran
+        # this check just before queuing; trust its result on the first attempt.
+        transcript_ready = payload.get(TRANSCRIPT_EXISTS_READY_KEY)
+        if transcript_ready:
+            logger.warning("⏭️ Transcript already exists for video %s, skipping", video_id)
+            return {"videoId": video_id, "status": "exists", "transcriptId": None}
+        if transcript_ready is None or self.request.retries:
+            logger.debug("🔍 Checking for existing transcript for video %s...", video_id)
+            existing_transcript = transcript_repo.find_one({"video_id": video_id})
+        else:
+            existing_transcript = None
         if existing_transcript and existing_transcript.status == "ready":
-            task_logger.warning(
-                f"⏭️ Transcript already exists for video {video_id}, skipping. Transcript ID: {existing_transcript.id}"
+            logger.warning(
+                "⏭️ Transcript already exists for video %s, skipping. Transcript ID: %s",
+                video_id,
+                existing_transcript.id,
             )
             return {
                 "videoId": video_id,
@@ -93,18 +120,21 @@ def transcribe_video_task(self, payload: Dict) -> Dict:
 
         # Get original video S3 key
         original_video_key = f"videos/original/{video_id}.mp4"
-        task_logger.info(f"📹 Using video S3 key: {original_video_key}")
+        logger.debug("📹 Using video S3 key: %s", original_video_key)
 
         # Process transcription (downloads, transcribes, uploads, saves)
-        task_logger.info(f"🚀 Starting transcription service for video {video_id}...")
         result = transcription_service.transcribe_video(
             video_id, original_video_key
         )
-        task_logger.info(f"✅ Transcription service completed for video {video_id}: {result}")
 
         # Note: Event is published via outbox pattern (background job handles publishing)
-        task_logger.info(
-            f"✅ Video transcription completed: videoId={video_id}, transcriptId={result['transcript_id']}"
+        duration_ms = int((time.monotonic() - started_at) * 1000)
+        logger.info(
+            "✅ Video transcription completed: videoId=%s, transcriptId=%s, durationMs=%d",
+            video_id,
+            result["transcript_id"],
+            duration_ms,
+            extra={"video_id": video_id, "duration_ms": duration_ms},
         )
 
         return {
@@ -114,66 +144,36 @@ def transcribe_video_task(self, payload: Dict) -> Dict:
         }
 
     except Exception as e:
-        task_logger.error(
-            f"❌ Failed to transcribe video {video_id}: {str(e)}",
+        logger.error(
+            "❌ Failed to transcribe video %s: %s",
+            video_id,
+            e,
             exc_info=True,
         )
 
-        max_retries = TRANSCRIPTION_TASK_CONFIG["max_retries"]
-        current_retries = self.request.retries
-
-        task_logger.error(
-            f"📊 Retry count: {current_retries}/{max_retries}"
-        )
-
-        # Update video status to FAILED if all retries exhausted
-        try:
-            if current_retries >= max_retries - 1:
-                db = self._db or SessionLocal()
-                videos_repo = GenericRepository(Videos, db)
-                video = videos_repo.find_one({"id": video_id})
-                if video:
-                    videos_repo.update(
-                        {"id": video_id},
-                        {
-                            "status": "failed",
-                            "status_message": str(e),
-                        },
-                    )
-                    # Log status change
-                    status_log_repo = GenericRepository(VideoStatusLog, db)
-                    # VideoStatusLogService already imported at top
-                    status_log_service = VideoStatusLogService(db, status_log_repo)
-                    status_log_service.log_status_change(
-                        video_id,
-                        "failed",
-                        "python-backend",
-                        str(e),
-                    )
-                    task_logger.error(
-                        f"💀 Updated video {video_id} status to FAILED after exhausting retries"
-                    )
-                if not self._db:
-                    db.close()
-                # Don't retry if we've exhausted all attempts
-                raise
-        except Exception as status_error:
-            task_logger.warning(f"Failed to update video status: {str(status_error)}")
-            # Re-raise original error if status update fails
-            raise e
+        if isinstance(e, NON_RETRYABLE_TASK_EXCEPTIONS):
+            # Retrying cannot help: on_failure marks the video failed
+            raise
 
         # Calculate exponential backoff delay (matching BullMQ behavior)
+        current_retries = self.request.retries
         initial_delay = TRANSCRIPTION_TASK_CONFIG["initial_retry_delay"]
-        retry_delay = calculate_exponential_backoff_delay(initial_delay, current_retries)
-
-        task_logger.warning(
-            f"🔄 Retrying transcription in {retry_delay}s (exponential backoff: attempt {current_retries + 1}/{max_retries})"
+        # Jittered so videos that failed together (e.g. an OpenAI/S3 outage)
+        # do not hit the dependency again in lockstep
+        retry_delay = calculate_exponential_backoff_delay(
+            initial_delay, current_retries, jitter=True
         )
 
-        # Retry the task with exponential backoff
+        if current_retries < self.max_retries:
+            logger.warning(
+                "🔄 Retrying transcription in %ss (exponential backoff: attempt %s/%s)",
+                retry_delay,
+                current_retries + 1,
+                self.max_retries,
+            )
+
+        # Past max_retries, retry() re-raises e and on_failure marks the video failed
         raise self.retry(exc=e, countdown=retry_delay)
-    finally:
-        if self._db:
-            self._db.close()
-            self._db = None
 
+    finally:
+        self.release_video_lock(lock)
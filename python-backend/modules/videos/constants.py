@@ -5,6 +5,16 @@ from common.constants.kafka import KAFKA_TOPIC_VIDEO_TRANSCRIBED
 CELERY_TASK_TRANSCRIBE_VIDEO = "tasks.transcribe_video"
 CELERY_TASK_SUMMARIZE_VIDEO = "tasks.summarize_video"
 
+# Celery queues: Whisper jobs and summaries each get their own queue so the
+# GPU-bounded transcription pool and the OpenAI-bound summary pool are sized
+# independently and neither starves the other
+CELERY_QUEUE_DEFAULT = "celery"
+CELERY_QUEUE_TRANSCRIPTION = "transcription"
+CELERY_QUEUE_SUMMARIZATION = "summarization"
+
+# Payload key carrying the Kafka worker's transcript idempotency check to the task
+TRANSCRIPT_EXISTS_READY_KEY = "_transcript_exists_ready"
+
 # Video processing statuses
 VIDEO_STATUS_PROCESSING = "processing"
 VIDEO_STATUS_TRANSCRIBING = "transcribing"
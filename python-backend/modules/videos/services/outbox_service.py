@@ -1,8 +1,9 @@
 """Outbox service for reliable Kafka event publishing."""
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from database.models import OutboxEvent
@@ -10,6 +11,9 @@ from database.repository import GenericRepository
 
 logger = logging.getLogger(__name__)
 
+# Session.info key for the per-session OutboxEvent repository
+OUTBOX_REPO_INFO_KEY = "outbox_repo"
+
 
 class OutboxService:
     """Service for managing outbox events (similar to nest-be OutboxService)."""
@@ -17,7 +21,15 @@ class OutboxService:
     def __init__(self, db_session: Session):
         """Initialize outbox service."""
         self.db_session = db_session
-        self.outbox_repo = GenericRepository(OutboxEvent, db_session)
+        self.outbox_repo = self._repo_for(db_session)
+
+    @staticmethod
+    def _repo_for(session: Session) -> GenericRepository[OutboxEvent]:
+        """Repository bound to session, built once per session (cached in Session.info)."""
+        repo = session.info.get(OUTBOX_REPO_INFO_KEY)
+        if repo is None:
+            repo = session.info[OUTBOX_REPO_INFO_KEY] = GenericRepository(OutboxEvent, session)
+        return repo
 
     def add_to_outbox(
         self,
@@ -41,31 +53,50 @@ class OutboxService:
         Returns:
             Created OutboxEvent
         """
-        # Use provided session or default - optimize by reusing repo when possible
-        if db_session and db_session is not self.db_session:
-            # Different session for transaction, create new repo
-            repo = GenericRepository(OutboxEvent, db_session)
-        else:
-            # Same session, reuse existing repo
-            repo = self.outbox_repo
-
-        event = repo.create(
-            {
-                "topic": topic,
-                "payload": payload,
-                "published": False,
-                "attempts": 0,
-                "service": service,  # Mark which service created this event
-            }
+        return self.add_many_to_outbox(
+            [{"topic": topic, "payload": payload, "service": service}], db_session=db_session
+        )[0]
+
+    def add_many_to_outbox(
+        self,
+        events: List[Dict[str, Any]],
+        db_session: Optional[Session] = None,
+    ) -> List[OutboxEvent]:
+        """
+        Add several events to the outbox with one multi-row INSERT ... RETURNING.
+
+        Args:
+            events: Dicts with topic, payload and optional service (default: 'python-backend')
+            db_session: Optional database session (for transactions)
+
+        Returns:
+            Created OutboxEvents
+        """
+        repo = self._repo_for(db_session) if db_session is not None else self.outbox_repo
+
+        created = repo.create_many(
+            [
+                {
+                    "topic": event["topic"],
+                    "payload": event["payload"],
+                    "published": False,
+                    "attempts": 0,
+                    "service": event.get("service", "python-backend"),  # Mark which service created this event
+                }
+                for event in events
+            ]
         )
 
-        logger.debug(f"📝 Added event to outbox: topic={topic}, service={service}, id={event.id}")
-        return event
+        logger.debug("📝 Added %d events to outbox", len(created))
+        return created
 
     def get_unpublished_events(self, limit: int = 100) -> list[OutboxEvent]:
         """
         Get unpublished events (for background publisher).
 
+        Locks the returned rows (FOR UPDATE SKIP LOCKED) until the session's
+        transaction ends, so concurrent publishers claim disjoint batches.
+
         Args:
             limit: Maximum number of events to retrieve
 
@@ -73,54 +104,57 @@ class OutboxService:
             List of unpublished OutboxEvent instances
         """
         return self.outbox_repo.find_all(
-            where={"published": False}, limit=limit, order_by="created_at ASC"
+            where={"published": False},
+            limit=limit,
+            order_by="created_at ASC",
+            lock="skip_locked",
         )
 
     def mark_as_published(
         self, event_id: UUID, db_session: Optional[Session] = None
     ) -> None:
         """
-        Mark event as published.
+        Mark event as published with a single UPDATE (no SELECT preflight).
 
         Args:
             event_id: OutboxEvent ID
             db_session: Optional database session (for transactions)
         """
-        from datetime import datetime
-
-        # Use provided session or default - optimize by reusing repo when possible
-        if db_session and db_session is not self.db_session:
-            repo = GenericRepository(OutboxEvent, db_session)
-        else:
-            repo = self.outbox_repo
-
-        event = repo.find_one({"id": str(event_id)})
-        if event:
-            repo.update(
-                {"id": str(event_id)},
-                {
-                    "published": True,
-                    "published_at": datetime.utcnow(),
-                },
-            )
-            logger.debug(f"✅ Marked outbox event as published: id={event_id}")
+        session = db_session or self.db_session
+        # DB-side NOW(): one clock for every service stamping published_at
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id == str(event_id))
+            .values(published=True, published_at=func.now())
+        )
+        updated = session.execute(stmt).rowcount
+        session.commit()
+        if updated:
+            logger.debug("✅ Marked outbox event as published: id=%s", event_id)
 
-    def increment_attempts(self, event_id: UUID) -> None:
+    def increment_attempts(self, event_id: UUID) -> Optional[int]:
         """
         Increment attempts counter for failed publishing.
 
+        One atomic UPDATE ... RETURNING, so concurrent publishers never lose
+        an increment.
+
         Args:
             event_id: OutboxEvent ID
+
+        Returns:
+            New attempts count, or None if the event does not exist
         """
-        # Optimize: Update directly without fetching first (if DB supports it)
-        event = self.outbox_repo.find_one({"id": str(event_id)})
-        if event:
-            new_attempts = (event.attempts or 0) + 1
-            self.outbox_repo.update(
-                {"id": str(event_id)},
-                {"attempts": new_attempts},
-            )
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id == str(event_id))
+            .values(attempts=func.coalesce(OutboxEvent.attempts, 0) + 1)
+            .returning(OutboxEvent.attempts)
+        )
+        attempts = self.db_session.execute(stmt).scalar_one_or_none()
+        self.db_session.commit()
+        if attempts is not None:
             logger.debug(
-                f"📊 Incremented attempts for outbox event: id={event_id}, attempts={new_attempts}"
+                "📊 Incremented attempts for outbox event: id=%s, attempts=%s", event_id, attempts
             )
-
+        return attempts
@@ -1,22 +1,95 @@
 """Service for tracking processed Kafka messages (idempotency)."""
 import logging
-from typing import Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
+from redis import Redis
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from database.models import ProcessedMessage
 from database.repository import GenericRepository
+from providers.redis import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# TTL for the Redis first-tier dedup keys (Postgres remains the source of truth)
+SEEN_CACHE_TTL_SECONDS = 86400
+
 
 class ProcessedMessageService:
     """Service for managing processed messages (idempotency tracking)."""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, redis_client: Optional[Redis] = None):
         """Initialize processed message service."""
         self.db_session = db_session
         self.processed_repo = GenericRepository(ProcessedMessage, db_session)
+        self.redis_client = redis_client or get_redis_client()
+
+    @staticmethod
+    def _seen_key(event_id: str, topic: str) -> str:
+        """Redis key for the first-tier dedup cache."""
+        return f"processed:{topic}:{event_id}"
+
+    def seen_recently(self, event_id: str, topic: str) -> bool:
+        """
+        First-tier duplicate check in Redis (SET NX EX), before hitting Postgres.
+
+        Args:
+            event_id: Event ID (UUID string)
+            topic: Topic name
+
+        Returns:
+            True if the event was already seen, False on first sight or Redis error
+        """
+        try:
+            first_sight = self.redis_client.set(
+                self._seen_key(event_id, topic), 1, nx=True, ex=SEEN_CACHE_TTL_SECONDS
+            )
+            return not first_sight
+        except Exception as e:
+            # Fall through to the DB claim, which is authoritative
+            logger.warning(f"⚠️ Redis dedup check failed for {event_id}: {str(e)}")
+            return False
+
+    def seen_recently_many(self, event_ids: Iterable[str], topic: str) -> Set[str]:
+        """
+        Batch variant of seen_recently: one pipelined round-trip of SET NX EX.
+
+        Args:
+            event_ids: Event IDs (UUID strings)
+            topic: Topic name
+
+        Returns:
+            Set of the given event IDs already seen (empty on Redis error)
+        """
+        ids = list(dict.fromkeys(str(event_id) for event_id in event_ids))
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for event_id in ids:
+                pipe.set(self._seen_key(event_id, topic), 1, nx=True, ex=SEEN_CACHE_TTL_SECONDS)
+            first_sights = pipe.execute()
+        except Exception as e:
+            # Fall through to the DB claim, which is authoritative
+            logger.warning(f"⚠️ Redis dedup check failed for {len(ids)} events: {str(e)}")
+            return set()
+        return {event_id for event_id, first_sight in zip(ids, first_sights) if not first_sight}
+
+    def forget_seen(self, event_ids: Iterable[str], topic: str) -> None:
+        """
+        Clear Redis dedup keys so redeliveries of these events are not skipped.
+
+        Args:
+            event_ids: Event IDs (UUID strings)
+            topic: Topic name
+        """
+        keys = [self._seen_key(event_id, topic) for event_id in event_ids]
+        if not keys:
+            return
+        try:
+            self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to clear Redis dedup keys for {len(keys)} events: {str(e)}")
 
     def is_processed(self, event_id: str, topic: Optional[str] = None) -> bool:
         """
@@ -43,49 +116,115 @@ class ProcessedMessageService:
             # On error, assume not processed (fail open to avoid blocking)
             return False
 
-    def mark_as_processed(self, event_id: str, topic: str, skip_check: bool = False) -> ProcessedMessage:
+    def try_claim(self, event_id: str, topic: str) -> bool:
         """
-        Mark an event as processed.
+        Atomically claim an event for processing.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING RETURNING id so the duplicate
+        check and the insert happen in a single round-trip. The caller owns the
+        transaction (commit happens when the session context exits).
 
         Args:
             event_id: Event ID (UUID string)
             topic: Topic name
-            skip_check: Skip duplicate check if already verified (optimization)
 
         Returns:
-            Created ProcessedMessage
+            True if this call claimed the event, False if it was already processed
         """
         try:
-            # Skip check if already verified by caller (optimization)
-            if not skip_check:
-                existing = self.processed_repo.find_one({"id": str(event_id)})
-                if existing:
-                    logger.debug(
-                        f"⏭️ Event {event_id} already marked as processed (race condition handled)"
-                    )
-                    return existing
-
-            message = self.processed_repo.create(
-                {
-                    "id": str(event_id),
-                    "topic": topic,
-                }
+            stmt = (
+                insert(ProcessedMessage)
+                .values(id=str(event_id), topic=topic)
+                .on_conflict_do_nothing(index_elements=[ProcessedMessage.id])
+                .returning(ProcessedMessage.id)
             )
-            logger.debug(
-                f"✅ Marked event as processed: eventId={event_id}, topic={topic}"
-            )
-            return message
+            claimed = self.db_session.execute(stmt).scalar_one_or_none() is not None
+            if claimed:
+                logger.debug(f"✅ Claimed event: eventId={event_id}, topic={topic}")
+            return claimed
         except Exception as e:
-            # Handle unique constraint violation (race condition)
-            if "unique constraint" in str(e).lower() or "duplicate key" in str(e).lower():
-                logger.debug(
-                    f"⏭️ Event {event_id} already marked (race condition during insert)"
-                )
-                # Return existing record
-                return self.processed_repo.find_one({"id": str(event_id)})
+            self.db_session.rollback()
+            logger.error(f"❌ Error claiming processed message {event_id}: {str(e)}")
+            # On error, assume not processed (fail open to avoid blocking)
+            return True
 
+    def try_claim_many(self, events: List[Tuple[str, str]]) -> Set[str]:
+        """
+        Batch variant of try_claim: one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING id.
+
+        The caller owns the transaction, so claims roll back together with any
+        work that fails before the commit.
+
+        Args:
+            events: (event_id, topic) pairs
+
+        Returns:
+            Set of the given event IDs claimed by this call (the rest were already processed)
+        """
+        if not events:
+            return set()
+        rows = [{"id": str(event_id), "topic": topic} for event_id, topic in events]
+        stmt = (
+            insert(ProcessedMessage)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[ProcessedMessage.id])
+            .returning(ProcessedMessage.id)
+        )
+        claimed = {str(event_id) for event_id in self.db_session.execute(stmt).scalars()}
+        logger.debug(f"✅ Claimed {len(claimed)}/{len(rows)} events")
+        return claimed
+
+    def release_claim(self, event_id: str, topic: Optional[str] = None) -> None:
+        """
+        Remove a claim so the event can be redelivered and processed again.
+
+        Used as a compensating action when work could not be dispatched after
+        a successful try_claim. The caller owns the transaction.
+
+        Args:
+            event_id: Event ID (UUID string)
+            topic: Topic name (also clears the Redis dedup key if given)
+        """
+        self.db_session.execute(
+            delete(ProcessedMessage).where(ProcessedMessage.id == str(event_id))
+        )
+        if topic:
+            self.forget_seen([event_id], topic)
+        logger.debug(f"↩️ Released claim for event: eventId={event_id}")
+
+    def mark_as_processed(self, event_id: str, topic: str) -> ProcessedMessage:
+        """
+        Mark an event as processed.
+
+        One INSERT ... ON CONFLICT DO NOTHING RETURNING; the existing row is
+        only SELECTed on the (rare) duplicate path.
+
+        Args:
+            event_id: Event ID (UUID string)
+            topic: Topic name
+
+        Returns:
+            Created (or already existing) ProcessedMessage
+        """
+        stmt = (
+            insert(ProcessedMessage)
+            .values(id=str(event_id), topic=topic)
+            .on_conflict_do_nothing(index_elements=[ProcessedMessage.id])
+            .returning(ProcessedMessage)
+        )
+        try:
+            message = self.db_session.scalars(stmt).one_or_none()
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
             logger.error(
                 f"❌ Failed to mark event as processed {event_id}: {str(e)}", exc_info=True
             )
             raise
 
+        if message is None:
+            logger.debug(f"⏭️ Event {event_id} already marked as processed (race condition handled)")
+            return self.processed_repo.find_one({"id": str(event_id)})
+
+        logger.debug(f"✅ Marked event as processed: eventId={event_id}, topic={topic}")
+        return message
@@ -2,8 +2,9 @@
 import logging
 from typing import Optional
 
+from sqlalchemy import insert, literal, select, update
 
-from database.models import VideoStatusLog
+from database.models import Videos, VideoStatusLog
 from database.repository import GenericRepository
 
 logger = logging.getLogger(__name__)
@@ -23,11 +24,14 @@ class VideoStatusLogService:
         status: str,
         actor: str = "system",
         status_message: Optional[str] = None,
-    ) -> Optional[VideoStatusLog]:
+    ) -> bool:
         """
         Log a video status change.
         Only logs if the status is different from the last logged status.
 
+        The duplicate check runs inside the INSERT (INSERT ... SELECT ... WHERE
+        latest status IS DISTINCT FROM :status), so this is one round-trip.
+
         Args:
             video_id: Video ID
             status: New status (VideoProcessingStatus enum value)
@@ -35,46 +39,153 @@ class VideoStatusLogService:
             status_message: Optional message/context
 
         Returns:
-            VideoStatusLog record if logged, None if skipped (duplicate status)
+            True if logged, False if skipped (duplicate status) or logging failed
         """
         try:
-            # Check the most recent status log for this video
-            # Optimize: Use repository method with limit=1 instead of raw query
-            all_logs = self.status_log_repo.find_all(
-                where={"video_id": video_id},
-                limit=1,
-                order_by="created_at DESC",
-            )
-            latest_log = all_logs[0] if all_logs else None
-
-            # Only log if:
-            # 1. No previous status exists (first log), OR
-            # 2. The new status is different from the latest status
-            if latest_log and latest_log.status == status:
-                logger.debug(
-                    f"⏭️ Skipping duplicate status log: videoId={video_id}, status={status} (same as latest)"
-                )
-                return None  # Return None to indicate no log was created
-
-            log_entry = self.status_log_repo.create(
-                {
-                    "video_id": video_id,
-                    "status": status,
-                    "actor": actor,
-                    "status_message": status_message,
-                }
-            )
-            logger.debug(
-                f"📝 Logged status change: videoId={video_id}, status={status}, actor={actor}"
-            )
-            return log_entry
+            logged = self.add_status_change(video_id, status, actor, status_message)
+            self.db_session.commit()
         except Exception as e:
+            self.db_session.rollback()
             # Don't fail the main operation if logging fails
             logger.warning(
                 f"Failed to log status change for video {video_id}: {str(e)}"
             )
             # Don't re-raise - allow caller to continue
-            return None
+            return False
+
+        if logged:
+            logger.debug(
+                f"📝 Logged status change: videoId={video_id}, status={status}, actor={actor}"
+            )
+        else:
+            logger.debug(
+                f"⏭️ Skipping duplicate status log: videoId={video_id}, status={status} (same as latest)"
+            )
+        return logged
+
+    def add_status_change(
+        self,
+        video_id: int,
+        status: str,
+        actor: str = "system",
+        status_message: Optional[str] = None,
+    ) -> bool:
+        """
+        Insert a status log row in the caller's transaction, without committing.
+
+        Lets a service commit the log together with its own writes. Same
+        duplicate check as log_status_change; errors propagate to the caller.
+
+        Returns:
+            True if a row was inserted, False if skipped (duplicate status)
+        """
+        latest_status = self._latest_status_subquery(video_id)
+        # No previous log makes the subquery NULL, which IS DISTINCT FROM any status
+        stmt = insert(VideoStatusLog).from_select(
+            ["video_id", "status", "actor", "status_message"],
+            select(
+                literal(video_id), literal(status), literal(actor), literal(status_message)
+            ).where(latest_status.is_distinct_from(status)),
+            include_defaults=False,  # created_at comes from the server default
+        )
+        return self.db_session.execute(stmt).rowcount > 0
+
+    def change_status(
+        self,
+        video_id: int,
+        status: str,
+        actor: str = "python-backend",
+        status_message: Optional[str] = None,
+        video_status_message: Optional[str] = None,
+    ) -> bool:
+        """
+        Set a video's status and log the change in one statement and one commit.
+
+        WITH changed_video AS (UPDATE videos ... RETURNING id) INSERT INTO
+        video_status_logs SELECT ... FROM changed_video, deduplicated against
+        the latest logged status like log_status_change.
+
+        Args:
+            video_id: Video ID
+            status: New status (VideoProcessingStatus enum value)
+            actor: Who/what made the change
+            status_message: Message stored on the status log row
+            video_status_message: If given, also stored as videos.status_message
+
+        Returns:
+            True if the video exists and the status change was logged
+        """
+        video_values = {"status": status}
+        if video_status_message is not None:
+            video_values["status_message"] = video_status_message
+        changed_video = (
+            update(Videos)
+            .where(Videos.id == video_id)
+            .values(**video_values)
+            .returning(Videos.id)
+            .cte("changed_video")
+        )
+        stmt = insert(VideoStatusLog).from_select(
+            ["video_id", "status", "actor", "status_message"],
+            select(
+                changed_video.c.id, literal(status), literal(actor), literal(status_message)
+            ).where(self._latest_status_subquery(video_id).is_distinct_from(status)),
+            include_defaults=False,
+        ).add_cte(changed_video)
+        try:
+            logged = self.db_session.execute(stmt).rowcount > 0
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            raise
+        return logged
+
+    def mark_video_failed(
+        self, video_id: int, error: str, actor: str = "python-backend"
+    ) -> bool:
+        """
+        Set a video to failed and log the change (see change_status).
+
+        Args:
+            video_id: Video ID
+            error: Failure message (stored as status_message on both rows)
+            actor: Who/what made the change
+
+        Returns:
+            True if the video exists and the status change was logged
+        """
+        return self.change_status(video_id, "failed", actor, error, video_status_message=error)
+
+    @staticmethod
+    def _latest_status_subquery(video_id: int):
+        """Scalar subquery: latest logged status for a video (NULL if none)."""
+        return (
+            select(VideoStatusLog.status)
+            .where(VideoStatusLog.video_id == video_id)
+            .order_by(VideoStatusLog.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    def get_latest_status(self, video_id: int) -> Optional[str]:
+        """
+        Get the most recently logged status for a video.
+
+        Reads only the status column (index scan on (video_id, created_at)).
+
+        Args:
+            video_id: Video ID
+
+        Returns:
+            Latest status, or None if nothing has been logged yet
+        """
+        stmt = (
+            select(VideoStatusLog.status)
+            .where(VideoStatusLog.video_id == video_id)
+            .order_by(VideoStatusLog.created_at.desc())
+            .limit(1)
+        )
+        return self.db_session.execute(stmt).scalar_one_or_none()
 
     def get_status_history(self, video_id: int) -> list[VideoStatusLog]:
         """Get status history for a video."""
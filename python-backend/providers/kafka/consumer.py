@@ -1,50 +1,100 @@
 """Kafka consumer service for consuming events."""
-import json
 import logging
+import queue
 import signal
-import sys
 import time
-from threading import Event
-from typing import Callable, Dict
+from threading import Event, Lock, Thread, current_thread, main_thread
+from typing import Callable, Dict, List, Optional, Type
 
-from confluent_kafka import Consumer, KafkaError, KafkaException
-from confluent_kafka.admin import AdminClient
+import msgspec
+import orjson
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
 
 from config import get_settings
-from providers.kafka.topic_manager import ensure_topic_exists
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Fetched batches buffered ahead of the handler
+PREFETCH_BATCHES = 2
+
+# Pause after a handler failure before the rewound messages are handled again
+REDELIVERY_BACKOFF_SECONDS = 1.0
+
+# Base consumer config, built once at import (copied per instance)
+DEFAULT_CONFIG = {
+    "bootstrap.servers": settings.kafka_brokers,
+    "group.id": settings.kafka_group_id,
+    "auto.offset.reset": "earliest",
+    # Never surface records from aborted producer transactions
+    "isolation.level": "read_committed",
+    # Offsets are stored only after the handler returns normally (not on
+    # fetch) and committed once per handled batch, so prefetched, unhandled or
+    # failed messages are never committed
+    "enable.auto.commit": False,
+    "enable.auto.offset.store": False,
+    "session.timeout.ms": 30000,
+}
+
+# Per-message log format (lazy %-formatting: skipped when INFO is disabled)
+RECEIVED_LOG = "📥 Received message from %s: %s"
+
 
 class KafkaConsumer:
     """Kafka consumer service for consuming video events."""
 
-    def __init__(self, topic: str, handler: Callable[[Dict], None], create_topic: bool = True):
-        """Initialize Kafka consumer."""
+    def __init__(
+        self,
+        topic: str,
+        handler: Callable,
+        create_topic: bool = True,
+        payload_type: Optional[Type[msgspec.Struct]] = None,
+        batch_size: Optional[int] = None,
+        batch: bool = False,
+        install_signal_handlers: bool = True,
+        consumer_config: Optional[Dict] = None,
+    ):
+        """Initialize Kafka consumer.
+
+        If payload_type is given, message bytes are decoded and validated
+        directly into that Struct and handed to the handler as a dict.
+        batch_size caps messages fetched per consume() call (default: KAFKA_BATCH_SIZE).
+        If batch is True the handler is called once per fetched batch with a
+        list of payloads instead of once per message.
+        SIGINT/SIGTERM handlers are installed only if install_signal_handlers
+        is True and the consumer is built on the main thread.
+        consumer_config holds librdkafka properties (e.g. fetch.min.bytes)
+        that override DEFAULT_CONFIG for this consumer.
+        """
         self.topic = topic
         self.handler = handler
+        self.batch = batch
+        self.batch_size = batch_size or settings.kafka_batch_size
+        self._decoder = msgspec.json.Decoder(payload_type) if payload_type else None
 
         # Ensure topic exists before subscribing
         if create_topic:
+            # Admin client import is deferred: it's only needed to create topics
+            from providers.kafka.topic_manager import ensure_topic_exists
+
             ensure_topic_exists(topic, num_partitions=1, replication_factor=1)
 
-        self.consumer = Consumer(
-            {
-                "bootstrap.servers": settings.kafka_brokers,
-                "group.id": settings.kafka_group_id,
-                "auto.offset.reset": "earliest",
-                "enable.auto.commit": True,
-                "session.timeout.ms": 30000,
-            }
-        )
-        self.consumer.subscribe([topic])
+        self.consumer = Consumer({**DEFAULT_CONFIG, **(consumer_config or {})})
+        self.consumer.subscribe([topic], on_revoke=self._on_revoke)
         self.running = False
         self.shutdown_event = Event()
+        # Fetch thread -> handler thread hand-off (see consume): batches are
+        # tagged with the fetch generation, bumped by _rewind so batches
+        # fetched before a seek are discarded. The lock keeps a consume() call
+        # and a seek from interleaving
+        self._batches: "queue.Queue[tuple]" = queue.Queue(maxsize=PREFETCH_BATCHES)
+        self._fetch_lock = Lock()
+        self._generation = 0
 
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Setup signal handlers (signal.signal only works on the main thread)
+        if install_signal_handlers and current_thread() is main_thread():
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
 
         logger.info(f"Kafka consumer initialized for topic: {topic}")
 
@@ -53,59 +103,244 @@ class KafkaConsumer:
         logger.info(f"Received signal {signum}, shutting down...")
         self.shutdown_event.set()
 
+    def _on_revoke(self, consumer, partitions):
+        """Commit handled offsets and drop prefetched batches (never stored) on rebalance."""
+        self._commit(asynchronous=False)
+        dropped = 0
+        while True:
+            try:
+                dropped += len(self._batches.get_nowait()[1])
+            except queue.Empty:
+                break
+        if dropped:
+            logger.info("🔄 Partitions revoked, dropped %d prefetched messages", dropped)
+
+    def _fetch_loop(self):
+        """Keep the next batch in flight while the handler works on the current one."""
+        try:
+            last_batch_size = 0
+            while not self.shutdown_event.is_set():
+                # Fetch up to batch_size messages in one call into librdkafka;
+                # short wait while traffic is flowing, long wait when idle
+                timeout = (
+                    settings.kafka_consume_min_timeout
+                    if last_batch_size
+                    else settings.kafka_consume_max_timeout
+                )
+                with self._fetch_lock:
+                    msgs = self.consumer.consume(num_messages=self.batch_size, timeout=timeout)
+                    generation = self._generation
+                last_batch_size = len(msgs)
+                if not msgs:
+                    continue
+                # Blocks while PREFETCH_BATCHES are already queued
+                while self.running:
+                    try:
+                        self._batches.put((generation, msgs), timeout=1.0)
+                        break
+                    except queue.Full:
+                        continue
+        except KafkaException as e:
+            logger.error(f"Kafka exception: {str(e)}")
+            self.shutdown_event.set()
+
     def consume(self):
-        """Start consuming messages."""
+        """Start consuming messages.
+
+        A fetch thread runs consumer.consume() into a bounded queue; this
+        thread runs the handler. On shutdown, already fetched batches are
+        drained before the consumer is closed.
+        """
         self.running = True
         logger.info(f"🚀 Starting to consume messages from {self.topic}")
 
+        fetcher = Thread(target=self._fetch_loop, name=f"kafka-fetch-{self.topic}", daemon=True)
+        fetcher.start()
         try:
-            while not self.shutdown_event.is_set():
-                msg = self.consumer.poll(timeout=1.0)
+            while True:
+                try:
+                    generation, msgs = self._batches.get(timeout=1.0)
+                except queue.Empty:
+                    if not fetcher.is_alive() and self._batches.empty():
+                        break
+                    continue
+                if generation != self._generation:
+                    # Fetched before a rewind; the seek re-fetches these
+                    continue
+                if self.batch:
+                    failed = self._process_batch(msgs)
+                else:
+                    failed = self._process_messages(msgs)
+                # One offset commit per handled batch, off the handler's critical path
+                self._commit()
+                if failed:
+                    self._rewind(failed)
 
-                if msg is None:
+        finally:
+            self.running = False
+            self.shutdown_event.set()
+            fetcher.join()
+            self._commit(asynchronous=False)
+            self.consumer.close()
+            logger.info("Kafka consumer closed")
+
+    def _handle_error(self, msg):
+        """Log (and for a missing topic, try to recover from) a consumer error event."""
+        error_code = msg.error().code()
+        if error_code == KafkaError._PARTITION_EOF:
+            logger.debug(
+                "Reached end of partition %s, offset %s", msg.partition(), msg.offset()
+            )
+        elif error_code == KafkaError.UNKNOWN_TOPIC_OR_PART:
+            logger.warning(
+                f"⚠️ Topic '{self.topic}' does not exist. Attempting to create..."
+            )
+            from providers.kafka.topic_manager import ensure_topic_exists
+
+            # Try to create topic and retry (the broker says it's gone, so bypass the cache)
+            if ensure_topic_exists(self.topic, use_cache=False):
+                logger.info(f"✅ Topic '{self.topic}' created, retrying subscription...")
+                time.sleep(2)  # Wait a bit for topic to be ready
+            else:
+                logger.error(f"❌ Failed to create topic '{self.topic}'")
+        else:
+            logger.error(f"Consumer error: {msg.error()}")
+
+    def _decode(self, msg) -> Optional[Dict]:
+        """Parse a message value; returns None (after logging) if it can't be parsed."""
+        # Raw UTF-8 bytes go straight to the parser (no intermediate str)
+        value = msg.value()
+        if value is None:
+            logger.debug("Skipping tombstone message at offset %s", msg.offset())
+            return None
+        try:
+            if self._decoder is not None:
+                payload = msgspec.structs.asdict(self._decoder.decode(value))
+            else:
+                payload = orjson.loads(value)
+        except (orjson.JSONDecodeError, msgspec.DecodeError) as e:
+            logger.error("Failed to parse message: %s", e)
+            return None
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(RECEIVED_LOG, self.topic, payload.get("id", "N/A"))
+        return payload
+
+    def _process_messages(self, msgs) -> List:
+        """
+        Handle a fetched batch one message at a time.
+
+        Offsets are stored only for messages whose handler returned normally.
+        After a failure the rest of that partition's messages are left
+        unhandled too, so its committed offset never passes the failed one.
+
+        Returns:
+            The failed and skipped messages, to be rewound and redelivered
+        """
+        failed = []
+        failed_partitions = set()
+        for msg in msgs:
+            if msg.error():
+                self._handle_error(msg)
+                continue
+            if msg.partition() in failed_partitions:
+                failed.append(msg)
+                continue
+
+            payload = self._decode(msg)
+            if payload is not None:
+                try:
+                    self.handler(payload)
+                except Exception as e:
+                    logger.error("Error processing message at offset %s: %s", msg.offset(), e)
+                    failed_partitions.add(msg.partition())
+                    failed.append(msg)
                     continue
 
+            # Handled, or undecodable (a poison message is skipped, not retried)
+            self._store_offset(msg)
+        return failed
+
+    def _process_batch(self, msgs) -> List:
+        """
+        Decode a fetched batch and hand every payload to the handler in one call.
+
+        Returns:
+            The batch's messages if the handler raised (none are stored), else []
+        """
+        payloads = []
+        handled = []
+        for msg in msgs:
+            if msg.error():
+                self._handle_error(msg)
+                continue
+            handled.append(msg)
+            payload = self._decode(msg)
+            if payload is not None:
+                payloads.append(payload)
+
+        if payloads:
+            try:
+                self.handler(payloads)
+            except Exception as e:
+                logger.error("Error processing batch of %d messages: %s", len(payloads), e)
+                return handled
+
+        for msg in handled:
+            self._store_offset(msg)
+        return []
+
+    def _rewind(self, failed) -> None:
+        """
+        Seek each partition back to its first unhandled offset so Kafka redelivers it.
+
+        Batches already prefetched are dropped (their messages are re-fetched
+        from the seek position) and the generation bump discards any batch the
+        fetch thread is still holding.
+        """
+        with self._fetch_lock:
+            unhandled = list(failed)
+            while True:
+                try:
+                    unhandled.extend(self._batches.get_nowait()[1])
+                except queue.Empty:
+                    break
+            positions: Dict[int, int] = {}
+            for msg in unhandled:
                 if msg.error():
-                    error_code = msg.error().code()
-                    if error_code == KafkaError._PARTITION_EOF:
-                        logger.debug(
-                            f"Reached end of partition {msg.partition()}, offset {msg.offset()}"
-                        )
-                    elif error_code == KafkaError.UNKNOWN_TOPIC_OR_PART:
-                        logger.warning(
-                            f"⚠️ Topic '{self.topic}' does not exist. Attempting to create..."
-                        )
-                        # Try to create topic and retry
-                        if ensure_topic_exists(self.topic):
-                            logger.info(f"✅ Topic '{self.topic}' created, retrying subscription...")
-                            time.sleep(2)  # Wait a bit for topic to be ready
-                        else:
-                            logger.error(f"❌ Failed to create topic '{self.topic}'")
-                            continue
-                    else:
-                        logger.error(f"Consumer error: {msg.error()}")
                     continue
-
+                partition = msg.partition()
+                positions[partition] = min(positions.get(partition, msg.offset()), msg.offset())
+            for partition, offset in positions.items():
                 try:
-                    # Parse message
-                    payload = json.loads(msg.value().decode("utf-8"))
-                    logger.info(
-                        f"📥 Received message from {self.topic}: {payload.get('id', 'N/A')}"
-                    )
+                    self.consumer.seek(TopicPartition(self.topic, partition, offset))
+                except KafkaException as e:
+                    # Partition was revoked meanwhile; the new owner re-reads it
+                    logger.debug("Skipping seek for revoked partition %s: %s", partition, e)
+            self._generation += 1
 
-                    # Call handler
-                    self.handler(payload)
+        logger.warning(
+            "↩️ Rewound %s to redeliver unhandled messages (partition -> offset: %s)",
+            self.topic,
+            positions,
+        )
+        # Don't spin on a dependency that is down
+        time.sleep(REDELIVERY_BACKOFF_SECONDS)
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse message: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Error processing message: {str(e)}")
+    def _store_offset(self, msg):
+        """Mark a handled message for the next offset commit."""
+        try:
+            self.consumer.store_offsets(message=msg)
+        except KafkaException as e:
+            # Partition was revoked mid-batch; the new owner re-reads it
+            logger.debug("Skipping offset store for revoked partition: %s", e)
 
+    def _commit(self, asynchronous: bool = True):
+        """Commit the stored offsets (no-op when nothing new was stored)."""
+        try:
+            self.consumer.commit(asynchronous=asynchronous)
         except KafkaException as e:
-            logger.error(f"Kafka exception: {str(e)}")
-        finally:
-            self.consumer.close()
-            logger.info("Kafka consumer closed")
+            if e.args[0].code() != KafkaError._NO_OFFSET:
+                logger.warning("⚠️ Offset commit failed: %s", e)
 
     def close(self):
         """Close consumer connection."""
@@ -113,6 +348,22 @@ class KafkaConsumer:
         self.consumer.close()
 
 
-def create_consumer(topic: str, handler: Callable[[Dict], None]) -> KafkaConsumer:
+def create_consumer(
+    topic: str,
+    handler: Callable,
+    payload_type: Optional[Type[msgspec.Struct]] = None,
+    batch_size: Optional[int] = None,
+    batch: bool = False,
+    install_signal_handlers: bool = True,
+    consumer_config: Optional[Dict] = None,
+) -> KafkaConsumer:
     """Create and return a Kafka consumer."""
-    return KafkaConsumer(topic, handler)
+    return KafkaConsumer(
+        topic,
+        handler,
+        payload_type=payload_type,
+        batch_size=batch_size,
+        batch=batch,
+        install_signal_handlers=install_signal_handlers,
+        consumer_config=consumer_config,
+    )
@@ -1,10 +1,11 @@
 """Kafka producer service for publishing events."""
-import json
 import logging
+import threading
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+import orjson
 from confluent_kafka import Producer
 
 from config import get_settings
@@ -12,21 +13,50 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Seconds each background poll() waits for delivery reports
+DELIVERY_POLL_TIMEOUT = 0.1
+
+# Compression codecs that accept compression.level
+LEVELED_COMPRESSION_TYPES = ("zstd", "gzip", "lz4")
+
+# Per-message log formats (lazy %-formatting: skipped when the level is disabled)
+PUBLISHED_LOG = "📤 Published to %s: %s"
+DELIVERED_LOG = "✅ Message delivered to %s [%s]"
+
+# Time-ordered event IDs where the stdlib has them (Python 3.14+), else random v4
+_new_event_id = getattr(uuid, "uuid7", uuid.uuid4)
+
+# Base producer config, built once at import (copied per instance)
+DEFAULT_CONFIG = {
+    "bootstrap.servers": settings.kafka_brokers,
+    "client.id": settings.kafka_client_id,
+    "acks": "all",
+    # No duplicates or reordering when a batch is retried after a lost ack
+    "enable.idempotence": True,
+    "retries": 3,
+    "compression.type": settings.kafka_compression_type,
+    # Let librdkafka coalesce produces into larger batches
+    "linger.ms": settings.kafka_linger_ms,
+    "batch.size": 1_000_000,
+    "queue.buffering.max.messages": 100_000,
+}
+# snappy has no levels; only pass compression.level for codecs that use it
+if settings.kafka_compression_type in LEVELED_COMPRESSION_TYPES:
+    DEFAULT_CONFIG["compression.level"] = settings.kafka_compression_level
+
 
 class KafkaProducer:
     """Kafka producer service similar to nest-be UploadKafkaProducerService."""
 
     def __init__(self):
         """Initialize Kafka producer."""
-        self.producer = Producer(
-            {
-                "bootstrap.servers": settings.kafka_brokers,
-                "client.id": settings.kafka_client_id,
-                "acks": "all",
-                "retries": 3,
-                "compression.type": "snappy",
-            }
+        self.producer = Producer(dict(DEFAULT_CONFIG))
+        # Delivery callbacks are served off the publish path by one poll thread
+        self._closed = threading.Event()
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop, name="kafka-producer-poll", daemon=True
         )
+        self._poll_thread.start()
         logger.info(f"Kafka producer initialized: {settings.kafka_brokers}")
 
     def publish(
@@ -34,17 +64,17 @@ class KafkaProducer:
     ) -> bool:
         """Publish message to Kafka topic."""
         try:
-            message = json.dumps(payload).encode("utf-8")
+            message = orjson.dumps(payload)
             self.producer.produce(
                 topic,
                 message,
                 callback=callback or self._delivery_callback,
             )
-            self.producer.poll(0)
-            logger.info(f"📤 Published to {topic}: {payload.get('id', 'N/A')}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(PUBLISHED_LOG, topic, payload.get("id", "N/A"))
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to publish to {topic}: {str(e)}")
+            logger.error("❌ Failed to publish to %s: %s", topic, e)
             return False
 
     def publish_video_summarized(
@@ -55,11 +85,11 @@ class KafkaProducer:
     ) -> bool:
         """Publish video.summarized event."""
         payload = {
-            "id": str(uuid.uuid4()),
+            "id": _new_event_id(),  # orjson serializes UUID natively
             "videoId": video_id,
             "summaryFileKey": summary_file_key,
             "qualityScore": quality_score,
-            "ts": datetime.utcnow().isoformat(),
+            "ts": datetime.now(timezone.utc),  # orjson serializes datetime as ISO 8601
         }
         return self.publish("video.summarized", payload)
 
@@ -67,26 +97,36 @@ class KafkaProducer:
         """Flush pending messages."""
         self.producer.flush(timeout)
 
+    def _poll_loop(self):
+        """Serve delivery callbacks until the producer is closed."""
+        while not self._closed.is_set():
+            self.producer.poll(DELIVERY_POLL_TIMEOUT)
+
     def _delivery_callback(self, err, msg):
         """Delivery callback for Kafka messages."""
         if err:
-            logger.error(f"❌ Message delivery failed: {err}")
-        else:
-            logger.debug(f"✅ Message delivered to {msg.topic()} [{msg.partition()}]")
+            logger.error("❌ Message delivery failed: %s", err)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(DELIVERED_LOG, msg.topic(), msg.partition())
 
     def close(self):
         """Close producer connection."""
+        self._closed.set()
+        self._poll_thread.join()
         self.producer.flush(10)
         logger.info("Kafka producer closed")
 
 
 # Singleton instance
 _kafka_producer: Optional[KafkaProducer] = None
+_kafka_producer_lock = threading.Lock()
 
 
 def get_kafka_producer() -> KafkaProducer:
-    """Get or create Kafka producer singleton."""
+    """Get or create Kafka producer singleton (safe under concurrent first use)."""
     global _kafka_producer
     if _kafka_producer is None:
-        _kafka_producer = KafkaProducer()
+        with _kafka_producer_lock:
+            if _kafka_producer is None:
+                _kafka_producer = KafkaProducer()
     return _kafka_producer
@@ -1,6 +1,8 @@
 """Kafka topic management utilities."""
 import logging
-from typing import List
+import time
+from functools import lru_cache
+from typing import FrozenSet, List, Set
 
 from confluent_kafka.admin import AdminClient, NewTopic
 from confluent_kafka import KafkaException
@@ -10,24 +12,62 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# list_topics results are reused for this many seconds
+TOPIC_METADATA_TTL_SECONDS = 5
 
-def ensure_topic_exists(topic: str, num_partitions: int = 1, replication_factor: int = 1):
+# Built once at import; settings don't change at runtime
+_ADMIN_CONFIG = {"bootstrap.servers": settings.kafka_brokers}
+
+# Topics confirmed to exist in this process (see ensure_topic_exists)
+_ensured_topics: Set[str] = set()
+
+
+@lru_cache(maxsize=1)
+def _get_admin_client() -> AdminClient:
+    """Get or create the AdminClient singleton."""
+    return AdminClient(_ADMIN_CONFIG)
+
+
+@lru_cache(maxsize=1)
+def _cached_topic_names(time_bucket: int) -> FrozenSet[str]:
+    """Fetch cluster topic names; memoized per time bucket."""
+    metadata = _get_admin_client().list_topics(timeout=10)
+    return frozenset(metadata.topics.keys())
+
+
+def _existing_topics() -> FrozenSet[str]:
+    """Get existing topic names, refetching at most every TOPIC_METADATA_TTL_SECONDS."""
+    return _cached_topic_names(int(time.monotonic() // TOPIC_METADATA_TTL_SECONDS))
+
+
+def ensure_topic_exists(
+    topic: str,
+    num_partitions: int = 1,
+    replication_factor: int = 1,
+    use_cache: bool = True,
+):
     """
     Ensure a Kafka topic exists, creating it if necessary.
 
+    Topics already ensured in this process return immediately without a
+    metadata request, unless use_cache is False or KAFKA_SKIP_TOPIC_CHECK_CACHE
+    is set.
+
     Args:
         topic: Topic name
         num_partitions: Number of partitions (default: 1)
         replication_factor: Replication factor (default: 1)
+        use_cache: Trust the in-process ensured-topics cache (default: True)
     """
-    admin_client = AdminClient({
-        "bootstrap.servers": settings.kafka_brokers,
-    })
+    if use_cache and not settings.kafka_skip_topic_check_cache and topic in _ensured_topics:
+        return True
+
+    admin_client = _get_admin_client()
 
     # Check if topic exists
-    metadata = admin_client.list_topics(timeout=10)
-    if topic in metadata.topics:
+    if topic in _existing_topics():
         logger.info(f"✅ Topic '{topic}' already exists")
+        _ensured_topics.add(topic)
         return True
 
     # Create topic
@@ -36,12 +76,15 @@ def ensure_topic_exists(topic: str, num_partitions: int = 1, replication_factor:
 
     try:
         futures = admin_client.create_topics(topic_list, operation_timeout=30)
+        # Cached metadata no longer reflects the cluster
+        _cached_topic_names.cache_clear()
 
         # Wait for topic creation
         for topic_name, future in futures.items():
             try:
                 future.result()  # The result itself is None
                 logger.info(f"✅ Successfully created topic '{topic_name}'")
+                _ensured_topics.add(topic_name)
             except Exception as e:
                 logger.error(f"❌ Failed to create topic '{topic_name}': {str(e)}")
                 raise
@@ -61,13 +104,10 @@ def create_topics(topics: List[str], num_partitions: int = 1, replication_factor
         num_partitions: Number of partitions per topic
         replication_factor: Replication factor per topic
     """
-    admin_client = AdminClient({
-        "bootstrap.servers": settings.kafka_brokers,
-    })
+    admin_client = _get_admin_client()
 
     # Check existing topics
-    metadata = admin_client.list_topics(timeout=10)
-    existing_topics = set(metadata.topics.keys())
+    existing_topics = _existing_topics()
 
     # Filter out existing topics
     topics_to_create = [t for t in topics if t not in existing_topics]
@@ -84,6 +124,8 @@ def create_topics(topics: List[str], num_partitions: int = 1, replication_factor
 
     try:
         futures = admin_client.create_topics(topic_list, operation_timeout=30)
+        # Cached metadata no longer reflects the cluster
+        _cached_topic_names.cache_clear()
 
         # Wait for topic creation
         for topic_name, future in futures.items():
@@ -0,0 +1,4 @@
+"""Redis provider module."""
+from providers.redis.client import get_redis_client
+
+__all__ = ["get_redis_client"]
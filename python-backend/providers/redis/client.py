@@ -0,0 +1,25 @@
+"""Redis client provider."""
+import logging
+from functools import lru_cache
+
+import redis
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> redis.Redis:
+    """Get or create Redis client singleton (lazy; connects on first command)."""
+    client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_password or None,
+        db=0,
+        socket_timeout=2.0,
+        socket_connect_timeout=2.0,
+    )
+    logger.info(f"Redis client initialized: {settings.redis_host}:{settings.redis_port}")
+    return client
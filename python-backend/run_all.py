@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
-"""Run all services (FastAPI, Celery, Kafka Consumer) in one process."""
+"""Run all services (FastAPI, Celery, Kafka Consumer) in one process.
+
+FastAPI and the Kafka consumers share one process and event loop (and so one
+DB engine/pool, Redis client and settings instance); only the Celery worker
+runs as a subprocess.
+"""
+import asyncio
 import logging
-import multiprocessing
 import signal
 import sys
-import time
-from multiprocessing import Process
 
 import uvicorn
 
@@ -19,139 +22,172 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Global flag for graceful shutdown
-shutdown_event = multiprocessing.Event()
+# Seconds the Celery worker gets to finish its current tasks on shutdown
+CELERY_SHUTDOWN_TIMEOUT = 10
 
 
-def run_fastapi():
-    """Run FastAPI application."""
-    logger.info("🚀 Starting FastAPI application...")
-    try:
-        uvicorn.run(
-            "main:app",
-            host="0.0.0.0",
-            port=settings.port,
-            log_level=settings.log_level.lower(),
-            access_log=False,  # Reduce noise
-        )
-    except Exception as e:
-        logger.error(f"FastAPI error: {str(e)}")
+def create_fastapi_server() -> uvicorn.Server:
+    """Build the uvicorn server for the FastAPI application."""
+    from main import app
+
+    config = uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=settings.port,
+        log_level=settings.log_level.lower(),
+        access_log=False,  # Reduce noise
+    )
+    server = uvicorn.Server(config)
+    # Signals are handled by the orchestrator, which stops every service
+    server.install_signal_handlers = lambda: None
+    return server
 
 
-def run_celery_worker():
-    """Run Celery worker."""
+async def run_celery_worker(stop: asyncio.Event):
+    """Run Celery worker as a subprocess until it exits or stop is set."""
     logger.info("🔧 Starting Celery worker...")
-    try:
-        import subprocess
-        import sys
 
-        # Log which tasks should be available
-        logger.info("🔍 Checking registered tasks...")
+    # Log which tasks should be available
+    logger.info("🔍 Checking registered tasks...")
+    try:
+        from celery_app import TASK_MODULES
+        logger.info(f"📋 Celery worker will import task modules: {TASK_MODULES}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not check registered tasks: {str(e)}")
+
+    # Use sys.executable to ensure we use the same Python interpreter
+    logger.info("🚀 Launching Celery worker process...")
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "celery",
+        "-A",
+        "celery_app",
+        "worker",
+        "--loglevel=info",
+        "--concurrency=2",
+        "-Ofair",
+        "-Q",
+        "celery,summarization,transcription",  # single dev worker consumes every queue
+        "--without-gossip",
+        "--without-mingle",
+        "--without-heartbeat",
+        # stdout/stderr are inherited: Celery writes straight to this
+        # process's streams instead of being re-logged line by line
+    )
+    logger.info(f"✅ Celery worker process started with PID: {process.pid}")
+
+    stopper = asyncio.create_task(stop.wait())
+    exited = asyncio.create_task(process.wait())
+    await asyncio.wait({stopper, exited}, return_when=asyncio.FIRST_COMPLETED)
+    stopper.cancel()
+
+    if process.returncode is None:
+        logger.info("Terminating Celery worker...")
+        process.terminate()
         try:
-            from celery_app import celery_app
-            registered_tasks = list(celery_app.tasks.keys())
-            logger.info(f"📋 Celery app has {len(registered_tasks)} registered tasks: {registered_tasks}")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not check registered tasks: {str(e)}")
-
-        # Run celery worker as subprocess (non-blocking with Popen)
-        # Use sys.executable to ensure we use the same Python interpreter
-        logger.info("🚀 Launching Celery worker process...")
-        process = subprocess.Popen(
-            [
-                sys.executable,
-                "-m",
-                "celery",
-                "-A",
-                "celery_app",
-                "worker",
-                "--loglevel=info",
-                "--concurrency=2",
-                "--without-gossip",
-                "--without-mingle",
-                "--without-heartbeat",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,  # Enable text mode for easier log reading
-        )
+            await asyncio.wait_for(exited, timeout=CELERY_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Force killing Celery worker...")
+            process.kill()
+            await exited
+    logger.info(f"Celery worker exited with code {process.returncode}")
+
+
+def create_kafka_transcription_consumer():
+    """Create Kafka consumer for video.transcoded events (transcription)."""
+    # Import handler from dedicated worker module to avoid code duplication
+    from modules.transcription.kafka_transcription_worker import (
+        CONSUMER_BATCH_SIZE,
+        CONSUMER_CONFIG,
+        handle_video_transcoded,
+    )
+    from common.types.video import VideoTranscodedPayload
+    from providers.kafka import create_consumer
+
+    logger.info("🔌 Creating Kafka consumer for topic: video.transcoded")
+    return create_consumer(
+        "video.transcoded",
+        handle_video_transcoded,
+        payload_type=VideoTranscodedPayload,
+        batch_size=CONSUMER_BATCH_SIZE,
+        install_signal_handlers=False,
+        consumer_config=CONSUMER_CONFIG,
+    )
+
+
+def create_kafka_summary_consumer():
+    """Create Kafka consumer for video.transcribed events (summarization)."""
+    # Import handler from dedicated worker module to avoid code duplication
+    from modules.summary.kafka_worker import handle_video_transcribed_batch
+    from common.types.video import VideoTranscribedPayload
+    from providers.kafka import create_consumer
+
+    logger.info("🔌 Creating Kafka consumer for topic: video.transcribed")
+    return create_consumer(
+        "video.transcribed",
+        handle_video_transcribed_batch,
+        payload_type=VideoTranscribedPayload,
+        batch=True,
+        install_signal_handlers=False,
+    )
+
+
+async def run_services():
+    """Start every service on this event loop and stop them all when one exits."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
 
-        logger.info(f"✅ Celery worker process started with PID: {process.pid}")
-
-        # Stream Celery worker logs to main logger
-        def stream_logs(pipe, prefix):
-            """Stream subprocess output to logger."""
-            try:
-                for line in iter(pipe.readline, ''):
-                    if line:
-                        logger.info(f"[Celery] {line.strip()}")
-            except Exception as e:
-                logger.error(f"Error streaming Celery logs: {str(e)}")
-
-        # Start log streaming threads
-        import threading
-        stdout_thread = threading.Thread(
-            target=stream_logs, args=(process.stdout, "[Celery-STDOUT]"), daemon=True
+    logger.info("🚀 Starting FastAPI application...")
+    server = create_fastapi_server()
+    tasks = [
+        asyncio.create_task(server.serve(), name="FastAPI"),
+        asyncio.create_task(run_celery_worker(stop), name="Celery"),
+    ]
+
+    # The consumers' blocking fetch/handle loops run on worker threads
+    logger.info("📨 Starting Kafka consumers...")
+    try:
+        consumers = await asyncio.gather(
+            asyncio.to_thread(create_kafka_transcription_consumer),
+            asyncio.to_thread(create_kafka_summary_consumer),
         )
-        stderr_thread = threading.Thread(
-            target=stream_logs, args=(process.stderr, "[Celery-STDERR]"), daemon=True
+    except Exception:
+        stop.set()
+        server.should_exit = True
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    for consumer in consumers:
+        tasks.append(
+            asyncio.create_task(asyncio.to_thread(consumer.consume), name=f"Kafka:{consumer.topic}")
         )
-        stdout_thread.start()
-        stderr_thread.start()
 
-        # Wait for process to complete (or be killed)
-        process.wait()
-    except KeyboardInterrupt:
-        logger.info("Celery worker stopped")
-    except Exception as e:
-        logger.error(f"❌ Celery worker error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    # Note: Outbox events are published by nest-be's scheduler (shared table)
 
+    logger.info("✅ All services started successfully!")
+    logger.info("📝 FastAPI: http://localhost:{}".format(settings.port))
+    logger.info("🔧 Celery worker: Running")
+    logger.info("📨 Kafka transcription consumer: Listening for video.transcoded events")
+    logger.info("📨 Kafka summary consumer: Listening for video.transcribed events")
+    logger.info("📮 Outbox events: Will be published by nest-be scheduler")
+    logger.info("Press Ctrl+C to stop all services")
 
-def run_kafka_transcription_consumer():
-    """Run Kafka consumer for video.transcoded events (transcription)."""
-    logger.info("📨 Starting Kafka transcription consumer...")
-    try:
-        # Import handler from dedicated worker module to avoid code duplication
-        from modules.transcription.kafka_transcription_worker import handle_video_transcoded
-        from providers.kafka import create_consumer
-
-        # Create and start consumer for video.transcoded
-        logger.info("🔌 Creating Kafka consumer for topic: video.transcoded")
-        consumer = create_consumer("video.transcoded", handle_video_transcoded)
-        logger.info("✅ Kafka consumer created, starting to consume...")
-        consumer.consume()
-    except Exception as e:
-        logger.error(f"❌ Kafka transcription consumer error: {str(e)}", exc_info=True)
-        import traceback
-        traceback.print_exc()
-
+    # Run until a signal arrives or any service exits on its own
+    stopper = asyncio.create_task(stop.wait())
+    done, _ = await asyncio.wait([stopper, *tasks], return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        if task is not stopper and not task.cancelled() and task.exception():
+            logger.error(f"❌ {task.get_name()} error: {task.exception()}")
 
-def run_kafka_summary_consumer():
-    """Run Kafka consumer for video.transcribed events (summarization)."""
-    logger.info("📨 Starting Kafka summary consumer...")
-    try:
-        # Import handler from dedicated worker module to avoid code duplication
-        from modules.summary.kafka_worker import handle_video_transcribed
-        from providers.kafka import create_consumer
-
-        # Create and start consumer for video.transcribed
-        logger.info("🔌 Creating Kafka consumer for topic: video.transcribed")
-        consumer = create_consumer("video.transcribed", handle_video_transcribed)
-        logger.info("✅ Kafka consumer created, starting to consume...")
-        consumer.consume()
-    except Exception as e:
-        logger.error(f"❌ Kafka summary consumer error: {str(e)}", exc_info=True)
-        import traceback
-        traceback.print_exc()
-
-
-def signal_handler(signum, frame):
-    """Handle shutdown signals."""
-    logger.info(f"Received signal {signum}, shutting down all services...")
-    shutdown_event.set()
-    sys.exit(0)
+    logger.info("\n🛑 Shutting down all services...")
+    stopper.cancel()
+    stop.set()
+    server.should_exit = True
+    for consumer in consumers:
+        consumer.shutdown_event.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def main():
@@ -164,75 +200,13 @@ def main():
     logger.info(f"🔗 Redis: {settings.redis_host}:{settings.redis_port}")
     logger.info("=" * 60)
 
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
-    processes = []
-
     try:
-        # Start FastAPI
-        fastapi_process = Process(target=run_fastapi, name="FastAPI")
-        fastapi_process.start()
-        processes.append(fastapi_process)
-        time.sleep(2)  # Give FastAPI time to start
-
-        # Start Celery worker
-        celery_process = Process(target=run_celery_worker, name="Celery")
-        celery_process.start()
-        processes.append(celery_process)
-        time.sleep(2)  # Give Celery time to start
-
-        # Start Kafka transcription consumer (video.transcoded -> transcription)
-        kafka_transcription_process = Process(
-            target=run_kafka_transcription_consumer, name="KafkaTranscription"
-        )
-        kafka_transcription_process.start()
-        processes.append(kafka_transcription_process)
-        time.sleep(1)
-
-        # Start Kafka summary consumer (video.transcribed -> summarization)
-        kafka_summary_process = Process(
-            target=run_kafka_summary_consumer, name="KafkaSummary"
-        )
-        kafka_summary_process.start()
-        processes.append(kafka_summary_process)
-        time.sleep(1)
-
-        # Note: Outbox events are published by nest-be's scheduler (shared table)
-
-        logger.info("✅ All services started successfully!")
-        logger.info("📝 FastAPI: http://localhost:{}".format(settings.port))
-        logger.info("🔧 Celery worker: Running")
-        logger.info("📨 Kafka transcription consumer: Listening for video.transcoded events")
-        logger.info("📨 Kafka summary consumer: Listening for video.transcribed events")
-        logger.info("📮 Outbox events: Will be published by nest-be scheduler")
-        logger.info("Press Ctrl+C to stop all services")
-
-        # Wait for all processes
-        for process in processes:
-            process.join()
-
-    except KeyboardInterrupt:
-        logger.info("\n🛑 Shutting down all services...")
+        asyncio.run(run_services())
     except Exception as e:
-        logger.error(f"❌ Error running services: {str(e)}")
+        logger.error(f"❌ Error running services: {str(e)}", exc_info=True)
     finally:
-        # Terminate all processes
-        for process in processes:
-            if process.is_alive():
-                logger.info(f"Terminating {process.name}...")
-                process.terminate()
-                process.join(timeout=5)
-                if process.is_alive():
-                    logger.warning(f"Force killing {process.name}...")
-                    process.kill()
-
         logger.info("👋 All services stopped")
 
 
 if __name__ == "__main__":
-    # Ensure multiprocessing works on all platforms
-    multiprocessing.set_start_method("spawn", force=True)
     main()
-